@@ -0,0 +1,4 @@
+"""Benchmarks for the python-hcl2 pipeline stages.
+
+Run with ``python -m bench``; see ``python -m bench --help`` for options.
+"""
@@ -0,0 +1,161 @@
+"""Command line entry point: ``python -m bench``."""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+from bench.corpus import GENERATORS
+from bench.lexer import run_lexer
+from bench.runner import compare, run_benchmarks
+from bench.stages import STAGES
+from bench.startup import run_startup
+
+
+def _print_results(result: Dict[str, Any]) -> None:
+    header = (
+        f"{'corpus':<14} {'stage':<15} {'best ms':>10} {'MB/s':>9} "
+        f"{'nodes/s':>12} {'peak KiB':>10} {'B/node':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for corpus_name, stages in result["results"].items():
+        for stage_name, metrics in stages.items():
+            print(
+                f"{corpus_name:<14} {stage_name:<15} "
+                f"{metrics['best_s'] * 1000:>10.2f} "
+                f"{metrics['mb_per_s'] or 0:>9.2f} "
+                f"{metrics['nodes_per_s'] or 0:>12,.0f} "
+                f"{metrics['peak_memory_bytes'] / 1024:>10,.0f} "
+                f"{metrics['retained_bytes_per_node'] or 0:>8,.0f}"
+            )
+
+
+def _print_comparison(rows: List[Dict[str, Any]], threshold: float) -> bool:
+    """Print the comparison table; return True if any row regressed."""
+    regressed = False
+    print()
+    print(
+        f"{'corpus':<14} {'stage':<15} {'baseline ms':>12} {'current ms':>11} {'ratio':>7}"
+    )
+    for row in rows:
+        flag = ""
+        if row["ratio"] > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(
+            f"{row['corpus']:<14} {row['stage']:<15} "
+            f"{row['baseline_s'] * 1000:>12.2f} {row['current_s'] * 1000:>11.2f} "
+            f"{row['ratio']:>7.2f}{flag}"
+        )
+    return regressed
+
+
+def _write_output(path: Optional[str], result: Any) -> None:
+    if path:
+        with open(path, "w", encoding="utf-8") as out:
+            json.dump(result, out, indent=2)
+            out.write("\n")
+
+
+def _print_startup(results: Dict[str, Optional[Dict[str, Any]]]) -> None:
+    print(f"{'startup':<17} {'best ms':>10} {'median ms':>10}")
+    for mode, metrics in results.items():
+        if metrics is None:
+            print(f"{mode:<17} {'not generated (run python -m hcl2.parser)':>21}")
+            continue
+        print(
+            f"{mode:<17} {metrics['best_s'] * 1000:>10.1f} "
+            f"{metrics['median_s'] * 1000:>10.1f}"
+        )
+
+
+def _print_lexer(results: Dict[str, Dict[str, Any]]) -> None:
+    print(
+        f"{'corpus':<14} {'lex best ms':>12} {'MB/s':>9} {'tokens':>9} "
+        f"{'postlex ns/token':>17}"
+    )
+    for corpus_name, metrics in results.items():
+        print(
+            f"{corpus_name:<14} {metrics['best_s'] * 1000:>12.2f} "
+            f"{metrics['mb_per_s'] or 0:>9.2f} {metrics['tokens']:>9,} "
+            f"{metrics['postlex_ns_per_token'] or 0:>17.0f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m bench",
+        description="Benchmark the python-hcl2 pipeline stages on a generated corpus",
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Corpus size multiplier (default: 1)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per measurement (default: 5)"
+    )
+    parser.add_argument(
+        "--stage",
+        action="append",
+        choices=sorted(STAGES),
+        help="Stage to run; may be repeated (default: all stages)",
+    )
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=sorted(GENERATORS),
+        help="Corpus file to run; may be repeated (default: all files)",
+    )
+    parser.add_argument("-o", "--output", help="Write JSON results to this path")
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="Compare against a previous JSON result"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown reported as a regression with --compare (default: 0.10)",
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="Time a fresh interpreter importing hcl2 and parsing one line instead",
+    )
+    parser.add_argument(
+        "--lexer",
+        action="store_true",
+        help="Time only the lexer, on string-, comment- and heredoc-heavy files instead",
+    )
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        startup = run_startup(repeat=args.repeat)
+        _print_startup(startup)
+        _write_output(args.output, startup)
+        return 0
+    if args.lexer:
+        lexer = run_lexer(args.scale, args.repeat, corpora=args.corpus)
+        _print_lexer(lexer)
+        _write_output(args.output, lexer)
+        return 0
+
+    result = run_benchmarks(
+        scale=args.scale,
+        repeat=args.repeat,
+        stages=args.stage,
+        corpora=args.corpus,
+    )
+    _print_results(result)
+
+    _write_output(args.output, result)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if _print_comparison(compare(baseline, result), args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
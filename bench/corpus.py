@@ -0,0 +1,127 @@
+"""Deterministic generators for the benchmark corpus.
+
+Every generator takes a ``scale`` factor and returns HCL2 text; the same scale
+always produces the same text, so results stay comparable between runs.
+"""
+from typing import Callable, Dict, List
+
+
+def small(scale: int = 1) -> str:
+    """A handful of attributes and one block, typical of a variables file."""
+    lines: List[str] = []
+    for i in range(5 * scale):
+        lines.append(f'var_{i} = "value-{i}"')
+    lines.append('provider "aws" {')
+    lines.append('  region = "us-east-1"')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def large(scale: int = 1) -> str:
+    """Many flat resource blocks with mixed expression types."""
+    parts: List[str] = []
+    for i in range(200 * scale):
+        parts.append(
+            f'resource "aws_instance" "web_{i}" {{\n'
+            f'  ami           = "ami-{i:08x}"\n'
+            f'  instance_type = var.large ? "m5.large" : "t3.micro"\n'
+            f"  count         = {i % 7} + 1\n"
+            f"  tags = {{\n"
+            f'    Name = "web-{i}"\n'
+            f'    Env  = "prod"\n'
+            f"  }}\n"
+            f"  # comment for web_{i}\n"
+            f'  security_groups = [aws_security_group.sg_{i}.id, "sg-default"]\n'
+            f"}}\n"
+        )
+    return "\n".join(parts)
+
+
+def nested(scale: int = 1) -> str:
+    """Deeply nested blocks, objects and tuples."""
+    depth = 12
+    parts: List[str] = []
+    for i in range(20 * scale):
+        opening = "".join(
+            f'{"  " * level}level_{level} "l{i}" {{\n' for level in range(depth)
+        )
+        inner_indent = "  " * depth
+        value = "1"
+        for level in range(depth):
+            value = f'{{ k{level} = [{value}, "x"] }}' if level % 2 else f"[{value}]"
+        body = f"{inner_indent}value = {value}\n"
+        closing = "".join(f'{"  " * level}}}\n' for level in reversed(range(depth)))
+        parts.append(opening + body + closing)
+    return "\n".join(parts)
+
+
+def heredoc(scale: int = 1) -> str:
+    """Attributes holding long heredoc and trimmed heredoc templates."""
+    parts: List[str] = []
+    policy_lines = "\n".join(
+        f'    {{"Effect": "Allow", "Action": "s3:Get{j}", "Resource": "*"}},'
+        for j in range(20)
+    )
+    for i in range(40 * scale):
+        marker = "EOT" if i % 2 else "POLICY"
+        operator = "<<-" if i % 3 else "<<"
+        parts.append(
+            f"doc_{i} = {operator}{marker}\n"
+            f"  {{\n"
+            f'  "Version": "2012-10-17",\n'
+            f'  "Statement": [\n{policy_lines}\n  ]\n'
+            f"  }}\n"
+            f"{marker}\n"
+        )
+    return "\n".join(parts)
+
+
+def interpolation(scale: int = 1) -> str:
+    """Strings dense with interpolations and template directives."""
+    parts: List[str] = []
+    for i in range(150 * scale):
+        parts.append(
+            f'name_{i} = "${{var.prefix}}-{i}-${{local.env}}-${{count.index}}"\n'
+            f'path_{i} = "${{path.module}}/files/${{lookup(var.files, "f{i}", "x")}}"\n'
+            f'tmpl_{i} = "%{{ if var.enabled }}on-${{var.name_{i}}}%{{ else }}off%{{ endif }}"\n'
+        )
+    return "".join(parts)
+
+
+def strings(scale: int = 1) -> str:
+    """Long quoted strings with escapes and literal ``$`` and ``%`` characters."""
+    sentence = 'Costs $5 (10% off), see \\"docs\\" at C:\\\\path; $${literal} %%{x}. '
+    parts: List[str] = []
+    for i in range(100 * scale):
+        parts.append(f'description_{i} = "{sentence * 30}${{var.suffix_{i}}}"\n')
+    return "".join(parts)
+
+
+def comments(scale: int = 1) -> str:
+    """Long block comments and runs of line comments between attributes."""
+    text_lines = [
+        f"Line {j}: explains * the / setting below in detail" for j in range(30)
+    ]
+    block = "/*\n" + "\n".join(f" * {line}" for line in text_lines) + "\n */\n"
+    hashes = "".join(f"# {line}\n" for line in text_lines)
+    slashes = "".join(f"// {line}\n" for line in text_lines)
+    parts: List[str] = []
+    for i in range(30 * scale):
+        parts.append(f"{block}a_{i} = 1\n{hashes}b_{i} = 2\n{slashes}c_{i} = 3\n")
+    return "".join(parts)
+
+
+GENERATORS: Dict[str, Callable[[int], str]] = {
+    "small": small,
+    "large": large,
+    "nested": nested,
+    "heredoc": heredoc,
+    "interpolation": interpolation,
+    "strings": strings,
+    "comments": comments,
+}
+
+
+def build_corpus(scale: int = 1) -> Dict[str, str]:
+    """Return a mapping of corpus name to generated HCL2 text."""
+    return {name: generator(scale) for name, generator in GENERATORS.items()}
@@ -0,0 +1,98 @@
+"""Lexer micro-benchmark: time spent in the Lark lexer while parsing.
+
+The LALR parser drives a contextual lexer, which cannot run without it, so the
+lexer is timed inside full parses through :func:`hcl2.profile`'s ``lex`` stage.
+The default corpus files are the ones dominated by long tokens: quoted
+strings, comments and heredocs.
+
+The per-token overhead of :class:`hcl2.postlexer.PostLexer` is measured on its
+own, by replaying the tokens the lexer produced for a parse through it.
+"""
+import gc
+import statistics
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from lark import Token
+
+from bench.corpus import build_corpus
+from hcl2 import api
+from hcl2 import parser as hcl2_parser
+from hcl2.postlexer import PostLexer
+from hcl2.profiling import profile
+
+LEXER_CORPORA = ("strings", "comments", "heredoc", "interpolation")
+
+
+def measure_lexer(text: str, repeat: int) -> Dict[str, Any]:
+    """Time the ``lex`` stage of ``repeat`` parses of *text*."""
+    api.parses_to_tree(text)  # load the parser outside the timed runs
+    durations = []
+    tokens = 0
+    for _ in range(repeat):
+        gc.collect()
+        with profile(trace_memory=False) as prof:
+            api.parses_to_tree(text)
+        lex = prof.totals()["lex"]
+        durations.append(lex.wall_time)
+        tokens = lex.tokens or 0
+    size = len(text.encode("utf-8"))
+    best = min(durations)
+    return {
+        "bytes": size,
+        "tokens": tokens,
+        "repeat": repeat,
+        "best_s": best,
+        "median_s": statistics.median(durations),
+        "mb_per_s": size / best / 1e6 if best else None,
+        "postlex_ns_per_token": _postlex_overhead(_lexed_tokens(text), repeat),
+    }
+
+
+class _RecordingPostLexer(PostLexer):
+    """PostLexer keeping a copy of the tokens it receives from the lexer."""
+
+    def __init__(self) -> None:
+        self.tokens: List[Token] = []
+
+    def process(self, stream: Iterator[Token]) -> Iterator[Token]:
+        return super().process(self._record(stream))
+
+    def _record(self, stream: Iterator[Token]) -> Iterator[Token]:
+        for token in stream:
+            self.tokens.append(token)
+            yield token
+
+
+def _lexed_tokens(text: str) -> List[Token]:
+    recorder = _RecordingPostLexer()
+    # pylint: disable-next=protected-access
+    hcl2_parser._load(postlex=recorder).parse(text)
+    return recorder.tokens
+
+
+def _postlex_overhead(tokens: List[Token], repeat: int) -> Optional[float]:
+    """Nanoseconds the postlexer adds per token over iterating *tokens*."""
+    if not tokens:
+        return None
+
+    def best_of(consume) -> float:
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            consume()
+            durations.append(time.perf_counter() - start)
+        return min(durations)
+
+    plain = best_of(lambda: sum(1 for _ in iter(tokens)))
+    postlexed = best_of(lambda: sum(1 for _ in PostLexer().process(iter(tokens))))
+    return max(0.0, postlexed - plain) / len(tokens) * 1e9
+
+
+def run_lexer(
+    scale: int = 1, repeat: int = 5, corpora: Optional[Iterable[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Measure the lexer on the selected corpus files (default: LEXER_CORPORA)."""
+    selected = list(corpora or LEXER_CORPORA)
+    corpus = build_corpus(scale)
+    return {name: measure_lexer(corpus[name], repeat) for name in selected}
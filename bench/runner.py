@@ -0,0 +1,140 @@
+"""Timing, memory measurement and result comparison for the benchmark suite."""
+import gc
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import lark
+
+from bench.corpus import build_corpus
+from bench.stages import STAGES, Stage
+from hcl2.version import version as hcl2_version
+
+RESULT_FORMAT_VERSION = 1
+
+
+def _time_stage(stage: Stage, text: str, repeat: int) -> List[float]:
+    """Return wall-clock durations (seconds) of ``repeat`` runs of ``stage``."""
+    durations = []
+    prepared = None if stage.mutates_input else stage.setup(text)
+    for _ in range(repeat):
+        stage_input = stage.setup(text) if stage.mutates_input else prepared
+        gc.collect()
+        start = time.perf_counter()
+        stage.run(stage_input)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _memory(stage: Stage, text: str) -> Tuple[int, int]:
+    """Return peak and retained traced allocation (bytes) of one run of ``stage``.
+
+    Retained memory is what is still allocated once the stage returns, while
+    its result is alive: for stages producing a tree, the size of that tree.
+    """
+    stage_input = stage.setup(text)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        # Python 3.8 has no reset_peak; tracing has only just started, so the
+        # peak so far is at most a few bytes above start anyway
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        result = stage.run(stage_input)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - start, max(0, current - start)
+
+
+def measure(stage: Stage, text: str, repeat: int) -> Dict[str, Any]:
+    """Benchmark one stage on one corpus file and return its metrics."""
+    size = len(text.encode("utf-8"))
+    nodes = stage.count_nodes(text)
+    durations = _time_stage(stage, text, repeat)
+    best = min(durations)
+    peak, retained = _memory(stage, text)
+    return {
+        "bytes": size,
+        "nodes": nodes,
+        "repeat": repeat,
+        "best_s": best,
+        "median_s": statistics.median(durations),
+        "mb_per_s": size / best / 1e6 if best else None,
+        "nodes_per_s": nodes / best if best else None,
+        "peak_memory_bytes": peak,
+        "retained_memory_bytes": retained,
+        "retained_bytes_per_node": retained / nodes if nodes else None,
+    }
+
+
+def run_benchmarks(
+    scale: int = 1,
+    repeat: int = 5,
+    stages: Optional[Iterable[str]] = None,
+    corpora: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """Run the selected stages over the selected corpus files.
+
+    :param scale: Size multiplier passed to the corpus generators.
+    :param repeat: Number of timed runs per stage and corpus file.
+    :param stages: Stage names to run; all stages when omitted.
+    :param corpora: Corpus names to run; all corpus files when omitted.
+    """
+    corpus = build_corpus(scale)
+    stage_names = list(stages) if stages else list(STAGES)
+    corpus_names = list(corpora) if corpora else list(corpus)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for corpus_name in corpus_names:
+        text = corpus[corpus_name]
+        results[corpus_name] = {
+            stage_name: measure(STAGES[stage_name], text, repeat)
+            for stage_name in stage_names
+        }
+
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "metadata": {
+            "hcl2_version": hcl2_version,
+            "lark_version": lark.__version__,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "scale": scale,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Compare two result documents produced by :func:`run_benchmarks`.
+
+    Returns one row per (corpus, stage) present in both, with ``ratio`` being
+    current best time divided by baseline best time (above 1.0 is slower).
+    """
+    rows = []
+    for corpus_name, stages in current["results"].items():
+        baseline_stages = baseline["results"].get(corpus_name, {})
+        for stage_name, metrics in stages.items():
+            previous = baseline_stages.get(stage_name)
+            if previous is None or not previous["best_s"]:
+                continue
+            rows.append(
+                {
+                    "corpus": corpus_name,
+                    "stage": stage_name,
+                    "baseline_s": previous["best_s"],
+                    "current_s": metrics["best_s"],
+                    "ratio": metrics["best_s"] / previous["best_s"],
+                }
+            )
+    return rows
@@ -0,0 +1,157 @@
+"""Pipeline stages measured by the benchmark suite.
+
+Each stage is split into an untimed ``setup`` that prepares the stage input from
+the source text, and a timed ``run`` that executes exactly one ``hcl2.api``
+step. Stages that mutate their input (the formatter) get a fresh input for
+every iteration.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from lark import Tree
+
+from hcl2 import api
+from hcl2.cache import ParseCache
+from hcl2.formatter import BaseFormatter
+from hcl2.rules.abstract import LarkElement
+from hcl2.walk import walk
+
+
+@dataclass
+class Stage:
+    """A single timed step of the HCL2 pipeline."""
+
+    name: str
+    # Builds the stage input from HCL2 source text; not timed.
+    setup: Callable[[str], Any]
+    # Executes the stage on the prepared input; timed.
+    run: Callable[[Any], Any]
+    # Returns the number of tree nodes the stage processes for the given source.
+    count_nodes: Callable[[str], int]
+    # Whether ``run`` mutates its input, requiring a fresh setup per iteration.
+    mutates_input: bool = False
+
+
+def count_lark_nodes(tree: Tree) -> int:
+    """Count rules and tokens in a raw Lark tree."""
+    total = 0
+    for subtree in tree.iter_subtrees():
+        total += 1
+        total += sum(1 for child in subtree.children if not isinstance(child, Tree))
+    return total
+
+
+def count_element_nodes(tree: LarkElement) -> int:
+    """Count rules and tokens in a LarkElement tree."""
+    return sum(1 for _ in walk(tree))
+
+
+def _parsed_tree_nodes(text: str) -> int:
+    return count_lark_nodes(api.parses_to_tree(text))
+
+
+def _rule_tree_nodes(text: str) -> int:
+    return count_element_nodes(api.parses(text))
+
+
+def _deserialized_tree_nodes(text: str) -> int:
+    return count_element_nodes(api.from_dict(api.loads(text), apply_format=True))
+
+
+class _BytesCache(ParseCache):
+    """Parse cache holding encoded entries in a dict, as a disk cache would."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: Dict[str, bytes] = {}
+
+    def _read(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def _write(self, key: str, data: bytes) -> None:
+        self._entries[key] = data
+
+    def _discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _filled_cache(text: str) -> Tuple[ParseCache, str]:
+    cache = _BytesCache()
+    api.parses(text, cache=cache)
+    return cache, text
+
+
+def _cached_parses(args: Tuple[ParseCache, str]) -> LarkElement:
+    cache, text = args
+    return api.parses(text, cache=cache)
+
+
+def _format(tree: LarkElement) -> LarkElement:
+    BaseFormatter().format_tree(tree)
+    return tree
+
+
+STAGES: Dict[str, Stage] = {
+    stage.name: stage
+    for stage in (
+        Stage(
+            name="parses_to_tree",
+            setup=lambda text: text,
+            run=api.parses_to_tree,
+            count_nodes=_parsed_tree_nodes,
+        ),
+        Stage(
+            name="transform",
+            setup=api.parses_to_tree,
+            run=api.transform,
+            count_nodes=_parsed_tree_nodes,
+        ),
+        Stage(
+            name="parses",
+            setup=lambda text: text,
+            run=api.parses,
+            count_nodes=_rule_tree_nodes,
+        ),
+        Stage(
+            # Compare with "parses": a hit hashes the text and decodes the entry.
+            name="tree_cache_hit",
+            setup=_filled_cache,
+            run=_cached_parses,
+            count_nodes=_rule_tree_nodes,
+        ),
+        Stage(
+            name="loads",
+            setup=lambda text: text,
+            run=api.loads,
+            count_nodes=_parsed_tree_nodes,
+        ),
+        Stage(
+            name="serialize",
+            setup=api.parses,
+            run=api.serialize,
+            count_nodes=_rule_tree_nodes,
+        ),
+        Stage(
+            name="from_dict",
+            setup=api.loads,
+            run=lambda data: api.from_dict(data, apply_format=False),
+            count_nodes=_deserialized_tree_nodes,
+        ),
+        Stage(
+            name="format_tree",
+            setup=lambda text: api.from_dict(api.loads(text), apply_format=False),
+            run=_format,
+            count_nodes=_deserialized_tree_nodes,
+            mutates_input=True,
+        ),
+        Stage(
+            name="reconstruct",
+            setup=api.parses,
+            run=api.reconstruct,
+            count_nodes=_rule_tree_nodes,
+        ),
+    )
+}
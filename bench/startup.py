@@ -0,0 +1,73 @@
+"""Startup benchmark: a fresh interpreter importing hcl2 and parsing one line.
+
+Short CLI runs and serverless functions pay for the import and the parser
+load on every invocation. Each mode runs the same snippet in new processes,
+differing only in where the LALR parser comes from:
+
+* ``precomputed`` -- the generated ``hcl2.lark_parser`` tables (the default
+  for installed packages);
+* ``grammar-cached`` -- ``hcl2.lark`` through Lark's cache file, already
+  written by an untimed run;
+* ``grammar-uncached`` -- ``hcl2.lark`` with a cache file that cannot be
+  written, as in a read-only site-packages.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from hcl2 import parser as hcl2_parser
+
+SNIPPET = 'import hcl2; hcl2.loads("a=1")'
+
+_GRAMMAR = "import hcl2.parser as p; p.TABLES_MODULE = None; "
+
+MODES = {
+    "precomputed": SNIPPET,
+    "grammar-cached": _GRAMMAR + SNIPPET,
+    "grammar-uncached": _GRAMMAR + "p.PARSER_FILE = {unwritable!r}; " + SNIPPET,
+}
+
+
+def _run_once(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def measure_startup(code: str, repeat: int) -> Dict[str, Any]:
+    """Time ``repeat`` fresh interpreters running *code*."""
+    durations = [_run_once(code) for _ in range(repeat)]
+    return {
+        "repeat": repeat,
+        "best_s": min(durations),
+        "median_s": statistics.median(durations),
+    }
+
+
+def run_startup(repeat: int = 5) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Measure every startup mode, plus a bare interpreter as ``python``.
+
+    ``precomputed`` is None when the tables module has not been generated or
+    does not match the grammar (see ``python -m hcl2.parser``).
+    """
+    results: Dict[str, Optional[Dict[str, Any]]] = {
+        "python": measure_startup("pass", repeat)
+    }
+    # pylint: disable-next=protected-access
+    tables = hcl2_parser._precomputed_tables(hcl2_parser.TABLES_MODULE)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        unwritable = os.path.join(tmpdir, "missing", "cache.bin")
+        for mode, code in MODES.items():
+            if mode == "precomputed" and tables is None:
+                results[mode] = None
+                continue
+            code = code.format(unwritable=unwritable)
+            if mode == "grammar-cached":
+                # Write the cache file first
+                _run_once(code)
+            results[mode] = measure_startup(code, repeat)
+    return results
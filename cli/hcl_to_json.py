@@ -1,12 +1,14 @@
 """``hcl2tojson`` CLI entry point — convert HCL2 files to JSON."""
 
 import argparse
+import functools
 import json
 import os
 import sys
-from typing import IO, List, Optional, TextIO
+from typing import IO, List, Optional, TextIO, Tuple
 
-from hcl2 import load
+from hcl2 import iter_blocks, load
+from hcl2.cache import ParseCache
 from hcl2.utils import SerializationOptions
 from hcl2.version import __version__
 from cli.helpers import (
@@ -14,6 +16,7 @@ from cli.helpers import (
     EXIT_PARSE_ERROR,
     EXIT_PARTIAL,
     EXIT_SUCCESS,
+    DEFAULT_CACHE_MAX_SIZE_MB,
     HCL_SKIPPABLE,
     _collect_files,
     _convert_directory,
@@ -22,6 +25,9 @@ from cli.helpers import (
     _error,
     _expand_file_args,
     _install_sigpipe_handler,
+    _open_cache,
+    _parallel_map,
+    _report_timings,
 )
 
 _HCL_EXTENSIONS = {".tf", ".hcl"}
@@ -83,26 +89,84 @@ def _hcl_to_json(  # pylint: disable=too-many-arguments,too-many-positional-argu
     only: Optional[str] = None,
     exclude: Optional[str] = None,
     fields: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    timings: bool = False,
 ) -> None:
-    data = load(in_file, serialization_options=options)
+    with _report_timings(getattr(in_file, "name", "<stdin>"), timings):
+        data = load(in_file, serialization_options=options, cache=cache)
     data = _filter_data(data, only, exclude, fields)
     separators = (",", ":") if compact_separators else None
     json.dump(data, out_file, indent=json_indent, separators=separators)
 
 
-def _load_to_dict(
+def _load_to_dict(  # pylint: disable=too-many-positional-arguments
     in_file: TextIO,
     options: SerializationOptions,
     only: Optional[str] = None,
     exclude: Optional[str] = None,
     fields: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
 ) -> dict:
     """Load HCL2 and return the parsed dict (no JSON serialization)."""
-    data = load(in_file, serialization_options=options)
+    data = load(in_file, serialization_options=options, cache=cache)
     return _filter_data(data, only, exclude, fields)
 
 
-def _stream_ndjson(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+def _ndjson_record(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    file_path: str,
+    options: SerializationOptions,
+    json_indent: Optional[int],
+    add_provenance: bool,
+    only: Optional[str] = None,
+    exclude: Optional[str] = None,
+    fields: Optional[str] = None,
+    timings: bool = False,
+    cache: Optional[ParseCache] = None,
+) -> Tuple[str, Optional[str], int, Optional[str]]:
+    """Convert one file to a compact NDJSON line.
+
+    Returns ``(file_path, line, exit_code, error_message)``.  *line* is None if
+    the file failed or has no data left after filtering.  Errors other than
+    parse and I/O errors propagate.
+    """
+    try:
+        if file_path == "-":
+            with _report_timings("<stdin>", timings):
+                data = _load_to_dict(
+                    sys.stdin,
+                    options,
+                    only=only,
+                    exclude=exclude,
+                    fields=fields,
+                    cache=cache,
+                )
+        else:
+            with open(file_path, "r", encoding="utf-8") as f, _report_timings(
+                file_path, timings
+            ):
+                data = _load_to_dict(
+                    f,
+                    options,
+                    only=only,
+                    exclude=exclude,
+                    fields=fields,
+                    cache=cache,
+                )
+    except HCL_SKIPPABLE as exc:
+        return file_path, None, EXIT_PARSE_ERROR, str(exc)
+    except (OSError, IOError) as exc:
+        return file_path, None, EXIT_IO_ERROR, str(exc)
+
+    # Skip empty results after filtering (no useful data for agents)
+    if not data:
+        return file_path, None, EXIT_SUCCESS, None
+    if add_provenance:
+        data = {"__file__": file_path, **data}
+    line = json.dumps(data, indent=json_indent, separators=(",", ":"))
+    return file_path, line, EXIT_SUCCESS, None
+
+
+def _stream_ndjson(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
     file_paths: List[str],
     options: SerializationOptions,
     json_indent: Optional[int],
@@ -112,60 +176,140 @@ def _stream_ndjson(  # pylint: disable=too-many-arguments,too-many-positional-ar
     only: Optional[str] = None,
     exclude: Optional[str] = None,
     fields: Optional[str] = None,
+    timings: bool = False,
+    cache: Optional[ParseCache] = None,
+    jobs: int = 1,
+    ordered: bool = True,
 ) -> int:
     """Stream one JSON object per file to stdout (NDJSON).
 
+    With *jobs* above 1, files are parsed in that many worker processes; lines
+    are still written in input order unless *ordered* is false.  Stdin input
+    and *timings* always run serially.
+
     Returns the worst exit code encountered.
     """
+    record = functools.partial(
+        _ndjson_record,
+        options=options,
+        json_indent=json_indent,
+        add_provenance=add_provenance,
+        only=only,
+        exclude=exclude,
+        fields=fields,
+        timings=timings,
+        cache=cache,
+    )
+    parallel = jobs > 1 and len(file_paths) > 1 and not timings
+    parallel = parallel and "-" not in file_paths
+    if parallel:
+        records = _parallel_map(record, file_paths, jobs, ordered)
+    else:
+        records = _serial_records(record, file_paths, quiet)
+
     worst_exit = EXIT_SUCCESS
     any_success = False
     worst_skip_exit = EXIT_PARSE_ERROR  # default for all-fail case
+    for file_path, line, exit_code, error_msg in records:
+        if parallel and not quiet:
+            print(file_path, file=sys.stderr, flush=True)
+        if error_msg is not None:
+            if skip:
+                worst_exit = max(worst_exit, EXIT_PARTIAL)
+                if exit_code == EXIT_IO_ERROR:
+                    worst_skip_exit = EXIT_IO_ERROR
+                continue
+            error_type = "io_error" if exit_code == EXIT_IO_ERROR else "parse_error"
+            print(
+                _error(error_msg, use_json=True, error_type=error_type, file=file_path),
+                file=sys.stderr,
+            )
+            return exit_code
+        if line is None:
+            continue
+        print(line, flush=True)
+        any_success = True
+
+    if not any_success and worst_exit > EXIT_SUCCESS:
+        return worst_skip_exit
+    return worst_exit
+
+
+def _serial_records(record, file_paths: List[str], quiet: bool):
+    """Yield ``record(path)`` for each path, reporting progress before each parse."""
+    for file_path in file_paths:
+        if not quiet and file_path != "-":
+            print(file_path, file=sys.stderr, flush=True)
+        yield record(file_path)
+
+
+def _stream_ndjson_blocks(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    file_paths: List[str],
+    options: SerializationOptions,
+    skip: bool,
+    quiet: bool,
+    add_provenance: bool,
+    only: Optional[str] = None,
+    exclude: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> int:
+    """Stream one JSON object per top-level attribute or block to stdout.
+
+    Each element is written as soon as it is parsed (see
+    :func:`hcl2.iter_blocks`), so memory stays bounded for huge files.  Lines
+    written before a parse error in a file are kept.
+
+    Returns the worst exit code encountered.
+    """
+    worst_exit = EXIT_SUCCESS
     for file_path in file_paths:
         if not quiet and file_path != "-":
             print(file_path, file=sys.stderr, flush=True)
         try:
             if file_path == "-":
-                data = _load_to_dict(
-                    sys.stdin, options, only=only, exclude=exclude, fields=fields
+                _write_blocks(
+                    sys.stdin, file_path, options, add_provenance, only, exclude, fields
                 )
             else:
                 with open(file_path, "r", encoding="utf-8") as f:
-                    data = _load_to_dict(
-                        f, options, only=only, exclude=exclude, fields=fields
+                    _write_blocks(
+                        f, file_path, options, add_provenance, only, exclude, fields
                     )
-        except HCL_SKIPPABLE as exc:
+        except (*HCL_SKIPPABLE, OSError) as exc:
+            is_io_error = isinstance(exc, OSError)
             if skip:
-                worst_exit = max(worst_exit, EXIT_PARTIAL)
+                worst_exit = EXIT_PARTIAL
                 continue
             print(
                 _error(
-                    str(exc), use_json=True, error_type="parse_error", file=file_path
+                    str(exc),
+                    use_json=True,
+                    error_type="io_error" if is_io_error else "parse_error",
+                    file=file_path,
                 ),
                 file=sys.stderr,
             )
-            return EXIT_PARSE_ERROR
-        except (OSError, IOError) as exc:
-            if skip:
-                worst_exit = max(worst_exit, EXIT_PARTIAL)
-                worst_skip_exit = EXIT_IO_ERROR
-                continue
-            print(
-                _error(str(exc), use_json=True, error_type="io_error", file=file_path),
-                file=sys.stderr,
-            )
-            return EXIT_IO_ERROR
+            return EXIT_IO_ERROR if is_io_error else EXIT_PARSE_ERROR
+    return worst_exit
+
 
-        # Skip empty results after filtering (no useful data for agents)
+def _write_blocks(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    in_file: TextIO,
+    file_path: str,
+    options: SerializationOptions,
+    add_provenance: bool,
+    only: Optional[str],
+    exclude: Optional[str],
+    fields: Optional[str],
+) -> None:
+    """Print one compact JSON line per top-level element of *in_file*."""
+    for element in iter_blocks(in_file, serialization_options=options):
+        data = _filter_data(element, only, exclude, fields)
         if not data:
             continue
         if add_provenance:
             data = {"__file__": file_path, **data}
-        print(json.dumps(data, indent=json_indent, separators=(",", ":")), flush=True)
-        any_success = True
-
-    if not any_success and worst_exit > EXIT_SUCCESS:
-        return worst_skip_exit
-    return worst_exit
+        print(json.dumps(data, separators=(",", ":")), flush=True)
 
 
 _EXAMPLES = """\
@@ -175,10 +319,15 @@ examples:
   hcl2tojson a.tf b.tf -o out/             # multiple files to output dir
   hcl2tojson --ndjson a.tf b.tf            # multiple files as NDJSON
   hcl2tojson --ndjson 'modules/**/*.tf'    # glob + NDJSON streaming
+  hcl2tojson --ndjson-blocks big.tfvars    # one line per top-level block/attribute
   hcl2tojson --only resource,module file.tf # block type filtering
   hcl2tojson --exclude variable file.tf     # exclude block types
   hcl2tojson --fields cpu,memory file.tf    # field projection
   hcl2tojson --compact file.tf             # single-line JSON
+  hcl2tojson --timings file.tf             # per-stage timings on stderr
+  hcl2tojson --cache-dir .hcl2cache dir/ -o out/  # reuse results for unchanged files
+  hcl2tojson -j 8 dir/ -o out/              # convert with 8 worker processes
+  hcl2tojson -j 8 --ndjson --unordered dir/ # NDJSON lines in completion order
   echo 'x = 1' | hcl2tojson               # stdin (no args needed)
 
 exit codes:
@@ -222,7 +371,46 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
         action="store_true",
         help="Output one JSON object per line (newline-delimited JSON)",
     )
+    parser.add_argument(
+        "--ndjson-blocks",
+        action="store_true",
+        help="Output one JSON object per top-level attribute or block, each as "
+        "soon as it is parsed; keeps memory bounded for huge files",
+    )
     parser.add_argument("--version", action="version", version=__version__)
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-file parse stage timings (lex, postlex, parse, transform, "
+        "serialize) to stderr",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Convert files in N parallel worker processes (default: 1 = serial; "
+        "--timings forces serial mode)",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="With --ndjson and --jobs, write each line as soon as its file is "
+        "converted instead of in input order",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Cache parse results in DIR, keyed by file content and library version",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=DEFAULT_CACHE_MAX_SIZE_MB,
+        metavar="MB",
+        help=f"Size cap for --cache-dir in MiB (default: {DEFAULT_CACHE_MAX_SIZE_MB})",
+    )
 
     # SerializationOptions flags
     parser.add_argument(
@@ -335,25 +523,53 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
     only = args.only
     exclude = args.exclude
     fields = args.fields
-
-    def convert(in_file, out_file):
-        _hcl_to_json(
-            in_file,
-            out_file,
-            options,
-            json_indent=json_indent,
-            compact_separators=compact,
-            only=only,
-            exclude=exclude,
-            fields=fields,
+    timings = args.timings
+    cache = _open_cache(args.cache_dir, args.cache_max_size)
+
+    jobs = 1 if timings else args.jobs
+    if args.unordered and not ndjson:
+        parser.error("--unordered requires --ndjson")
+    if args.ndjson_blocks and (ndjson or timings or args.cache_dir):
+        parser.error(
+            "--ndjson-blocks cannot be combined with --ndjson, --timings or --cache-dir"
         )
 
+    # A partial of a module-level function, so it can be sent to --jobs workers
+    convert = functools.partial(
+        _hcl_to_json,
+        options=options,
+        json_indent=json_indent,
+        compact_separators=compact,
+        only=only,
+        exclude=exclude,
+        fields=fields,
+        cache=cache,
+        timings=timings,
+    )
+
     # Default to stdin when no paths given
     paths = args.PATH if args.PATH else ["-"]
     paths = _expand_file_args(paths)
     output = args.output
 
     try:
+        # Per-element NDJSON streaming mode (explicit --ndjson-blocks flag)
+        if args.ndjson_blocks:
+            file_paths = _resolve_file_paths(paths, parser)
+            exit_code = _stream_ndjson_blocks(
+                file_paths,
+                options,
+                args.skip,
+                quiet,
+                add_provenance=len(file_paths) > 1,
+                only=only,
+                exclude=exclude,
+                fields=fields,
+            )
+            if exit_code != EXIT_SUCCESS:
+                sys.exit(exit_code)
+            return
+
         # NDJSON streaming mode (explicit --ndjson flag)
         if ndjson:
             file_paths = _resolve_file_paths(paths, parser)
@@ -374,6 +590,10 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
                 only=only,
                 exclude=exclude,
                 fields=fields,
+                timings=timings,
+                cache=cache,
+                jobs=jobs,
+                ordered=not args.unordered,
             )
             if exit_code != EXIT_SUCCESS:
                 sys.exit(exit_code)
@@ -398,6 +618,7 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
                     in_extensions=_HCL_EXTENSIONS,
                     out_extension=".json",
                     quiet=quiet,
+                    jobs=jobs,
                 ):
                     sys.exit(EXIT_PARTIAL)
             else:
@@ -435,6 +656,7 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
                 HCL_SKIPPABLE,
                 out_extension=".json",
                 quiet=quiet,
+                jobs=jobs,
             ):
                 sys.exit(EXIT_PARTIAL)
     except HCL_SKIPPABLE as exc:
@@ -1,15 +1,33 @@
 """Shared file-conversion helpers for the HCL2 CLI commands."""
 
+import functools
 import glob as glob_mod
 import json
+import multiprocessing
 import os
 import signal
 import sys
+from contextlib import contextmanager
 from io import StringIO
-from typing import Callable, IO, List, Optional, Set, Tuple, Type
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    IO,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
 
 from lark import UnexpectedCharacters, UnexpectedToken
 
+from hcl2.cache import DEFAULT_MAX_SIZE, DiskParseCache
+from hcl2.profiling import profile
+
 # Exit codes shared across CLIs
 EXIT_SUCCESS = 0
 EXIT_PARTIAL = 1  # hcl2tojson: some files skipped; jsontohcl2: JSON/encoding error
@@ -17,6 +35,9 @@ EXIT_PARSE_ERROR = 2  # hcl2tojson: all unparsable; jsontohcl2: bad HCL structur
 EXIT_IO_ERROR = 4
 EXIT_DIFF = 5  # jsontohcl2 --diff: differences found
 
+# Default --cache-max-size, in MiB
+DEFAULT_CACHE_MAX_SIZE_MB = DEFAULT_MAX_SIZE // (1024 * 1024)
+
 # Exceptions that can be skipped when -s is passed
 HCL_SKIPPABLE = (UnexpectedToken, UnexpectedCharacters, UnicodeDecodeError)
 JSON_SKIPPABLE = (json.JSONDecodeError, UnicodeDecodeError)
@@ -42,6 +63,29 @@ def _error(msg: str, use_json: bool = False, **extra) -> str:
     return f"Error: {msg}"
 
 
+def _open_cache(
+    cache_dir: Optional[str], max_size_mb: int = DEFAULT_CACHE_MAX_SIZE_MB
+) -> Optional[DiskParseCache]:
+    """Return a disk parse cache for ``--cache-dir``, or ``None`` if unset."""
+    if not cache_dir:
+        return None
+    return DiskParseCache(cache_dir, max_size=max_size_mb * 1024 * 1024)
+
+
+@contextmanager
+def _report_timings(label: str, enabled: bool) -> Iterator[None]:
+    """Profile the enclosed parse and print a per-stage breakdown to stderr.
+
+    Does nothing unless *enabled*.  Nothing is printed if the block raises.
+    """
+    if not enabled:
+        yield
+        return
+    with profile() as prof:
+        yield
+    print(prof.format(label), file=sys.stderr, flush=True)
+
+
 def _expand_file_args(file_args: List[str]) -> List[str]:
     """Expand glob patterns in file arguments.
 
@@ -88,6 +132,44 @@ def _collect_files(path: str, extensions: Set[str]) -> List[str]:
     return [path]
 
 
+def _write_atomic(out_path: str, write_fn: Callable[[IO], None]) -> None:
+    """Call *write_fn* on a temporary file next to *out_path*, then move it into place.
+
+    Readers never observe a partially written *out_path*; if *write_fn* raises,
+    the temporary file is removed and *out_path* is left untouched.
+    """
+    directory, name = os.path.split(out_path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as tmp_file:
+            write_fn(tmp_file)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _convert_to_path(
+    in_file: IO,
+    out_path: str,
+    convert_fn: Callable[[IO, IO], None],
+    skip: bool,
+    skippable: Tuple[Type[BaseException], ...],
+) -> bool:
+    """Convert *in_file* into *out_path*.  Returns ``True`` on success, ``False`` if skipped."""
+    try:
+        _write_atomic(out_path, functools.partial(convert_fn, in_file))
+    except skippable:
+        if skip:
+            # Don't leave output from a previous run next to the skipped input
+            if os.path.exists(out_path):
+                os.remove(out_path)
+            return False
+        raise
+    return True
+
+
 def _convert_single_file(  # pylint: disable=too-many-positional-arguments
     in_path: str,
     out_path: Optional[str],
@@ -99,31 +181,14 @@ def _convert_single_file(  # pylint: disable=too-many-positional-arguments
     """Convert a single file.  Returns ``True`` on success, ``False`` if skipped."""
     if in_path == "-":
         if out_path is not None:
-            try:
-                with open(out_path, "w", encoding="utf-8") as out_file:
-                    convert_fn(sys.stdin, out_file)
-            except skippable:
-                if skip:
-                    if os.path.exists(out_path):
-                        os.remove(out_path)
-                    return False
-                raise
-            return True
+            return _convert_to_path(sys.stdin, out_path, convert_fn, skip, skippable)
         return _convert_single_stream(sys.stdin, convert_fn, skip, skippable)
     with open(in_path, "r", encoding="utf-8") as in_file:
         if not quiet:
             print(in_path, file=sys.stderr, flush=True)
         if out_path is not None:
-            try:
-                with open(out_path, "w", encoding="utf-8") as out_file:
-                    convert_fn(in_file, out_file)
-            except skippable:
-                if skip:
-                    if os.path.exists(out_path):
-                        os.remove(out_path)
-                    return False
-                raise
-        elif skip:
+            return _convert_to_path(in_file, out_path, convert_fn, skip, skippable)
+        if skip:
             buf = StringIO()
             try:
                 convert_fn(in_file, buf)
@@ -146,14 +211,19 @@ def _convert_directory(  # pylint: disable=too-many-positional-arguments,too-man
     in_extensions: Set[str],
     out_extension: str,
     quiet: bool = False,
+    jobs: int = 1,
 ) -> bool:
-    """Convert all matching files in a directory.  Returns ``True`` if any were skipped."""
+    """Convert all matching files in a directory.  Returns ``True`` if any were skipped.
+
+    With *jobs* above 1, files are converted in that many worker processes and
+    *convert_fn* must be picklable.
+    """
     if out_path is None:
         raise RuntimeError("Output path is required for directory conversion (use -o)")
     if not os.path.exists(out_path):
         os.makedirs(out_path)
 
-    any_skipped = False
+    pairs: List[Tuple[str, str]] = []
     processed_files: set = set()
     for current_dir, _, files in os.walk(in_path):
         dir_prefix = os.path.commonpath([in_path, current_dir])
@@ -177,24 +247,12 @@ def _convert_directory(  # pylint: disable=too-many-positional-arguments,too-man
 
             processed_files.add(in_file_path)
             processed_files.add(out_file_path)
+            pairs.append((in_file_path, out_file_path))
 
-            with open(in_file_path, "r", encoding="utf-8") as in_file:
-                if not quiet:
-                    print(in_file_path, file=sys.stderr, flush=True)
-                try:
-                    with open(out_file_path, "w", encoding="utf-8") as out_file:
-                        convert_fn(in_file, out_file)
-                except skippable:
-                    if skip:
-                        any_skipped = True
-                        if os.path.exists(out_file_path):
-                            os.remove(out_file_path)
-                        continue
-                    raise
-    return any_skipped
+    return _convert_file_pairs(pairs, convert_fn, skip, skippable, quiet, jobs)
 
 
-def _convert_multiple_files(  # pylint: disable=too-many-positional-arguments
+def _convert_multiple_files(  # pylint: disable=too-many-positional-arguments,too-many-locals
     in_paths: List[str],
     out_path: str,
     convert_fn: Callable[[IO, IO], None],
@@ -202,12 +260,13 @@ def _convert_multiple_files(  # pylint: disable=too-many-positional-arguments
     skippable: Tuple[Type[BaseException], ...],
     out_extension: str,
     quiet: bool = False,
+    jobs: int = 1,
 ) -> bool:
     """Convert multiple files into an output directory.
 
     Preserves relative path structure to avoid basename collisions when
     files from different directories share the same name.  Returns ``True``
-    if any files were skipped.
+    if any files were skipped.  *jobs* is as for :func:`_convert_directory`.
     """
     if not os.path.exists(out_path):
         os.makedirs(out_path)
@@ -215,7 +274,7 @@ def _convert_multiple_files(  # pylint: disable=too-many-positional-arguments
     common = os.path.commonpath(abs_paths) if len(abs_paths) > 1 else ""
     if common and not os.path.isdir(common):
         common = os.path.dirname(common)
-    any_skipped = False
+    pairs: List[Tuple[str, str]] = []
     for in_path, abs_path in zip(in_paths, abs_paths):
         if common:
             rel = os.path.relpath(abs_path, common)
@@ -226,13 +285,117 @@ def _convert_multiple_files(  # pylint: disable=too-many-positional-arguments
         file_out_dir = os.path.dirname(file_out)
         if file_out_dir and not os.path.exists(file_out_dir):
             os.makedirs(file_out_dir)
+        pairs.append((in_path, file_out))
+    return _convert_file_pairs(pairs, convert_fn, skip, skippable, quiet, jobs)
+
+
+def _convert_file_pairs(  # pylint: disable=too-many-positional-arguments
+    pairs: List[Tuple[str, str]],
+    convert_fn: Callable[[IO, IO], None],
+    skip: bool,
+    skippable: Tuple[Type[BaseException], ...],
+    quiet: bool,
+    jobs: int,
+) -> bool:
+    """Convert each ``(in_path, out_path)`` pair.  Returns ``True`` if any were skipped.
+
+    Files are processed in order, stopping at the first error that is not
+    skipped.  In parallel mode, workers write to temporary files that are
+    moved into place here in input order, so no output is written for files
+    after the first error, as in serial mode.  A file that failed in a worker
+    is converted again in this process so the original exception propagates
+    unchanged (Lark's parse errors cannot be sent back from a worker).
+    """
+    any_skipped = False
+    if jobs > 1 and len(pairs) > 1:
+        staged = [(in_path, _staging_path(out_path)) for in_path, out_path in pairs]
+        task = functools.partial(_convert_file_task, convert_fn, skip, skippable)
+        results = _parallel_map(task, staged, jobs)
+        try:
+            for (in_path, out_path), (_, staging_path), converted in zip(
+                pairs, staged, results
+            ):
+                if not quiet:
+                    print(in_path, file=sys.stderr, flush=True)
+                if converted is None:
+                    converted = _convert_single_file(
+                        in_path, out_path, convert_fn, skip, skippable, quiet=True
+                    )
+                elif converted:
+                    os.replace(staging_path, out_path)
+                elif os.path.exists(out_path):
+                    # As in serial mode, drop output of a previous run
+                    os.remove(out_path)
+                if not converted:
+                    any_skipped = True
+        finally:
+            results.close()  # stops the workers before their files are removed
+            for _, staging_path in staged:
+                if os.path.exists(staging_path):
+                    os.remove(staging_path)
+        return any_skipped
+
+    for in_path, out_path in pairs:
         if not _convert_single_file(
-            in_path, file_out, convert_fn, skip, skippable, quiet=quiet
+            in_path, out_path, convert_fn, skip, skippable, quiet=quiet
         ):
             any_skipped = True
     return any_skipped
 
 
+def _staging_path(out_path: str) -> str:
+    """Return the temporary file a ``--jobs`` worker writes *out_path* to."""
+    directory, name = os.path.split(out_path)
+    return os.path.join(directory, f".{name}.{os.getpid()}.part")
+
+
+def _convert_file_task(
+    convert_fn: Callable[[IO, IO], None],
+    skip: bool,
+    skippable: Tuple[Type[BaseException], ...],
+    pair: Tuple[str, str],
+) -> Optional[bool]:
+    """Worker: convert one ``(in_path, staging_path)`` pair.
+
+    Returns ``True`` on success, ``False`` if skipped and ``None`` on error,
+    including for stdin, which only the parent can read.
+    """
+    in_path, staging_path = pair
+    if in_path == "-":
+        return None
+    try:
+        with open(in_path, "r", encoding="utf-8") as in_file, open(
+            staging_path, "w", encoding="utf-8"
+        ) as out_file:
+            convert_fn(in_file, out_file)
+    except Exception as exc:  # pylint: disable=broad-except
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+        return False if skip and isinstance(exc, skippable) else None
+    return True
+
+
+def _parallel_map(
+    func: Callable[[Any], Any],
+    items: Sequence[Any],
+    jobs: int,
+    ordered: bool = True,
+) -> Generator[Any, None, None]:
+    """Yield ``func(item)`` for each of *items*, computed in up to *jobs* processes.
+
+    Results are yielded in input order, or as soon as each completes when
+    *ordered* is false.  *func* must be picklable, e.g. a module-level function
+    or a :func:`functools.partial` of one.  The pool is terminated when the
+    generator is closed, so callers may stop consuming early.
+    """
+    workers = min(jobs, len(items))
+    # Hand out several items per round trip without starving any worker.
+    chunksize = max(1, len(items) // (workers * 4))
+    with multiprocessing.Pool(workers) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        yield from mapper(func, items, chunksize)
+
+
 def _convert_single_stream(
     in_file: IO,
     convert_fn: Callable[[IO, IO], None],
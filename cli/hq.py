@@ -2,26 +2,25 @@
 
 import argparse
 import dataclasses
+import functools
 import json
-import multiprocessing
 import os
 import sys
-from typing import Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Type
 
-from hcl2.query._base import NodeView
+from hcl2.cache import ParseCache
 from hcl2.utils import SerializationOptions
-from hcl2.query.body import DocumentView
-from hcl2.query.introspect import build_schema, describe_results
-from hcl2.query.path import QuerySyntaxError
-from hcl2.query.pipeline import classify_stage, execute_pipeline, split_pipeline
-from hcl2.query.resolver import resolve_path
-from hcl2.query.safe_eval import (
-    UnsafeExpressionError,
-    _SAFE_CALLABLE_NAMES,
-    safe_eval,
-)
 from hcl2.version import __version__
 from .helpers import _expand_file_args  # noqa: F401 — re-exported for tests
+from .helpers import DEFAULT_CACHE_MAX_SIZE_MB, _open_cache, _report_timings
+
+# The query stack (hcl2.query) and the parser are imported where they are
+# used, so that --help, --version and argument errors do not load them.
+
+if TYPE_CHECKING:
+    from hcl2.query._base import NodeView
+    from hcl2.query.body import DocumentView
+    from .hq_server import DocumentIndex
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -33,15 +32,26 @@ EXIT_PARSE_ERROR = 2
 EXIT_QUERY_ERROR = 3
 EXIT_IO_ERROR = 4
 
-_EXIT_TO_ERROR_TYPE = {
-    EXIT_IO_ERROR: "io_error",
-    EXIT_PARSE_ERROR: "parse_error",
-    EXIT_QUERY_ERROR: "query_error",
-}
-
 _HCL_EXTENSIONS = {".tf", ".hcl", ".tfvars"}
 
-_EVAL_PREFIXES = tuple(f"{name}(" for name in sorted(_SAFE_CALLABLE_NAMES)) + ("doc",)
+# Parallel mode is used automatically (no ``--jobs``) from this many files.
+_AUTO_PARALLEL_MIN_FILES = 20
+
+
+@functools.lru_cache()
+def _eval_prefixes() -> Tuple[str, ...]:
+    from hcl2.query.safe_eval import _SAFE_CALLABLE_NAMES
+
+    return tuple(f"{name}(" for name in sorted(_SAFE_CALLABLE_NAMES)) + ("doc",)
+
+
+@functools.lru_cache()
+def _node_view() -> Type["NodeView"]:
+    """Return the NodeView class, importing the query stack on first use."""
+    from hcl2.query._base import NodeView
+
+    return NodeView
+
 
 EXAMPLES_TEXT = """\
 examples:
@@ -101,6 +111,13 @@ examples:
   # Pure eval (-e)
   hq -e 'doc.blocks("variable")[0].attribute("default").value' variables.tf --json
 
+  # Reuse parsed documents across invocations
+  hq 'resource[*]' dir/ --json --cache-dir ~/.cache/hq
+
+  # Keep parsed documents in a resident server
+  hq --serve /tmp/hq.sock &
+  hq 'resource[*]' dir/ --json --client /tmp/hq.sock
+
   # Introspection
   hq --describe 'variable[*]' variables.tf
   hq --schema
@@ -187,7 +204,7 @@ def _convert_for_json(
     options: Optional[SerializationOptions] = None,
 ) -> Any:
     """Recursively convert NodeViews to dicts for JSON serialization."""
-    if isinstance(value, NodeView):
+    if isinstance(value, _node_view()):
         return value.to_dict(options=options)
     if isinstance(value, list):
         return [_convert_for_json(item, options=options) for item in value]
@@ -207,7 +224,7 @@ def _extract_location(result: Any, file_path: str) -> dict:
 
     loc: dict = {"__file__": file_path}
     meta = None
-    if isinstance(result, NodeView):
+    if isinstance(result, _node_view()):
         meta = getattr(result.raw, "_meta", None)
     elif isinstance(result, _LocatedDict):
         meta = result._source_meta
@@ -240,7 +257,7 @@ def _normalize_eval_expr(expr_part: str) -> str:
     if stripped.startswith("."):
         return "_" + stripped
     # Check if it starts with a known function/variable name
-    if stripped.startswith(_EVAL_PREFIXES):
+    if stripped.startswith(_eval_prefixes()):
         return stripped
     return "_." + stripped
 
@@ -248,10 +265,12 @@ def _normalize_eval_expr(expr_part: str) -> str:
 def _dispatch_query(
     query_str: str,
     is_eval: bool,
-    doc_view: DocumentView,
+    doc_view: "DocumentView",
     file_path: str = "",
 ) -> List[Any]:
     """Dispatch a query and return results."""
+    from hcl2.query.safe_eval import safe_eval
+
     if is_eval:
         result = safe_eval(query_str, {"doc": doc_view})
         if isinstance(result, list):
@@ -261,6 +280,7 @@ def _dispatch_query(
     # Hybrid mode: checked before pipeline since "::" is unambiguous
     if "::" in query_str:
         from hcl2.query.path import parse_path
+        from hcl2.query.resolver import resolve_path
 
         path_part, expr_part = query_str.split("::", 1)
         segments = parse_path(path_part)
@@ -269,8 +289,10 @@ def _dispatch_query(
         return [safe_eval(expr, {"_": node, "doc": doc_view}) for node in nodes]
 
     # Structural mode: route through pipeline (handles pipes, builtins, select)
-    stages = [classify_stage(s) for s in split_pipeline(query_str)]
-    return execute_pipeline(doc_view, stages, file_path=file_path)
+    from hcl2.query import pipeline
+
+    stages = [pipeline.classify_stage(s) for s in pipeline.split_pipeline(query_str)]
+    return pipeline.execute_pipeline(doc_view, stages, file_path=file_path)
 
 
 # ---------------------------------------------------------------------------
@@ -298,6 +320,8 @@ class OutputConfig:
 
     def format_result(self, result: Any) -> str:
         """Format a single result for output."""
+        node_view = _node_view()
+
         if self.output_json:
             return json.dumps(
                 _convert_for_json(result, options=self.serialization_options),
@@ -306,7 +330,7 @@ class OutputConfig:
             )
 
         if self.output_raw:
-            if isinstance(result, NodeView):
+            if isinstance(result, node_view):
                 val = result.to_dict()
                 if isinstance(val, str):
                     return _strip_dollar_wrap(_strip_quotes(val))
@@ -324,7 +348,7 @@ class OutputConfig:
             return str(result)
 
         if self.output_value:
-            if isinstance(result, NodeView):
+            if isinstance(result, node_view):
                 val = result.to_dict()
                 # Auto-unwrap single-key dicts (e.g. AttributeView → inner value)
                 if isinstance(val, dict) and len(val) == 1:
@@ -336,7 +360,7 @@ class OutputConfig:
             return str(result)
 
         # Default: HCL output
-        if isinstance(result, NodeView):
+        if isinstance(result, node_view):
             return result.to_hcl()
         if isinstance(result, list):
             return self.format_list(result)
@@ -346,6 +370,8 @@ class OutputConfig:
 
     def format_list(self, items: list) -> str:
         """Format a list result (e.g. from hybrid mode returning a list)."""
+        node_view = _node_view()
+
         if self.output_json:
             converted = [
                 _convert_for_json(item, options=self.serialization_options)
@@ -354,7 +380,7 @@ class OutputConfig:
             return json.dumps(converted, indent=self.json_indent, default=str)
         parts = []
         for item in items:
-            if isinstance(item, NodeView):
+            if isinstance(item, node_view):
                 parts.append(
                     item.to_hcl() if not self.output_value else str(item.to_dict())
                 )
@@ -394,6 +420,51 @@ def _convert_results(
     return converted
 
 
+def _render_results(
+    results: List[Any],
+    file_path: str,
+    multi: bool,
+    config: OutputConfig,
+) -> Tuple[List[str], List[Any]]:
+    """Render the query results of one file.
+
+    Returns ``(lines, merged)``: text to print as-is, and converted items to
+    accumulate into the merged array of multi-file ``--json`` output.  Plain
+    Python objects only, so pool workers can render their own output.
+    """
+    # NDJSON — one line per result
+    if config.ndjson:
+        lines = []
+        for item in _convert_results(results, file_path, multi, config):
+            line = json.dumps(item, default=str)
+            if (
+                multi
+                and not config.no_filename
+                and not config.with_location
+                and not isinstance(item, dict)
+            ):
+                line = f"{file_path}:{line}"
+            lines.append(line)
+        return lines, []
+
+    # JSON + multi — accumulate for merged output
+    if config.output_json and multi:
+        return [], _convert_results(results, file_path, multi, config)
+
+    # Single-file output (with_location or default)
+    if config.with_location:
+        items = _convert_results(results, file_path, multi, config)
+        data = items[0] if len(items) == 1 else items
+        output = json.dumps(data, indent=config.json_indent, default=str)
+    else:
+        output = config.format_output(results)
+
+    if multi and not config.no_filename and not config.with_location:
+        prefix = f"{file_path}:"
+        output = "\n".join(prefix + ln for ln in output.splitlines())
+    return [output], []
+
+
 class OutputSink:
     """Owns the result output lifecycle: stream or accumulate, then flush."""
 
@@ -411,48 +482,15 @@ class OutputSink:
 
     def emit(self, results: List[Any], file_path: str) -> None:
         """Emit raw query results for one file (serial path)."""
-        # NDJSON — stream immediately
-        if self.config.ndjson:
-            for item in _convert_results(results, file_path, self.multi, self.config):
-                line = json.dumps(item, default=str)
-                if (
-                    self.multi
-                    and not self.config.no_filename
-                    and not self.config.with_location
-                    and not isinstance(item, dict)
-                ):
-                    line = f"{file_path}:{line}"
-                print(line, flush=True)
-            return
-
-        # JSON + multi — accumulate for merged output
-        if self.config.output_json and self.multi:
-            self._accumulator.extend(
-                _convert_results(results, file_path, self.multi, self.config)
-            )
-            return
-
-        # Single-file output (with_location or default)
-        if self.config.with_location:
-            items = _convert_results(results, file_path, self.multi, self.config)
-            data = items[0] if len(items) == 1 else items
-            output = json.dumps(data, indent=self.config.json_indent, default=str)
-        else:
-            output = self.config.format_output(results)
-
-        if self.multi and not self.config.no_filename and not self.config.with_location:
-            prefix = f"{file_path}:"
-            print("\n".join(prefix + ln for ln in output.splitlines()))
-        else:
-            print(output)
+        self.emit_rendered(
+            *_render_results(results, file_path, self.multi, self.config)
+        )
 
-    def emit_converted(self, converted: List[Any]) -> None:
-        """Emit pre-converted results (parallel path)."""
-        if self.config.ndjson:
-            for item in converted:
-                print(json.dumps(item, default=str), flush=True)
-        elif self.config.output_json and self.multi:
-            self._accumulator.extend(converted)
+    def emit_rendered(self, lines: List[str], merged: List[Any]) -> None:
+        """Emit output produced by :func:`_render_results` (e.g. in a worker)."""
+        for line in lines:
+            print(line, flush=self.config.ndjson)
+        self._accumulator.extend(merged)
 
     def flush(self) -> None:
         """Sort and emit accumulated JSON results."""
@@ -472,75 +510,127 @@ class OutputSink:
 # ---------------------------------------------------------------------------
 
 
-def _run_query_on_file(
+def _query_file(  # pylint: disable=too-many-positional-arguments
     file_path: str,
     query: str,
     is_eval: bool,
     use_json: bool,
     raw_query: str,
-) -> Tuple[Optional[List[Any]], int]:
+    timings: bool = False,
+    cache: Optional[ParseCache] = None,
+    documents: Optional["DocumentIndex"] = None,
+) -> Tuple[Optional[List[Any]], int, Optional[str]]:
     """Parse a file and run a query.
 
-    Returns ``(results, exit_code)``.  On error, results is ``None`` and
-    exit_code is one of the ``EXIT_*`` constants.
+    Returns ``(results, exit_code, error)``.  On error, results is ``None``,
+    exit_code is one of the ``EXIT_*`` constants and error is the message to
+    print on stderr.  With *timings*, a per-stage parse breakdown is printed
+    to stderr.  With *documents*, files are looked up in (and added to) that
+    index instead of being parsed every time.
+
+    Without a cache or index, structural queries parse the file lazily: only
+    the top-level blocks the query reaches are parsed, so syntax errors in
+    other blocks go unreported.
     """
-    try:
-        text = _read_input(file_path)
-    except (OSError, IOError) as exc:
-        print(_error(str(exc), use_json, error_type="io_error"), file=sys.stderr)
-        return None, EXIT_IO_ERROR
+    from lark.exceptions import UnexpectedInput
+
+    from hcl2.query.body import DocumentView
 
     try:
-        doc = DocumentView.parse(text)
+        if documents is not None and file_path != "-":
+            with _report_timings(file_path, timings):
+                doc = documents.get(file_path, cache=cache)
+        else:
+            text = _read_input(file_path)
+            with _report_timings(file_path, timings):
+                doc = DocumentView.parse(
+                    text, cache=cache, lazy=not is_eval and cache is None
+                )
+    except (OSError, IOError) as exc:
+        return None, EXIT_IO_ERROR, _error(str(exc), use_json, error_type="io_error")
     except Exception as exc:  # pylint: disable=broad-except
-        print(
-            _error(str(exc), use_json, error_type="parse_error", file=file_path),
-            file=sys.stderr,
-        )
-        return None, EXIT_PARSE_ERROR
+        error = _error(str(exc), use_json, error_type="parse_error", file=file_path)
+        return None, EXIT_PARSE_ERROR, error
 
     try:
-        return _dispatch_query(query, is_eval, doc, file_path=file_path), EXIT_SUCCESS
+        results = _dispatch_query(query, is_eval, doc, file_path=file_path)
+        _parse_results(results)
+    except UnexpectedInput as exc:
+        # A lazily parsed block reached by the query is malformed
+        error = _error(str(exc), use_json, error_type="parse_error", file=file_path)
+        return None, EXIT_PARSE_ERROR, error
     except Exception as exc:  # pylint: disable=broad-except
-        if isinstance(exc, QuerySyntaxError):
-            extra = {"error_type": "query_syntax", "query": raw_query}
-        elif isinstance(exc, UnsafeExpressionError):
-            extra = {"error_type": "unsafe_expression", "expression": raw_query}
-        else:
-            extra = {"error_type": "eval_error", "query": raw_query}
-        print(_error(str(exc), use_json, **extra), file=sys.stderr)
-        return None, EXIT_QUERY_ERROR
+        return None, EXIT_QUERY_ERROR, _query_error(exc, use_json, raw_query)
+    return results, EXIT_SUCCESS, None
 
 
-def _process_file(args_tuple):
-    """Worker: parse, query, and convert results for one file.
+def _parse_results(results: List[Any]) -> None:
+    """Parse any lazy blocks within *results* before they are rendered.
 
-    Returns ``(file_path, exit_code, converted_results, error_msg)``.
-    All return values are picklable plain Python objects.
+    Rendering happens outside :func:`_query_file` (in pool workers too), so a
+    syntax error in a selected block must surface here to be reported as a
+    parse error.
     """
-    file_path, query, is_eval, raw_query, multi, output_config = args_tuple
+    from hcl2.lazy import LazyBlockRule
+    from hcl2.rules.base import BodyRule, StartRule
 
-    try:
-        text = _read_input(file_path)
-    except (OSError, IOError) as exc:
-        return (file_path, EXIT_IO_ERROR, None, str(exc))
-
-    try:
-        doc = DocumentView.parse(text)
-    except Exception as exc:  # pylint: disable=broad-except
-        return (file_path, EXIT_PARSE_ERROR, None, str(exc))
-
-    try:
-        results = _dispatch_query(query, is_eval, doc, file_path=file_path)
-    except Exception as exc:  # pylint: disable=broad-except
-        return (file_path, EXIT_QUERY_ERROR, None, str(exc))
+    node_view = _node_view()
+    for result in results:
+        if not isinstance(result, node_view):
+            continue
+        node = result.raw
+        if isinstance(node, StartRule):
+            node = node.body
+        # Only top-level blocks are lazy: a document, its body or one of them
+        nodes = node.children if isinstance(node, BodyRule) else [node]
+        for child in nodes:
+            if isinstance(child, LazyBlockRule):
+                child.children  # pylint: disable=pointless-statement
+
+
+def _query_error(exc: Exception, use_json: bool, raw_query: str) -> str:
+    """Format the error raised by running *raw_query*."""
+    from hcl2.query.path import QuerySyntaxError
+    from hcl2.query.safe_eval import UnsafeExpressionError
+
+    if isinstance(exc, QuerySyntaxError):
+        extra = {"error_type": "query_syntax", "query": raw_query}
+    elif isinstance(exc, UnsafeExpressionError):
+        extra = {"error_type": "unsafe_expression", "expression": raw_query}
+    else:
+        extra = {"error_type": "eval_error", "query": raw_query}
+    return _error(str(exc), use_json, **extra)
 
-    if not results:
-        return (file_path, EXIT_SUCCESS, [], None)
 
-    converted = _convert_results(results, file_path, multi, output_config)
+def _run_query_on_file(  # pylint: disable=too-many-positional-arguments
+    file_path: str,
+    query: str,
+    is_eval: bool,
+    use_json: bool,
+    raw_query: str,
+    timings: bool = False,
+    cache: Optional[ParseCache] = None,
+    documents: Optional["DocumentIndex"] = None,
+) -> Tuple[Optional[List[Any]], int]:
+    """Parse a file and run a query.
 
-    return (file_path, EXIT_SUCCESS, converted, None)
+    Returns ``(results, exit_code)``.  On error, results is ``None``,
+    exit_code is one of the ``EXIT_*`` constants and the error is printed to
+    stderr.  With *timings*, a per-stage parse breakdown is printed to stderr.
+    """
+    results, exit_code, error = _query_file(
+        file_path,
+        query,
+        is_eval,
+        use_json,
+        raw_query,
+        timings=timings,
+        cache=cache,
+        documents=documents,
+    )
+    if error is not None:
+        print(error, file=sys.stderr)
+    return results, exit_code
 
 
 def _run_diff(
@@ -694,6 +784,26 @@ def _build_parser() -> argparse.ArgumentParser:
         metavar="N",
         help="Parallel workers (default: auto for large file sets, 0 or 1 = serial)",
     )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-file parse stage timings to stderr (forces serial mode)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Cache parsed documents in DIR, keyed by file content and library version",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=DEFAULT_CACHE_MAX_SIZE_MB,
+        metavar="MB",
+        help=f"Size cap for --cache-dir in MiB (default: {DEFAULT_CACHE_MAX_SIZE_MB})",
+    )
+    from .hq_server import add_arguments
+
+    add_arguments(parser)
     return parser
 
 
@@ -756,6 +866,8 @@ def _resolve_query(
     """
     # --schema: dump schema and exit
     if args.schema:
+        from hcl2.query.introspect import build_schema
+
         print(json.dumps(build_schema(), indent=2))
         sys.exit(EXIT_SUCCESS)
 
@@ -788,14 +900,19 @@ def _resolve_query(
     return query, optional
 
 
-def _execute_and_emit(
+def _execute_and_emit(  # pylint: disable=too-many-positional-arguments
     args: argparse.Namespace,
     query: str,
     optional: bool,
     use_json: bool,
     output_config: OutputConfig,
+    documents: Optional["DocumentIndex"] = None,
 ) -> int:
-    """Execute queries across files and emit results. Returns an exit code."""
+    """Execute queries across files and emit results. Returns an exit code.
+
+    With *documents* (the ``--serve`` index), files are queried serially in
+    this process so that parsed documents are reused across requests.
+    """
     file_paths = [
         fp for fa in _expand_file_args(args.FILE) for fp in _collect_files(fa)
     ]
@@ -803,43 +920,37 @@ def _execute_and_emit(
     worst_exit = EXIT_SUCCESS
     multi = len(file_paths) > 1
 
+    if args.jobs is None:
+        use_parallel = len(file_paths) >= _AUTO_PARALLEL_MIN_FILES
+    else:
+        use_parallel = args.jobs > 1
     use_parallel = (
-        multi
-        and len(file_paths) >= 20
+        use_parallel
+        and multi
         and "-" not in file_paths
-        and not args.eval
         and not args.describe
-        and (args.json or args.ndjson)
-        and (args.jobs is None or args.jobs > 1)
+        and not args.timings
+        and documents is None
     )
 
     with OutputSink(output_config, multi) as sink:
         if use_parallel:
-            n_workers = args.jobs or min(os.cpu_count() or 1, len(file_paths))
-            worker_args = [
-                (fp, query, False, args.QUERY, multi, output_config)
-                for fp in file_paths
-            ]
-            with multiprocessing.Pool(n_workers) as pool:
-                for fp, exit_code, converted, error_msg in pool.imap_unordered(
-                    _process_file, worker_args
-                ):
-                    if error_msg:
-                        etype = _EXIT_TO_ERROR_TYPE.get(exit_code, "error")
-                        print(
-                            _error(error_msg, use_json, error_type=etype),
-                            file=sys.stderr,
-                        )
-                        worst_exit = max(worst_exit, exit_code)
-                        continue
-                    if not converted:
-                        continue
-                    any_results = True
-                    sink.emit_converted(converted)
+            from .hq_parallel import QueryJob, run_parallel
+
+            job = QueryJob(query, args.eval, use_json, args.QUERY, multi, output_config)
+            any_results, worst_exit = run_parallel(job, file_paths, args, sink)
         else:
+            cache = _open_cache(args.cache_dir, args.cache_max_size)
             for file_path in file_paths:
                 results, exit_code = _run_query_on_file(
-                    file_path, query, args.eval, use_json, args.QUERY
+                    file_path,
+                    query,
+                    args.eval,
+                    use_json,
+                    args.QUERY,
+                    timings=args.timings,
+                    cache=cache,
+                    documents=documents,
                 )
                 if results is None:
                     worst_exit = max(worst_exit, exit_code)
@@ -848,6 +959,8 @@ def _execute_and_emit(
                     continue
                 any_results = True
                 if args.describe:
+                    from hcl2.query.introspect import describe_results
+
                     print(json.dumps(describe_results(results), indent=2))
                     continue
                 sink.emit(results, file_path)
@@ -857,13 +970,28 @@ def _execute_and_emit(
     return EXIT_SUCCESS if optional else worst_exit or EXIT_NO_RESULTS
 
 
+def _run(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    documents: Optional["DocumentIndex"] = None,
+) -> int:
+    """Run one hq invocation described by *args*. Returns an exit code."""
+    use_json, output_config = _validate_and_configure(parser, args)
+    query, optional = _resolve_query(args, parser, use_json, output_config)
+    return _execute_and_emit(
+        args, query, optional, use_json, output_config, documents=documents
+    )
+
+
 def main():
     """The ``hq`` console_scripts entry point."""
     parser = _build_parser()
     args = parser.parse_args()
-    use_json, output_config = _validate_and_configure(parser, args)
-    query, optional = _resolve_query(args, parser, use_json, output_config)
-    sys.exit(_execute_and_emit(args, query, optional, use_json, output_config))
+    if args.serve or args.client:
+        from .hq_server import dispatch
+
+        sys.exit(dispatch(args, sys.argv[1:]))
+    sys.exit(_run(parser, args))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""Parallel mode of ``hq``: query many files in a ``multiprocessing.Pool``.
+
+Files are split into contiguous chunks of roughly equal size; each worker
+parses, queries and renders a chunk and sends back the rendered output, which
+the parent emits in input order.
+"""
+
+import argparse
+import dataclasses
+import functools
+import multiprocessing
+import os
+import sys
+from typing import Any, List, Optional, Tuple
+
+from hcl2.cache import ParseCache
+from .helpers import _open_cache
+from .hq import EXIT_SUCCESS, OutputConfig, OutputSink, _query_file, _render_results
+
+
+@dataclasses.dataclass
+class QueryJob:
+    """A query to run over many files in pool workers.
+
+    All fields are primitives or dataclasses, ensuring picklability.
+    """
+
+    query: str
+    is_eval: bool
+    use_json: bool
+    raw_query: str
+    multi: bool
+    output_config: OutputConfig
+
+
+# Parse cache of a pool worker process, set up by ``_init_worker``.
+_worker_cache: Optional[ParseCache] = None
+
+# Input is split into about this many chunks per worker, balancing IPC
+# round trips against idle workers at the end of the run.
+_CHUNKS_PER_WORKER = 4
+
+
+def _init_worker(cache_dir: Optional[str], cache_max_size_mb: int) -> None:
+    """Pool initializer: open the worker's parse cache and load the parser.
+
+    Loading the grammar here, while the parent is still collecting files,
+    keeps it off the critical path of the worker's first chunk.
+    """
+    from hcl2.parser import inline_parser
+
+    global _worker_cache  # pylint: disable=global-statement
+    _worker_cache = _open_cache(cache_dir, cache_max_size_mb)
+    inline_parser()
+
+
+def _process_file(
+    job: QueryJob, file_path: str
+) -> Tuple[str, int, Optional[Tuple[List[str], List[Any]]], Optional[str]]:
+    """Worker: parse, query, and render results for one file.
+
+    Returns ``(file_path, exit_code, rendered, error)`` where *rendered* is
+    the ``(lines, merged)`` pair of :func:`_render_results`, or None on error,
+    and *error* is the message to print on stderr.
+    All return values are picklable plain Python objects.
+    """
+    results, exit_code, error = _query_file(
+        file_path,
+        job.query,
+        job.is_eval,
+        job.use_json,
+        job.raw_query,
+        cache=_worker_cache,
+    )
+    if results is None:
+        return (file_path, exit_code, None, error)
+    if not results:
+        return (file_path, EXIT_SUCCESS, ([], []), None)
+    rendered = _render_results(results, file_path, job.multi, job.output_config)
+    return (file_path, EXIT_SUCCESS, rendered, None)
+
+
+def _process_chunk(job: QueryJob, file_paths: List[str]) -> List[Tuple[Any, ...]]:
+    """Worker: :func:`_process_file` for each of a chunk of files."""
+    return [_process_file(job, file_path) for file_path in file_paths]
+
+
+def _chunk_by_size(file_paths: List[str], n_workers: int) -> List[List[str]]:
+    """Split *file_paths* into contiguous chunks of roughly equal total bytes.
+
+    Sizing chunks by bytes rather than file count keeps a few large files from
+    landing in one chunk while many small files cost one round trip per chunk
+    instead of per file.
+    """
+    sizes = []
+    for file_path in file_paths:
+        try:
+            sizes.append(os.path.getsize(file_path))
+        except OSError:
+            sizes.append(0)  # reported by the worker
+    target = max(sum(sizes) / (n_workers * _CHUNKS_PER_WORKER), 1)
+
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_size = 0
+    for file_path, size in zip(file_paths, sizes):
+        current.append(file_path)
+        current_size += size
+        if current_size >= target:
+            chunks.append(current)
+            current, current_size = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def run_parallel(
+    job: QueryJob, file_paths: List[str], args: argparse.Namespace, sink: OutputSink
+) -> Tuple[bool, int]:
+    """Run *job* over *file_paths* in ``args.jobs`` workers, emitting to *sink*.
+
+    Returns ``(any_results, worst_exit)``.
+    """
+    any_results = False
+    worst_exit = EXIT_SUCCESS
+    n_workers = min(args.jobs or os.cpu_count() or 1, len(file_paths))
+    with multiprocessing.Pool(
+        n_workers,
+        initializer=_init_worker,
+        initargs=(args.cache_dir, args.cache_max_size),
+    ) as pool:
+        # imap keeps chunks, and so output, in input order
+        for chunk in pool.imap(
+            functools.partial(_process_chunk, job),
+            _chunk_by_size(file_paths, n_workers),
+        ):
+            for _fp, exit_code, rendered, error in chunk:
+                if rendered is None:
+                    print(error, file=sys.stderr)
+                    worst_exit = max(worst_exit, exit_code)
+                    continue
+                lines, merged = rendered
+                if lines or merged:
+                    any_results = True
+                sink.emit_rendered(lines, merged)
+    return any_results, worst_exit
@@ -0,0 +1,304 @@
+"""``hq --serve`` / ``hq --client``: answer queries from a resident process.
+
+The server keeps every parsed :class:`~hcl2.query.body.DocumentView` in memory
+and reparses a file only when its inode, size or modification time changes,
+so the cost of loading the grammar and parsing a workspace is paid once
+instead of on every ``hq`` invocation.
+
+The client forwards its command line, working directory and stdin over a
+Unix domain socket; the server runs the query exactly as ``hq`` would and
+sends back stdout, stderr and the exit code.  One JSON request and one JSON
+response are exchanged per connection.  Requests are served one at a time.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from hcl2.cache import ParseCache
+
+if TYPE_CHECKING:
+    from hcl2.query.body import DocumentView
+
+# Bump when the request or response layout changes.
+PROTOCOL_VERSION = 1
+
+# Documents kept by a server before the least recently used one is dropped.
+DEFAULT_MAX_DOCUMENTS = 1024
+
+# Flags that only make sense on the hq command line, not inside a request.
+_LOCAL_FLAGS = ("--serve", "--client")
+
+
+class DocumentIndex:
+    """Parsed documents keyed by real path, invalidated when the file changes.
+
+    A file is considered changed when its device, inode, size or modification
+    time differ from when it was parsed, which also catches editors that save
+    by replacing the file.  At most *max_entries* documents are kept; the least
+    recently used one is dropped when full.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_DOCUMENTS):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, ...], DocumentView]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, cache: Optional[ParseCache] = None) -> "DocumentView":
+        """Return the document for *path*, parsing it if new or changed.
+
+        :raises OSError: if the file cannot be read; its entry is dropped.
+        """
+        from hcl2.query.body import DocumentView
+
+        real_path = os.path.realpath(path)
+        try:
+            stat = os.stat(path)
+            key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            entry = self._entries.get(real_path)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                self._entries.move_to_end(real_path)
+                return entry[1]
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            self._entries.pop(real_path, None)
+            raise
+        self.misses += 1
+        document = DocumentView.parse(text, cache=cache)
+        self._entries[real_path] = (key, document)
+        self._entries.move_to_end(real_path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return document
+
+    def prune(self) -> None:
+        """Drop the documents of files that no longer exist."""
+        for real_path in [p for p in self._entries if not os.path.exists(p)]:
+            del self._entries[real_path]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _CapturedOutput(io.StringIO):
+    """In-memory stream reporting the client's terminal status from ``isatty``."""
+
+    def __init__(self, value: str = "", isatty: bool = False):
+        super().__init__(value)
+        self._isatty = isatty
+
+    def isatty(self) -> bool:
+        return self._isatty
+
+
+def run_request(request: Dict[str, Any], documents: DocumentIndex) -> Dict[str, Any]:
+    """Run one client request and return the response."""
+    # pylint: disable=import-outside-toplevel  # cli.hq imports this module
+    from cli.hq import _build_parser, _run
+
+    if request.get("version") != PROTOCOL_VERSION:
+        return {
+            "exit_code": 2,
+            "stdout": "",
+            "stderr": "Error: hq client and server versions differ\n",
+        }
+
+    stdout = _CapturedOutput(isatty=request.get("stdout_isatty", False))
+    stderr = _CapturedOutput()
+    stdin = _CapturedOutput(
+        request.get("stdin") or "", isatty=request.get("stdin_isatty", False)
+    )
+    saved_stdin, saved_cwd = sys.stdin, os.getcwd()
+    try:
+        sys.stdin = stdin
+        os.chdir(request["cwd"])
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                parser = _build_parser()
+                args = parser.parse_args(request["argv"])
+                if args.serve or args.client:
+                    parser.error("--serve and --client cannot be sent to a server")
+                exit_code = _run(parser, args, documents=documents)
+            except SystemExit as exc:
+                exit_code = exc.code if isinstance(exc.code, int) else 1
+    except Exception as exc:  # pylint: disable=broad-except
+        # Report failures to the client instead of dropping the connection.
+        stderr.write(f"Error: {exc}\n")
+        exit_code = 1
+    finally:
+        sys.stdin = saved_stdin
+        os.chdir(saved_cwd)
+    return {
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Read one JSON request until EOF and write one JSON response."""
+
+    server: "HqServer"
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.read())
+        except ValueError:
+            request = None
+        if isinstance(request, dict):
+            response = run_request(request, self.server.documents)
+        else:
+            response = {
+                "exit_code": 1,
+                "stdout": "",
+                "stderr": "Error: malformed request to hq server\n",
+            }
+        self.server.documents.prune()
+        self.wfile.write(json.dumps(response).encode("utf-8"))
+
+
+class HqServer(socketserver.UnixStreamServer):
+    """Unix socket server answering hq queries from a :class:`DocumentIndex`."""
+
+    def __init__(self, socket_path: str):
+        self.documents = DocumentIndex()
+        # Only the current user may connect: queries read any file they can.
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.server_address)  # type: ignore[arg-type]
+
+
+def serve(socket_path: str) -> int:
+    """Serve queries on *socket_path* until interrupted.  Returns an exit code."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: --serve requires Unix domain sockets", file=sys.stderr)
+        return 2
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            print(f"Error: hq server already running on {socket_path}", file=sys.stderr)
+            return 2
+        os.unlink(socket_path)  # stale socket from a crashed server
+
+    # Stop cleanly, removing the socket file, on SIGTERM as well as Ctrl-C.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with HqServer(socket_path) as server:
+        print(f"hq: serving on {socket_path}", file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def run_client(socket_path: str, argv: List[str]) -> int:
+    """Send *argv* to the server on *socket_path* and replay its output."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: --client requires Unix domain sockets", file=sys.stderr)
+        return 2
+    stdin_isatty = sys.stdin.isatty()
+    request = {
+        "version": PROTOCOL_VERSION,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "stdin": None if stdin_isatty or not _reads_stdin(argv) else sys.stdin.read(),
+        "stdin_isatty": stdin_isatty,
+        "stdout_isatty": sys.stdout.isatty(),
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+            data = b"".join(iter(lambda: sock.recv(65536), b""))
+    except OSError as exc:
+        print(f"Error: cannot reach hq server on {socket_path}: {exc}", file=sys.stderr)
+        return 4
+    try:
+        response = json.loads(data)
+        stdout, stderr = response["stdout"], response["stderr"]
+        exit_code = int(response["exit_code"])
+    except (ValueError, TypeError, KeyError):
+        print(
+            f"Error: invalid response from hq server on {socket_path}", file=sys.stderr
+        )
+        return 4
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return exit_code
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the ``--serve`` and ``--client`` options to the hq *parser*."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help="Run a server on Unix socket SOCKET keeping parsed files in memory",
+    )
+    group.add_argument(
+        "--client",
+        metavar="SOCKET",
+        help="Send this query to the hq server listening on SOCKET",
+    )
+
+
+def dispatch(args: argparse.Namespace, argv: List[str]) -> int:
+    """Serve or forward the hq command line *argv*, parsed into *args*."""
+    if args.serve:
+        return serve(args.serve)
+    return run_client(args.client, strip_local_flags(argv))
+
+
+def strip_local_flags(argv: List[str]) -> List[str]:
+    """Remove ``--serve``/``--client`` and their values from *argv*."""
+    result = []
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+        elif arg in _LOCAL_FLAGS:
+            skip_next = True
+        elif not arg.startswith(tuple(f"{flag}=" for flag in _LOCAL_FLAGS)):
+            result.append(arg)
+    return result
+
+
+def _reads_stdin(argv: List[str]) -> bool:
+    """Return True if the hq command line *argv* reads input from stdin."""
+    # pylint: disable=import-outside-toplevel  # cli.hq imports this module
+    from cli.hq import _build_parser
+
+    try:
+        args = _build_parser().parse_args(argv)
+    except SystemExit:
+        return False
+    return "-" in args.FILE
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
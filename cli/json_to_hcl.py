@@ -2,6 +2,7 @@
 
 import argparse
 import difflib
+import functools
 import json
 import os
 import sys
@@ -86,6 +87,7 @@ _EXAMPLES = """\
 examples:
   jsontohcl2 file.json                                   # single file to stdout
   jsontohcl2 a.json b.json -o out/                      # multiple files to output dir
+  jsontohcl2 -j 8 json_dir/ -o out/                      # convert with 8 worker processes
   jsontohcl2 --diff original.tf modified.json            # preview text changes
   jsontohcl2 --semantic-diff original.tf modified.json   # semantic-only changes
   jsontohcl2 --semantic-diff original.tf --diff-json m.json  # semantic diff as JSON
@@ -163,6 +165,15 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
         action="store_true",
         help="Output diff results as JSON (works with --diff and --semantic-diff)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Convert files in N parallel worker processes when writing to an "
+        "output directory (default: 1 = serial)",
+    )
     parser.add_argument("--version", action="version", version=__version__)
 
     # DeserializerOptions flags
@@ -234,8 +245,8 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
     )
     quiet = args.quiet
 
-    def convert(in_file, out_file):
-        _json_to_hcl(in_file, out_file, d_opts, f_opts)
+    # A partial of a module-level function, so it can be sent to --jobs workers
+    convert = functools.partial(_json_to_hcl, d_opts=d_opts, f_opts=f_opts)
 
     # Default to stdin when no paths given
     paths = args.PATH if args.PATH else ["-"]
@@ -382,6 +393,7 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
                     in_extensions={".json"},
                     out_extension=".tf",
                     quiet=quiet,
+                    jobs=args.jobs,
                 ):
                     sys.exit(EXIT_PARTIAL)
             else:
@@ -429,6 +441,7 @@ def main():  # pylint: disable=too-many-branches,too-many-statements,too-many-lo
                     JSON_SKIPPABLE,
                     out_extension=".tf",
                     quiet=quiet,
+                    jobs=args.jobs,
                 )
             if any_skipped:
                 sys.exit(EXIT_PARTIAL)
@@ -1,29 +1,100 @@
-"""For package documentation, see README"""
+"""For package documentation, see README
+
+The public names below are imported on first access (PEP 562), so that
+``import hcl2`` only loads the modules a program actually uses: parsing does
+not import the deserializer, formatter or reconstructor, and vice versa.
+"""
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any, Dict, List
 
 try:
     from .version import version as __version__
 except ImportError:
     __version__ = "unknown"
 
-from .api import (
-    load,
-    loads,
-    dump,
-    dumps,
-    parse,
-    parses,
-    parse_to_tree,
-    parses_to_tree,
-    from_dict,
-    from_json,
-    reconstruct,
-    transform,
-    serialize,
-    query,
-)
-
-from .builder import Builder
-from .deserializer import DeserializerOptions
-from .formatter import FormatterOptions
-from .rules.base import StartRule
-from .utils import SerializationOptions
+# Public name -> submodule defining it
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "load": "api",
+    "loads": "api",
+    "dump": "api",
+    "dumps": "api",
+    "parse": "api",
+    "parses": "api",
+    "parse_expression": "api",
+    "parse_to_tree": "api",
+    "parses_to_tree": "api",
+    "from_dict": "api",
+    "from_json": "api",
+    "reconstruct": "api",
+    "transform": "api",
+    "serialize": "api",
+    "query": "api",
+    "TextEdit": "incremental",
+    "reparse": "incremental",
+    "profile": "profiling",
+    "iter_blocks": "stream",
+    "iter_dumps": "stream",
+    "Builder": "builder",
+    "DiskParseCache": "cache",
+    "ExpressionCache": "cache",
+    "MemoryParseCache": "cache",
+    "ParseCache": "cache",
+    "DeserializerOptions": "deserializer",
+    "FormatterOptions": "formatter",
+    "StartRule": "rules.base",
+    "SerializationOptions": "utils",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from .api import (
+        load,
+        loads,
+        dump,
+        dumps,
+        parse,
+        parses,
+        parse_expression,
+        parse_to_tree,
+        parses_to_tree,
+        from_dict,
+        from_json,
+        reconstruct,
+        transform,
+        serialize,
+        query,
+    )
+
+    from .incremental import TextEdit, reparse
+    from .profiling import profile
+    from .stream import iter_blocks, iter_dumps
+
+    from .builder import Builder
+    from .cache import DiskParseCache, ExpressionCache, MemoryParseCache, ParseCache
+    from .deserializer import DeserializerOptions
+    from .formatter import FormatterOptions
+    from .rules.base import StartRule
+    from .utils import SerializationOptions
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        # Submodules such as hcl2.api or hcl2.rules were bound by the eager
+        # imports this package used to make; keep them reachable as attributes
+        if (
+            name.startswith("_")
+            or importlib.util.find_spec(f".{name}", __name__) is None
+        ):
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        return importlib.import_module(f".{name}", __name__)
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Later lookups find the name directly
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
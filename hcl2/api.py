@@ -5,18 +5,39 @@ Also exposes intermediate pipeline stages for advanced usage.
 """
 
 import json as _json
-from typing import TextIO, Optional
+import mmap as _mmap
+import os as _os
+from typing import IO, TYPE_CHECKING, AnyStr, Optional, TextIO, Union
 
 from lark.tree import Tree
 
-from hcl2.deserializer import BaseDeserializer, DeserializerOptions
-from hcl2.formatter import BaseFormatter, FormatterOptions
+from hcl2.parser import expression_parser as _get_expression_parser
+from hcl2.parser import inline_parser as _get_inline_parser
+from hcl2.parser import is_parser_loaded as _is_parser_loaded
 from hcl2.parser import parser as _get_parser
-from hcl2.reconstructor import HCLReconstructor
+from hcl2.profiling import (
+    active_profile as _active_profile,
+    count_element_nodes as _count_element_nodes,
+    count_tree_nodes as _count_tree_nodes,
+)
+from hcl2.rules.abstract import LarkRule
 from hcl2.rules.base import StartRule
+from hcl2.rules.expressions import ExpressionRule
 from hcl2.transformer import RuleTransformer
+from hcl2.tree_serializer import TreeSerializer
 from hcl2.utils import SerializationOptions
 
+# Only needed for dump/dumps/from_dict/reconstruct, or only for annotations;
+# imported where used so that parsing does not load them.
+if TYPE_CHECKING:
+    from hcl2.cache import ParseCache
+    from hcl2.deserializer import DeserializerOptions
+    from hcl2.formatter import FormatterOptions
+
+# HCL2 source accepted by the string-based functions. Anything other than a
+# str is decoded as UTF-8, without translating line endings.
+Source = Union[str, bytes, bytearray, memoryview, _mmap.mmap]
+
 
 # ---------------------------------------------------------------------------
 # Primary API: load / loads / dump / dumps
@@ -24,29 +45,52 @@ from hcl2.utils import SerializationOptions
 
 
 def load(
-    file: TextIO,
+    file: IO[AnyStr],
     *,
     serialization_options: Optional[SerializationOptions] = None,
+    cache: Optional["ParseCache"] = None,
 ) -> dict:
     """Load a HCL2 file and return a Python dict.
 
-    :param file: File with HCL2 content.
+    :param file: Text or binary file with HCL2 content.
     :param serialization_options: Options controlling serialization behavior.
+    :param cache: Optional parse cache consulted before parsing.
     """
-    return loads(file.read(), serialization_options=serialization_options)
+    return loads(_read(file), serialization_options=serialization_options, cache=cache)
 
 
 def loads(
-    text: str,
+    text: Source,
     *,
     serialization_options: Optional[SerializationOptions] = None,
+    cache: Optional["ParseCache"] = None,
 ) -> dict:
     """Load HCL2 from a string and return a Python dict.
 
-    :param text: HCL2 text.
+    :param text: HCL2 text, or UTF-8 encoded HCL2 as a bytes-like object.
     :param serialization_options: Options controlling serialization behavior.
+    :param cache: Optional parse cache consulted before parsing.
     """
-    tree = parses(text)
+    text = _as_text(text)
+    if cache is None:
+        return _loads(text, serialization_options)
+
+    options = serialization_options or SerializationOptions()
+    data = cache.get_dict(text, options)
+    if data is None:
+        data = _loads(text, options)
+        cache.put_dict(text, options, data)
+    return data
+
+
+def _loads(text: str, serialization_options: Optional[SerializationOptions]) -> dict:
+    options = serialization_options or SerializationOptions()
+    tree: Union[Tree, StartRule]
+    if TreeSerializer.supports(options):
+        # Serialize the raw parse tree directly, skipping the LarkElement tree
+        tree = parses_to_tree(text)
+    else:
+        tree = parses(text)
     return serialize(tree, serialization_options=serialization_options)
 
 
@@ -54,8 +98,9 @@ def dump(
     data: dict,
     file: TextIO,
     *,
-    deserializer_options: Optional[DeserializerOptions] = None,
-    formatter_options: Optional[FormatterOptions] = None,
+    deserializer_options: Optional["DeserializerOptions"] = None,
+    formatter_options: Optional["FormatterOptions"] = None,
+    stream: bool = False,
 ) -> None:
     """Write a Python dict as HCL2 to a file.
 
@@ -63,7 +108,20 @@ def dump(
     :param file: Writable text file.
     :param deserializer_options: Options controlling deserialization behavior.
     :param formatter_options: Options controlling formatting behavior.
+    :param stream: If True, convert and write one top-level attribute or
+        block at a time (see :func:`hcl2.stream.iter_dumps`), so that only
+        the element being written is held in memory. The output is the same.
     """
+    if stream:
+        from hcl2.stream import iter_dumps
+
+        for chunk in iter_dumps(
+            data,
+            deserializer_options=deserializer_options,
+            formatter_options=formatter_options,
+        ):
+            file.write(chunk)
+        return
     file.write(
         dumps(
             data,
@@ -76,8 +134,8 @@ def dump(
 def dumps(
     data: dict,
     *,
-    deserializer_options: Optional[DeserializerOptions] = None,
-    formatter_options: Optional[FormatterOptions] = None,
+    deserializer_options: Optional["DeserializerOptions"] = None,
+    formatter_options: Optional["FormatterOptions"] = None,
 ) -> str:
     """Convert a Python dict to an HCL2 string.
 
@@ -98,41 +156,136 @@ def dumps(
 # ---------------------------------------------------------------------------
 
 
-def parse(file: TextIO, *, discard_comments: bool = False) -> StartRule:
+def parse(
+    file: IO[AnyStr],
+    *,
+    discard_comments: bool = False,
+    cache: Optional["ParseCache"] = None,
+) -> StartRule:
     """Parse a HCL2 file into a LarkElement tree.
 
-    :param file: File with HCL2 content.
+    :param file: Text or binary file with HCL2 content.
     :param discard_comments: If True, discard comments during transformation.
+    :param cache: Optional parse cache consulted before parsing.
     """
-    return parses(file.read(), discard_comments=discard_comments)
+    return parses(_read(file), discard_comments=discard_comments, cache=cache)
 
 
-def parses(text: str, *, discard_comments: bool = False) -> StartRule:
+def parses(
+    text: Source,
+    *,
+    discard_comments: bool = False,
+    cache: Optional["ParseCache"] = None,
+) -> StartRule:
     """Parse a HCL2 string into a LarkElement tree.
 
-    :param text: HCL2 text.
+    :param text: HCL2 text, or UTF-8 encoded HCL2 as a bytes-like object.
+    :param discard_comments: If True, discard comments during transformation.
+    :param cache: Optional parse cache consulted before parsing.
+    """
+    text = _as_text(text)
+    if cache is not None:
+        cached = cache.get_tree(text, discard_comments)
+        if cached is not None:
+            return cached
+    tree: StartRule
+    if _active_profile() is None:
+        # The transformer runs inside the parser, so no raw Lark tree is built
+        tree = _get_inline_parser(discard_comments).parse(_terminated(text))  # type: ignore[assignment]
+    else:
+        # Parse and transform separately so each stage is timed on its own
+        lark_tree = parses_to_tree(text)
+        tree = transform(lark_tree, discard_comments=discard_comments)
+    if cache is not None:
+        cache.put_tree(text, tree, discard_comments)
+    return tree
+
+
+def parse_expression(text: Source, *, discard_comments: bool = False) -> ExpressionRule:
+    """Parse a single HCL2 expression, such as ``var.region`` or ``a ? b : c``.
+
+    The text is parsed as a single expression rather than as a body.
+    Newlines and comments before or after the expression are accepted and
+    dropped. The returned rule has no parent.
+
+    :param text: HCL2 expression, or UTF-8 encoded as a bytes-like object.
     :param discard_comments: If True, discard comments during transformation.
     """
-    lark_tree = parses_to_tree(text)
-    return transform(lark_tree, discard_comments=discard_comments)
+    return _get_expression_parser(discard_comments).parse(  # type: ignore[return-value]
+        _as_text(text)
+    )
 
 
-def parse_to_tree(file: TextIO) -> Tree:
+def parse_to_tree(file: IO[AnyStr]) -> Tree:
     """Parse a HCL2 file into a raw Lark parse tree.
 
-    :param file: File with HCL2 content.
+    :param file: Text or binary file with HCL2 content.
     """
-    return parses_to_tree(file.read())
+    return parses_to_tree(_read(file))
 
 
-def parses_to_tree(text: str) -> Tree:
+def parses_to_tree(text: Source) -> Tree:
     """Parse a HCL2 string into a raw Lark parse tree.
 
-    :param text: HCL2 text.
+    :param text: HCL2 text, or UTF-8 encoded HCL2 as a bytes-like object.
     """
-    # Append newline as workaround for https://github.com/lark-parser/lark/issues/237
-    # Lark doesn't support EOF token so our grammar can't look for "new line or end of file"
-    return _get_parser().parse(text + "\n")
+    text = _terminated(_as_text(text))
+    active = _active_profile()
+    if active is None:
+        return _get_parser().parse(text)
+    if not _is_parser_loaded():
+        # First parse in this process: report grammar loading separately
+        with active.stage("grammar"):
+            _get_parser()
+    with active.stage("parse") as timing:
+        tree = _get_parser().parse(text)
+    timing.nodes = _count_tree_nodes(tree)
+    return tree
+
+
+def _as_text(text: Source) -> str:
+    """Return *text* as a str, decoding bytes-like objects as UTF-8.
+
+    Decoding reads the buffer in place, so a memoryview or mmap is not
+    copied into an intermediate bytes object first.
+    """
+    if isinstance(text, str):
+        return text
+    return str(text, "utf-8")
+
+
+def _terminated(text: str) -> str:
+    """Return *text*, with a newline appended if it is blank without one.
+
+    An empty document (or one of spaces and tabs only) then keeps the newline
+    node it had when every source was parsed with a newline appended, so
+    ``reconstruct(parses(""))`` is ``"\\n"``.  Other sources are not copied.
+    """
+    if not text or (text.isspace() and "\n" not in text):
+        return text + "\n"
+    return text
+
+
+def _read(file: IO[AnyStr]) -> str:
+    """Read the rest of *file* as a str, decoding binary files as UTF-8.
+
+    A binary file backed by a regular file is memory-mapped and decoded from
+    the mapping, so the source is held in memory only once, as a str.
+    """
+    try:
+        binary = not isinstance(file.read(0), str)
+        fileno, position = file.fileno(), file.tell()
+        mapped = _mmap.mmap(fileno, 0, access=_mmap.ACCESS_READ) if binary else None
+    except (AttributeError, OSError, ValueError):
+        # No file descriptor (e.g. BytesIO), not mappable (e.g. a pipe), or empty
+        mapped = None
+    if mapped is None:
+        return _as_text(file.read())
+    with mapped, memoryview(mapped) as view, view[position:] as rest:
+        text = _as_text(rest)
+    # Leave the file at its end, as read() would
+    file.seek(0, _os.SEEK_END)
+    return text
 
 
 # ---------------------------------------------------------------------------
@@ -143,8 +296,8 @@ def parses_to_tree(text: str) -> Tree:
 def from_dict(
     data: dict,
     *,
-    deserializer_options: Optional[DeserializerOptions] = None,
-    formatter_options: Optional[FormatterOptions] = None,
+    deserializer_options: Optional["DeserializerOptions"] = None,
+    formatter_options: Optional["FormatterOptions"] = None,
     apply_format: bool = True,
 ) -> StartRule:
     """Convert a Python dict into a LarkElement tree.
@@ -154,6 +307,9 @@ def from_dict(
     :param formatter_options: Options controlling formatting behavior.
     :param apply_format: If True (default), apply formatting to the tree.
     """
+    from hcl2.deserializer import BaseDeserializer
+    from hcl2.formatter import BaseFormatter
+
     deserializer = BaseDeserializer(deserializer_options)
     tree = deserializer.load_python(data)
     if apply_format:
@@ -165,8 +321,8 @@ def from_dict(
 def from_json(
     text: str,
     *,
-    deserializer_options: Optional[DeserializerOptions] = None,
-    formatter_options: Optional[FormatterOptions] = None,
+    deserializer_options: Optional["DeserializerOptions"] = None,
+    formatter_options: Optional["FormatterOptions"] = None,
     apply_format: bool = True,
 ) -> StartRule:
     """Convert a JSON string into a LarkElement tree.
@@ -188,12 +344,16 @@ def from_json(
 def reconstruct(tree) -> str:
     """Convert a LarkElement tree (or raw Lark tree) to an HCL2 string.
 
+    LarkElement trees are written out directly, without converting them to
+    a Lark tree first.
+
     :param tree: A :class:`StartRule` (LarkElement tree) or :class:`lark.Tree`.
     """
-    reconstructor = HCLReconstructor()
-    if isinstance(tree, StartRule):
-        tree = tree.to_lark()
-    return reconstructor.reconstruct(tree)
+    from hcl2.reconstructor import ElementReconstructor, HCLReconstructor
+
+    if isinstance(tree, LarkRule):
+        return ElementReconstructor().reconstruct(tree)
+    return HCLReconstructor().reconstruct(tree)
 
 
 def transform(lark_tree: Tree, *, discard_comments: bool = False) -> StartRule:
@@ -202,33 +362,63 @@ def transform(lark_tree: Tree, *, discard_comments: bool = False) -> StartRule:
     :param lark_tree: Raw Lark tree from :func:`parse_to_tree` or :func:`parse_string_to_tree`.
     :param discard_comments: If True, discard comments during transformation.
     """
-    return RuleTransformer(discard_new_line_or_comments=discard_comments).transform(
-        lark_tree
-    )
+    transformer = RuleTransformer(discard_new_line_or_comments=discard_comments)
+    active = _active_profile()
+    if active is None:
+        return transformer.transform(lark_tree)
+    with active.stage("transform") as timing:
+        tree = transformer.transform(lark_tree)
+    timing.nodes = _count_element_nodes(tree)
+    return tree
 
 
-def query(source):
+def query(source, *, cache: Optional["ParseCache"] = None):
     """Parse HCL2 text or file into a DocumentView for querying.
 
     :param source: HCL2 text string or file-like object.
+    :param cache: Optional parse cache consulted before parsing.
     """
     from hcl2.query.body import DocumentView  # avoid circular with hcl2.query package
 
     if hasattr(source, "read"):
-        return DocumentView(parse(source))
-    return DocumentView(parses(source))
+        return DocumentView(parse(source, cache=cache))
+    return DocumentView(parses(source, cache=cache))
 
 
 def serialize(
-    tree: StartRule,
+    tree: Union[StartRule, Tree],
     *,
     serialization_options: Optional[SerializationOptions] = None,
 ) -> dict:
-    """Serialize a LarkElement tree to a Python dict.
+    """Serialize a LarkElement tree (or raw Lark tree) to a Python dict.
+
+    Raw Lark trees are serialized directly, without building a LarkElement
+    tree first, unless the options require one.
 
-    :param tree: A :class:`StartRule` (LarkElement tree).
+    :param tree: A :class:`StartRule` (LarkElement tree) or :class:`lark.Tree`.
     :param serialization_options: Options controlling serialization behavior.
     """
+    if isinstance(tree, Tree) and not TreeSerializer.supports(
+        serialization_options or SerializationOptions()
+    ):
+        tree = transform(tree)
+    active = _active_profile()
+    if active is None:
+        return _serialize(tree, serialization_options)
+    with active.stage("serialize") as timing:
+        result = _serialize(tree, serialization_options)
+    if isinstance(tree, Tree):
+        timing.nodes = _count_tree_nodes(tree)
+    else:
+        timing.nodes = _count_element_nodes(tree)
+    return result
+
+
+def _serialize(
+    tree: Union[StartRule, Tree], serialization_options: Optional[SerializationOptions]
+) -> dict:
+    if isinstance(tree, Tree):
+        return TreeSerializer(serialization_options).serialize(tree)
     if serialization_options is not None:
         return tree.serialize(options=serialization_options)
     return tree.serialize()
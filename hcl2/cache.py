@@ -0,0 +1,406 @@
+"""Content-addressed caches for parse results.
+
+Entries are keyed by a SHA-256 hash of the HCL2 text together with the hcl2
+version, the Lark version and a hash of the grammar, so upgrading the library
+or editing ``hcl2.lark`` never serves stale results. A cache hit skips Lark
+entirely.
+
+Two kinds of entries are stored:
+
+* the Python dict produced by :func:`hcl2.api.loads`, once per distinct
+  :class:`~hcl2.utils.SerializationOptions` combination (stored as JSON);
+* the :class:`~hcl2.rules.base.StartRule` tree produced by
+  :func:`hcl2.api.parses` (stored in the compact encoding of
+  :mod:`hcl2.tree_codec`).
+
+Entries are stored serialized and decoded on every hit, except that
+:class:`MemoryParseCache` keeps trees as prototypes and hands out clones, so
+each caller gets an independent tree that it may mutate (format, edit)
+without affecting the cached copy.
+
+Decoding a tree entry only instantiates element classes of this package, but
+entries are still only as trustworthy as the cache directory: never point a
+cache at a location writable by untrusted users.
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import lark
+
+from hcl2.rules.base import StartRule
+from hcl2.rules.expressions import ExprTermRule
+from hcl2.tree_codec import decode_tree, encode_tree
+from hcl2.utils import SerializationOptions
+
+# Bump when the layout of cache entries changes.
+CACHE_FORMAT_VERSION = 3
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_EXPRESSIONS = 4096
+
+_GRAMMAR_FILE = Path(__file__).absolute().resolve().parent / "hcl2.lark"
+_ENTRY_SUFFIX = ".entry"
+# Characters of the source encoded at a time when hashing it.
+_HASH_CHUNK = 1 << 20
+
+
+@lru_cache()
+def _environment_fingerprint() -> str:
+    """Identify the library, grammar and Lark versions that produced an entry."""
+    try:
+        from hcl2.version import version as hcl2_version
+    except ImportError:
+        hcl2_version = "unknown"
+    grammar_hash = hashlib.sha256(_GRAMMAR_FILE.read_bytes()).hexdigest()
+    return f"{CACHE_FORMAT_VERSION}:{hcl2_version}:{lark.__version__}:{grammar_hash}"
+
+
+def cache_key(kind: str, text: str, variant: str = "") -> str:
+    """Return the content-addressed key for *text*.
+
+    :param kind: Entry kind, e.g. ``"dict"`` or ``"tree"``.
+    :param text: HCL2 source text.
+    :param variant: Additional discriminator such as serialized options.
+    """
+    digest = hashlib.sha256()
+    for part in (_environment_fingerprint(), kind, variant):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    # In chunks, so a large source is never held twice, as str and as bytes
+    for start in range(0, len(text), _HASH_CHUNK):
+        chunk = text[start : start + _HASH_CHUNK]
+        digest.update(chunk.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ParseCache(ABC):
+    """Base class for parse caches; subclasses provide raw byte storage."""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def _read(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes for *key*, or None."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _write(self, key: str, data: bytes) -> None:
+        """Store *data* under *key*."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _discard(self, key: str) -> None:
+        """Remove the entry for *key* if present."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+        raise NotImplementedError()
+
+    def _record_hit(self) -> None:
+        """Count a hit in :attr:`stats`; thread-safe subclasses lock this."""
+        self.stats.hits += 1
+
+    def _record_miss(self) -> None:
+        """Count a miss in :attr:`stats`; thread-safe subclasses lock this."""
+        self.stats.misses += 1
+
+    def get_dict(self, text: str, options: SerializationOptions) -> Optional[dict]:
+        """Return the cached ``loads`` result for *text* and *options*, or None."""
+        key = cache_key("dict", text, _options_variant(options))
+        data = self._read(key)
+        if data is not None:
+            try:
+                result = json.loads(data)
+            except ValueError:
+                self._discard(key)
+            else:
+                self._record_hit()
+                return result
+        self._record_miss()
+        return None
+
+    def put_dict(self, text: str, options: SerializationOptions, data: dict) -> None:
+        """Store the ``loads`` result for *text* and *options*."""
+        key = cache_key("dict", text, _options_variant(options))
+        self._write(key, json.dumps(data).encode("utf-8"))
+
+    def get_tree(
+        self, text: str, discard_comments: bool = False
+    ) -> Optional[StartRule]:
+        """Return a cached ``parses`` result for *text*, or None."""
+        key = cache_key("tree", text, str(discard_comments))
+        data = self._read(key)
+        if data is not None:
+            try:
+                result = decode_tree(data)
+            except Exception:  # pylint: disable=broad-except
+                # Entry written by an incompatible build; drop it and reparse.
+                self._discard(key)
+            else:
+                self._record_hit()
+                return result
+        self._record_miss()
+        return None
+
+    def put_tree(
+        self, text: str, tree: StartRule, discard_comments: bool = False
+    ) -> None:
+        """Store the ``parses`` result for *text*."""
+        try:
+            data = encode_tree(tree)
+        except (ValueError, RecursionError):
+            # Pathologically deep trees, or trees holding values the encoding
+            # does not support, are not worth caching.
+            return
+        self._write(cache_key("tree", text, str(discard_comments)), data)
+
+
+class MemoryParseCache(ParseCache):
+    """In-process parse cache holding up to *max_entries* entries.
+
+    Trees are kept as prototypes, like :class:`ExpressionCache` entries: each
+    hit returns a fresh :meth:`~hcl2.rules.abstract.LarkRule.clone` instead of
+    decoding a stored copy, so callers may still mutate what they get. The
+    least recently used entry is evicted when full. Safe to share between
+    threads.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        super().__init__()
+        self.max_entries = max_entries
+        # Encoded dicts and prototype trees, by key
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_tree(
+        self, text: str, discard_comments: bool = False
+    ) -> Optional[StartRule]:
+        """Return a copy of the cached ``parses`` result for *text*, or None."""
+        prototype = self._read(cache_key("tree", text, str(discard_comments)))
+        if prototype is None:
+            self._record_miss()
+            return None
+        self._record_hit()
+        return prototype.clone()
+
+    def put_tree(
+        self, text: str, tree: StartRule, discard_comments: bool = False
+    ) -> None:
+        """Store a copy of the ``parses`` result for *text*."""
+        self._write(cache_key("tree", text, str(discard_comments)), tree.clone())
+
+    def _read(self, key: str) -> Any:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def _write(self, key: str, data: Any) -> None:
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _record_hit(self) -> None:
+        with self._lock:
+            self.stats.hits += 1
+
+    def _record_miss(self) -> None:
+        with self._lock:
+            self.stats.misses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ExpressionCache:
+    """In-process cache of parsed expressions, keyed by their source text.
+
+    Used by :class:`~hcl2.deserializer.BaseDeserializer` to parse each
+    distinct ``${...}`` expression once. Entries are prototypes that are
+    never handed out: each hit returns a fresh :meth:`~hcl2.rules.abstract.LarkRule.clone`,
+    so callers may mutate (format, edit) it freely. The least recently used
+    entry is evicted when more than *max_entries* are held. Safe to share
+    between threads.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_EXPRESSIONS):
+        self.stats = CacheStats()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ExprTermRule]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> Optional[ExprTermRule]:
+        """Return a copy of the cached expression parsed from *text*, or None."""
+        with self._lock:
+            prototype = self._entries.get(text)
+            if prototype is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.stats.hits += 1
+        return prototype.clone()
+
+    def put(self, text: str, expression: ExprTermRule) -> None:
+        """Store a copy of *expression*, parsed from *text*."""
+        prototype = expression.clone()
+        with self._lock:
+            self._entries[text] = prototype
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __reduce__(self):
+        # Entries are process-local: an unpickled cache, e.g. in a worker
+        # process converting files in parallel, starts out empty.
+        return ExpressionCache, (self.max_entries,)
+
+
+class DiskParseCache(ParseCache):
+    """Parse cache storing one file per entry in a directory.
+
+    Total size is capped at *max_size* bytes; when exceeded, the least recently
+    used entries (by modification time, refreshed on every hit) are evicted.
+    The directory may be shared between processes. Failures to read or write
+    the cache are ignored, so a read-only cache directory only costs a miss.
+    """
+
+    def __init__(
+        self, directory: Union[str, os.PathLike], max_size: int = DEFAULT_MAX_SIZE
+    ):
+        super().__init__()
+        self.directory = Path(directory)
+        self.max_size = max_size
+        # Running estimate of the directory size, computed on first write.
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write(self, key: str, data: bytes) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(handle, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self._evict()
+
+    def _discard(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _entries(self):
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(_ENTRY_SUFFIX):
+                        try:
+                            yield entry.path, entry.stat()
+                        except OSError:
+                            continue
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under the size cap."""
+        entries = sorted(self._entries(), key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= stat.st_size
+            self.stats.evictions += 1
+        self._size = total
+
+    def size(self) -> int:
+        """Return the total size in bytes of all entries on disk."""
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def clear(self) -> None:
+        for path, _ in self._entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._size = 0
+
+
+def _options_variant(options: SerializationOptions) -> str:
+    return json.dumps(dataclasses.asdict(options), sort_keys=True)
@@ -3,13 +3,13 @@
 import json
 import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from functools import cached_property
-from typing import Any, TextIO, List, Optional, Union
+from dataclasses import dataclass, field
+from typing import Any, Iterator, TextIO, List, Optional, Union
 
 from regex import regex
 
-from hcl2.parser import parser as _get_parser
+from hcl2.cache import ExpressionCache
+from hcl2.parser import expression_parser as _get_expression_parser
 from hcl2.const import IS_BLOCK, COMMENTS_KEY, INLINE_COMMENTS_KEY
 from hcl2.rules.abstract import LarkElement, LarkRule
 from hcl2.rules.base import (
@@ -60,7 +60,6 @@ from hcl2.rules.tokens import (
     FALSE,
     NULL,
 )
-from hcl2.transformer import RuleTransformer
 from hcl2.utils import HEREDOC_TRIM_PATTERN, HEREDOC_PATTERN
 
 
@@ -78,6 +77,12 @@ class DeserializerOptions:
     object_elements_colon: bool = False
     # Append a trailing comma after each object element.
     object_elements_trailing_comma: bool = True
+    # Cache of parsed ${...} expressions, so repeated expressions are parsed
+    # once; its ``stats`` report the hit rate. Share one cache between calls
+    # to reuse it across documents, or set to None to parse every occurrence.
+    expression_cache: Optional[ExpressionCache] = field(
+        default_factory=ExpressionCache, compare=False
+    )
     # with_comments: bool = False # TODO
 
 
@@ -100,19 +105,21 @@ class LarkElementTreeDeserializer(ABC):
 class BaseDeserializer(LarkElementTreeDeserializer):
     """Default deserializer: Python dict/JSON → LarkElement tree."""
 
-    @cached_property
-    def _transformer(self) -> RuleTransformer:
-        return RuleTransformer()
-
     def load_python(self, value: Any) -> StartRule:
         """Deserialize a Python object into a StartRule tree."""
+        return StartRule([BodyRule(list(self.iter_python(value)))])
+
+    def iter_python(self, value: Any) -> Iterator[LarkElement]:
+        """Deserialize the top-level attributes and blocks of a Python dict lazily.
+
+        Each element is deserialized only when the iterator reaches it.
+        """
         if not isinstance(value, dict):
             raise TypeError(
                 f"Expected dict for top-level HCL body, got {type(value).__name__}"
             )
         # Top-level dict is always a body (attributes + blocks), not an object
-        children = self._deserialize_block_elements(value)
-        return StartRule([BodyRule(children)])
+        return self._iter_block_elements(value)
 
     def loads(self, value: str) -> LarkElement:
         """Deserialize a JSON string into a LarkElement tree."""
@@ -138,19 +145,19 @@ class BaseDeserializer(LarkElementTreeDeserializer):
         return self._deserialize_text(value)
 
     def _deserialize_block_elements(self, value: dict) -> List[LarkElement]:
-        children: List[LarkElement] = []
+        return list(self._iter_block_elements(value))
+
+    def _iter_block_elements(self, value: dict) -> Iterator[LarkElement]:
         for key, val in value.items():
             if self._is_block(val):
                 # this value is a list of blocks, iterate over each block and deserialize them
                 for block in val:
-                    children.append(self._deserialize_block(key, block))
+                    yield self._deserialize_block(key, block)
 
             else:
                 # otherwise it's just an attribute
                 if not self._is_reserved_key(key):
-                    children.append(self._deserialize_attribute(key, val))
-
-        return children
+                    yield self._deserialize_attribute(key, val)
 
     # pylint: disable=R0911
     def _deserialize_text(self, value: Any) -> LarkRule:
@@ -232,11 +239,7 @@ class BaseDeserializer(LarkElementTreeDeserializer):
         # Ensure the value is quoted
         if not (value.startswith('"') and value.endswith('"')):
             value = f'"{value}"'
-        snippet = f"temp = {value}"
-        parsed_tree = _get_parser().parse(snippet)
-        rules_tree = self._transformer.transform(parsed_tree)
-        # Extract the string from: start -> body -> attribute -> expression -> string
-        expr = rules_tree.body.children[0].expression
+        expr = self._parse_expression(value)
         # The expression is an ExprTermRule wrapping a StringRule
         for child in expr.children:
             if isinstance(child, StringRule):
@@ -283,17 +286,21 @@ class BaseDeserializer(LarkElementTreeDeserializer):
         #   turn it into HCL2 code and parse it with lark:
 
         # unwrap from ${ and }
-        value = value[2:-1]
-        # create HCL2 snippet
-        value = f"temp = {value}"
-        # parse the above
-        parsed_tree = _get_parser().parse(value)
-        # transform parsed tree into LarkElement tree
-        rules_tree = self._transformer.transform(parsed_tree)
-        # extract expression from the tree
-        result = rules_tree.body.children[0].expression
-
-        return result
+        return self._parse_expression(value[2:-1])
+
+    def _parse_expression(self, value: str) -> ExprTermRule:
+        """Parse *value* as an expression, e.g. the value of an attribute."""
+        cache = self.options.expression_cache
+        if cache is not None:
+            cached = cache.get(value)
+            if cached is not None:
+                return cached
+        expression: ExprTermRule = _get_expression_parser().parse(  # type: ignore[assignment]
+            value
+        )
+        if cache is not None:
+            cache.put(value, expression)
+        return expression
 
     def _deserialize_block(self, first_label: str, value: dict) -> BlockRule:
         """Deserialize a block by extracting labels and body"""
@@ -87,6 +87,7 @@ class BaseFormatter(LarkElementTreeFormatter):
             rule.children.insert(-1, self._build_newline(indent_level - 1))
         elif self.options.open_empty_blocks:
             rule.children.insert(-1, self._build_newline(indent_level - 1, 2))
+        rule.mark_dirty()
 
     def format_body_rule(self, rule: BodyRule, indent_level: int = 0):
         """Format a body rule, adding newlines between attributes and blocks."""
@@ -123,6 +124,7 @@ class BaseFormatter(LarkElementTreeFormatter):
         if len(rule.elements) == 0:
             if self.options.open_empty_tuples:
                 rule.children.insert(1, self._build_newline(indent_level - 1, 2))
+                rule.mark_dirty()
             return
 
         new_children = []
@@ -146,6 +148,7 @@ class BaseFormatter(LarkElementTreeFormatter):
         if len(rule.elements) == 0:
             if self.options.open_empty_objects:
                 rule.children.insert(1, self._build_newline(indent_level - 1, 2))
+                rule.mark_dirty()
             return
 
         new_children = []
@@ -220,6 +223,7 @@ class BaseFormatter(LarkElementTreeFormatter):
             expression.children[5] = None
 
         expression.children[7] = self._build_newline(indent_level)
+        expression.mark_dirty()
         self._deindent_last_line()
 
     def format_forobjectexpr(
@@ -248,6 +252,7 @@ class BaseFormatter(LarkElementTreeFormatter):
             expression.children[10] = None
 
         expression.children[12] = self._build_newline(indent_level)
+        expression.mark_dirty()
         self._deindent_last_line()
 
     @staticmethod
@@ -258,6 +263,7 @@ class BaseFormatter(LarkElementTreeFormatter):
             if child is not None:
                 child.set_index(i)
                 child.set_parent(rule)
+        rule.mark_dirty()
 
     def _vertically_align_attributes_in_body(self, body: BodyRule):
         attributes_sequence: List[AttributeRule] = []
@@ -0,0 +1,242 @@
+"""Incremental reparsing of edited HCL2 documents.
+
+Editors re-query a document after every keystroke. Instead of parsing the
+whole file again, :func:`reparse` reparses only the top-level attribute or
+block enclosing an edit and splices it into the previous tree::
+
+    tree = hcl2.parses(text)
+    edit = TextEdit(offset=120, length=1, replacement="2")
+    tree = reparse(tree, text, edit)
+    text = edit.apply(text)
+
+Edits that do not fall within a single top-level attribute or block, or whose
+result does not parse as exactly one, fall back to a full parse.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Type
+
+from hcl2 import api
+from hcl2.parser import inline_parser
+from hcl2.rules.abstract import LarkElement, LarkRule, NodeMeta
+from hcl2.rules.base import AttributeRule, BlockRule, StartRule
+from hcl2.rules.whitespace import NewLineOrCommentRule
+
+# Whether each child type seen while shifting positions is a LarkRule.
+_IS_RULE: Dict[Type, bool] = {}
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    """Replacement of a range of characters in a document."""
+
+    # Offset of the first replaced character, in characters from the start.
+    offset: int
+    # Number of characters replaced; 0 for a pure insertion.
+    length: int
+    # Text inserted in place of the replaced range.
+    replacement: str = ""
+
+    @property
+    def end(self) -> int:
+        """Return the offset just past the replaced range in the previous text."""
+        return self.offset + self.length
+
+    def apply(self, text: str) -> str:
+        """Return *text* with this edit applied."""
+        return text[: self.offset] + self.replacement + text[self.end :]
+
+
+def reparse(
+    tree: StartRule,
+    text: str,
+    edit: TextEdit,
+    *,
+    discard_comments: bool = False,
+) -> StartRule:
+    """Return the tree of ``edit.apply(text)``, given the tree of *text*.
+
+    When the edit lies within one top-level attribute or block, only that
+    element is reparsed: it is replaced in *tree*, the positions of everything
+    after it are shifted, and *tree* itself is returned. Otherwise the new text
+    is parsed from scratch and a new tree is returned.
+
+    :param tree: Tree of *text*, as returned by :func:`hcl2.parses`. May be
+        modified in place.
+    :param text: Text *tree* was parsed from, before the edit.
+    :param edit: The edit to apply.
+    :param discard_comments: Must match the value *tree* was parsed with.
+    :raises ValueError: If the edit range lies outside *text*.
+    """
+    if edit.offset < 0 or edit.length < 0 or edit.end > len(text):
+        raise ValueError(f"Edit {edit} is out of range for text of length {len(text)}")
+
+    body = tree.body
+    index = _enclosing_child(body.children, edit)
+    if index is not None:
+        old = body.children[index]
+        element = _parse_element(old, text, edit, discard_comments)
+        if element is not None:
+            _splice(tree, index, element, text, edit)
+            return tree
+    return api.parses(edit.apply(text), discard_comments=discard_comments)
+
+
+def _enclosing_child(
+    children: Iterable[Optional[LarkElement]], edit: TextEdit
+) -> Optional[int]:
+    """Return the index of the attribute or block whose source range holds *edit*."""
+    for index, child in enumerate(children):
+        if not isinstance(child, (AttributeRule, BlockRule)) or child._meta.empty:
+            continue
+        meta = child._meta
+        if meta.start_pos <= edit.offset and edit.end <= meta.end_pos:  # type: ignore[operator]
+            return index
+        if meta.start_pos > edit.offset:  # type: ignore[operator]
+            break
+    return None
+
+
+def _parse_element(
+    old: LarkRule, text: str, edit: TextEdit, discard_comments: bool
+) -> Optional[LarkRule]:
+    """Parse the edited source of *old* alone; None if it is not one element."""
+    meta = old._meta
+    start, end = meta.start_pos, meta.end_pos
+    region = (
+        text[start : edit.offset]  # type: ignore[misc]
+        + edit.replacement
+        + text[edit.end : end]  # type: ignore[misc]
+    )
+    try:
+        # Followed by a newline as in the document, so that an expression
+        # absorbing the newline after it is detected below
+        parsed: StartRule = inline_parser(discard_comments).parse(region + "\n")  # type: ignore[assignment]
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    children = [child for child in parsed.body.children if child is not None]
+    if not children or not isinstance(children[0], (AttributeRule, BlockRule)):
+        return None
+    element = children[0]
+    # The element must span the whole region, with at most the added newline
+    # after it: anything else (a second element, a comment) changes the body.
+    if element._meta.start_pos != 0 or element._meta.end_pos != len(region):
+        return None
+    if any(not isinstance(child, NewLineOrCommentRule) for child in children[1:]):
+        return None
+    if len(children) > 2 or (len(children) == 2 and children[1].to_list()):
+        return None
+    return element
+
+
+def _splice(
+    tree: StartRule,
+    index: int,
+    element: LarkRule,
+    text: str,
+    edit: TextEdit,
+) -> None:
+    """Replace body child *index* with the reparsed *element*; fix up positions."""
+    body = tree.body
+    old_meta = body.children[index]._meta
+    _shift_region(element, old_meta)
+
+    new_meta = element._meta
+    shift = _Shift(
+        pos=len(edit.replacement) - edit.length,
+        lines=edit.replacement.count("\n") - text.count("\n", edit.offset, edit.end),
+        line=old_meta.end_line,  # type: ignore[arg-type]
+        columns=new_meta.end_column - old_meta.end_column,  # type: ignore[operator]
+    )
+
+    body.children[index] = element
+    element.set_index(index)
+    element.set_parent(body)
+    body.mark_dirty()
+
+    if shift.pos or shift.lines or shift.columns:
+        for sibling in body.children[index + 1 :]:
+            if isinstance(sibling, LarkRule):
+                _shift_following(sibling, shift)
+    shift.apply_end(body._meta)
+    if tree._meta is not body._meta:
+        shift.apply_end(tree._meta)
+
+
+class _Shift:
+    """Position change of text following an edit."""
+
+    __slots__ = ("pos", "lines", "line", "columns")
+
+    def __init__(self, pos: int, lines: int, line: int, columns: int):
+        # Change in character offset.
+        self.pos = pos
+        # Change in line number.
+        self.lines = lines
+        # Last line of the edited element, before the edit; columns only
+        # change for text on this line.
+        self.line = line
+        # Change in column of text on that line.
+        self.columns = columns
+
+    def apply_end(self, meta: NodeMeta) -> None:
+        """Shift the end position of *meta*."""
+        if meta.empty:
+            return
+        meta.end_pos += self.pos  # type: ignore[operator]
+        if meta.end_line == self.line:
+            meta.end_column += self.columns  # type: ignore[operator]
+        meta.end_line += self.lines  # type: ignore[operator]
+
+
+def _metas(node: LarkRule) -> List[NodeMeta]:
+    """Return each distinct non-empty position of *node* and its descendant rules.
+
+    The transformer gives some rules the same NodeMeta instance as their
+    parent; it must only be shifted once.
+    """
+    metas: Dict[int, NodeMeta] = {}
+    stack = [node]
+    while stack:
+        rule = stack.pop()
+        meta = rule._meta
+        if meta.line is not None:
+            metas[id(meta)] = meta
+        for child in rule._children:
+            # A dict lookup is much cheaper than isinstance() against the ABC
+            is_rule = _IS_RULE.get(type(child))
+            if is_rule is None:
+                is_rule = _IS_RULE[type(child)] = isinstance(child, LarkRule)
+            if is_rule:
+                stack.append(child)
+    return list(metas.values())
+
+
+def _shift_following(node: LarkRule, shift: _Shift) -> None:
+    """Shift the positions of *node* and all its descendant rules."""
+    pos, lines, line, columns = shift.pos, shift.lines, shift.line, shift.columns
+    for meta in _metas(node):
+        meta.start_pos += pos  # type: ignore[operator]
+        meta.end_pos += pos  # type: ignore[operator]
+        if meta.line == line:
+            meta.column += columns  # type: ignore[operator]
+        if meta.end_line == line:
+            meta.end_column += columns  # type: ignore[operator]
+        meta.line += lines  # type: ignore[operator]
+        meta.end_line += lines  # type: ignore[operator]
+
+
+def _shift_region(element: LarkRule, origin: NodeMeta) -> None:
+    """Move positions of *element*, parsed on its own, to where *origin* starts."""
+    line_offset = origin.line - 1  # type: ignore[operator]
+    column_offset = origin.column - 1  # type: ignore[operator]
+    for meta in _metas(element):
+        # Only text on the first line is preceded by the rest of that line
+        if meta.line == 1:
+            meta.column += column_offset  # type: ignore[operator]
+        if meta.end_line == 1:
+            meta.end_column += column_offset  # type: ignore[operator]
+        meta.line += line_offset  # type: ignore[operator]
+        meta.end_line += line_offset  # type: ignore[operator]
+        meta.start_pos += origin.start_pos  # type: ignore[operator]
+        meta.end_pos += origin.start_pos  # type: ignore[operator]
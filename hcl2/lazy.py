@@ -0,0 +1,335 @@
+"""Lazy parsing: index top-level blocks first, parse their bodies on demand.
+
+Most queries only look into a few of the top-level blocks of a document, yet a
+full parse builds the rule tree of every block. :func:`parses_lazy` instead
+scans the text for the boundaries of top-level blocks, tracking brace depth,
+strings, comments and heredocs, and fully parses only the text between them
+(attributes and comments). Each block becomes a :class:`LazyBlockRule`, which
+parses its labels when they are first read and its body when its children or
+body are first read::
+
+    tree = parses_lazy(text)
+    doc = DocumentView(tree)          # or DocumentView.parse(text, lazy=True)
+    doc.blocks("resource", "aws_instance")[0].body   # parses one block body
+
+Once parsed, a block is indistinguishable from one produced by
+:func:`hcl2.parses`, positions included. Syntax errors inside a block body are
+raised when that block is first accessed rather than by :func:`parses_lazy`.
+"""
+import re
+from bisect import bisect_left
+from typing import List, Optional, Sequence, Tuple
+
+from lark.exceptions import UnexpectedInput
+
+from hcl2 import api
+from hcl2.incremental import _shift_region
+from hcl2.parser import inline_parser
+from hcl2.rules.abstract import LarkElement, LarkRule, NodeMeta
+from hcl2.rules.base import BlockRule, BodyRule, StartRule
+from hcl2.rules.literal_rules import IdentifierRule
+from hcl2.rules.strings import StringPartRule, StringRule
+from hcl2.rules.tokens import DBLQUOTE, NAME, STRING_CHARS
+
+# Tokens that matter for finding block boundaries outside of strings.
+_CODE_TOKENS = re.compile(
+    r"(?P<comment>#[^\n]*|//[^\n]*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/)"
+    # Same patterns as the NL_OR_COMMENT and HEREDOC_TEMPLATE(_TRIM) terminals
+    r"|(?P<heredoc><<-?(?P<marker>[a-zA-Z][a-zA-Z0-9._-]+)\n(?:[^\n]*\n)+?\s*(?P=marker)(?:\n|\Z))"
+    r'|(?P<quote>")'
+    r"|(?P<open>[{\[(])"
+    r"|(?P<close>[}\])])"
+    r"|(?P<newline>\n)"
+)
+
+# Tokens that matter inside a quoted string: escapes, template starts, the end.
+_STRING_TOKENS = re.compile(r'\\.|\$\$\{|%%\{|(?P<template>[$%]\{)|(?P<quote>")')
+
+# A block header on its own line: a type and identifier or plain string labels.
+_BLOCK_HEADER = re.compile(
+    r"[ \t]*[a-zA-Z_][a-zA-Z0-9_-]*"
+    r'(?:[ \t]+(?:[a-zA-Z_][a-zA-Z0-9_-]*|"(?:[^"\\\n$%]|\\.)*"))*[ \t]*'
+)
+
+# One name or plain quoted string label of a block header.
+_LABEL = re.compile(
+    r"[ \t]*(?:(?P<name>[a-zA-Z_][a-zA-Z0-9_-]*)"
+    r'|(?P<quoted>"(?P<string>[^"\\\n$%]+)"))'
+)
+
+# Names the lexer turns into keyword tokens rather than NAME.
+_KEYWORDS = frozenset(
+    ("if", "in", "for", "for_each", "else", "endif", "endfor", "null", "true", "false")
+)
+
+
+class LazyBlockRule(BlockRule):
+    """A top-level block whose labels and body are parsed on first access.
+
+    The ``_labels``, ``_children`` and ``_body`` slots start out empty;
+    reading one parses the block source and fills them in, after which the
+    rule behaves exactly like a :class:`~hcl2.rules.base.BlockRule`.
+    """
+
+    __slots__ = ("_source", "_header_length", "_discard_comments")
+
+    def __init__(  # pylint: disable=super-init-not-called,non-parent-init-called
+        self,
+        source: str,
+        header_length: int,
+        meta: NodeMeta,
+        discard_comments: bool = False,
+    ):
+        # The BlockRule and LarkRule initializers need the children
+        LarkElement.__init__(self)
+        self._meta = meta
+        self._serialized = None
+        # Block text from the first label to the closing brace.
+        self._source = source
+        # Length of the text before the opening brace.
+        self._header_length = header_length
+        self._discard_comments = discard_comments
+
+    def __getattr__(self, name):
+        # Only called for attributes not found otherwise: unfilled slots.
+        if name == "_labels":
+            self._parse_labels()
+        elif name in ("_children", "_body"):
+            self._parse_block()
+        else:
+            raise AttributeError(name)
+        return object.__getattribute__(self, name)
+
+    @property
+    def is_parsed(self) -> bool:
+        """Return True once the block body has been parsed."""
+        try:
+            object.__getattribute__(self, "_children")
+        except AttributeError:
+            return False
+        return True
+
+    def _parse(self, source: str) -> BlockRule:
+        try:
+            tree = inline_parser(self._discard_comments).parse(source)
+        except UnexpectedInput as exc:
+            _relocate_error(exc, self._meta)
+            raise
+        block = tree.body.children[0]  # type: ignore[attr-defined]
+        _shift_region(block, self._meta)
+        return block
+
+    def _parse_labels(self) -> None:
+        header = self._source[: self._header_length]
+        labels = _plain_labels(header, self._meta)
+        if labels is None:
+            labels = self._parse(header + "{}")._labels
+        self._labels = labels
+        self._adopt(labels)
+
+    def _parse_block(self) -> None:
+        block = self._parse(self._source)
+        self._children = block._children
+        self._labels = block._labels
+        self._body = block._body
+        self._adopt(block._children)
+
+    def _adopt(self, children: Sequence[Optional[LarkElement]]) -> None:
+        # Labels come first in the block children, so indices match for both
+        for index, child in enumerate(children):
+            if child is not None:
+                child.set_index(index)
+                child.set_parent(self)
+
+
+def _plain_labels(header: str, origin: NodeMeta) -> Optional[List[LarkRule]]:
+    """Build the label rules of a block header without running the parser.
+
+    Handles headers made of names and plain quoted strings on one line, as
+    the transformer would build them; returns None for anything else.
+    """
+    labels: List[LarkRule] = []
+    end = len(header.rstrip(" \t"))
+    pos = 0
+    while pos < end:
+        match = _LABEL.match(header, pos)
+        if match is None:
+            return None
+        name, string = match.group("name", "string")
+        if name is not None:
+            if name in _KEYWORDS:
+                return None
+            meta = _meta_on_line(origin, match.start("name"), match.end())
+            labels.append(IdentifierRule([NAME(name)], meta))
+        else:
+            meta = _meta_on_line(origin, match.start("quoted"), match.end())
+            part_meta = _meta_on_line(origin, match.start("string"), match.end() - 1)
+            part = StringPartRule([STRING_CHARS(string)], part_meta)
+            labels.append(StringRule([DBLQUOTE(), part, DBLQUOTE()], meta))
+        pos = match.end()
+    return labels
+
+
+def _meta_on_line(origin: NodeMeta, start: int, end: int) -> NodeMeta:
+    """Return the position of *start*..*end*, offsets on the first line of *origin*."""
+    line, column, pos = origin.line, origin.column, origin.start_pos
+    return NodeMeta(
+        line,
+        column + start,  # type: ignore[operator]
+        pos + start,  # type: ignore[operator]
+        line,
+        column + end,  # type: ignore[operator]
+        pos + end,  # type: ignore[operator]
+    )
+
+
+def _relocate_error(exc: UnexpectedInput, origin: NodeMeta) -> None:
+    """Make the position of a parse error in a block relative to the document."""
+    if getattr(exc, "line", None) == 1:
+        exc.column += origin.column - 1  # type: ignore[operator]
+    if isinstance(getattr(exc, "line", None), int):
+        exc.line += origin.line - 1  # type: ignore[operator]
+    if isinstance(getattr(exc, "pos_in_stream", None), int):
+        exc.pos_in_stream += origin.start_pos  # type: ignore[operator,assignment]
+
+
+def parses_lazy(text: str, *, discard_comments: bool = False) -> StartRule:
+    """Parse HCL2 text, deferring the parsing of top-level blocks.
+
+    Equivalent to :func:`hcl2.parses` once every block has been accessed.
+    Text whose block structure the scan cannot follow is parsed eagerly.
+
+    :param text: HCL2 text.
+    :param discard_comments: If True, discard comments during transformation.
+    """
+    blocks = _scan_blocks(text)
+    if not blocks:
+        return api.parses(text, discard_comments=discard_comments)
+
+    positions = _Positions(text)
+    children: List[LarkElement] = []
+    gap_start = 0
+    # End of the last token seen so far
+    last_end = 0
+    for start, header_length, end in blocks + [(len(text), 0, len(text))]:
+        if gap_start < start:
+            try:
+                gap_children, gap_end = _parse_gap(
+                    text, gap_start, start, positions, discard_comments
+                )
+            except UnexpectedInput:
+                # Let a full parse report the error at its real position
+                return api.parses(text, discard_comments=discard_comments)
+            children.extend(gap_children)
+            last_end = gap_end if gap_end is not None else last_end
+        if start < len(text):
+            meta = positions.meta(start, end)
+            children.append(
+                LazyBlockRule(text[start:end], header_length, meta, discard_comments)
+            )
+            last_end = end
+        gap_start = end
+
+    # The document spans from its first to its last token, whether or not
+    # comments and newlines were kept in the tree
+    start = len(text) - len(text.lstrip(" \t"))
+    body = BodyRule(children, positions.meta(start, last_end))
+    return StartRule([body], positions.meta(start, last_end))
+
+
+def _parse_gap(
+    source: str, start: int, end: int, positions: "_Positions", discard_comments: bool
+) -> Tuple[List[LarkElement], Optional[int]]:
+    """Parse the text between two blocks.
+
+    Returns its body children and the end offset of its last token, or None
+    if it holds only spaces.
+    """
+    tree: StartRule = inline_parser(discard_comments).parse(source[start:end])  # type: ignore[assignment]
+    children = [child for child in tree.body.children if child is not None]
+    origin = positions.meta(start, start)
+    for child in children:
+        _shift_region(child, origin)
+    gap_end = tree._meta.end_pos
+    return children, None if gap_end is None else start + gap_end
+
+
+def _scan_blocks(source: str) -> List[Tuple[int, int, int]]:
+    """Find top-level blocks as ``(start, header length, end)`` offsets.
+
+    Returns an empty list if the text is not balanced, leaving the syntax
+    error to a full parse.
+    """
+    blocks: List[Tuple[int, int, int]] = []
+    # One entry per open code context: the document, then each template
+    # interpolation or directive inside a string. Holds its bracket depth.
+    depths = [0]
+    in_string = False
+    statement_start = 0
+    block_start: Optional[int] = None
+    header_length = 0
+    pos = 0
+    while True:
+        if in_string:
+            match = _STRING_TOKENS.search(source, pos)
+            if match is None:
+                return []
+            if match.group("template"):
+                depths.append(0)
+                in_string = False
+            elif match.group("quote"):
+                in_string = False
+            pos = match.end()
+            continue
+
+        match = _CODE_TOKENS.search(source, pos)
+        if match is None:
+            break
+        pos = match.end()
+        kind = match.lastgroup
+        top_level = len(depths) == 1 and depths[0] == 0
+        if kind == "quote":
+            in_string = True
+        elif kind == "open":
+            if top_level and match.group() == "{":
+                header = source[statement_start : match.start()]
+                if _BLOCK_HEADER.fullmatch(header):
+                    block_start = statement_start + len(header) - len(header.lstrip())
+                    header_length = match.start() - block_start
+            depths[-1] += 1
+        elif kind == "close":
+            if depths[-1] == 0:
+                if len(depths) == 1:
+                    return []
+                # End of a template interpolation or directive
+                depths.pop()
+                in_string = True
+                continue
+            depths[-1] -= 1
+            if len(depths) == 1 and depths[0] == 0 and block_start is not None:
+                blocks.append((block_start, header_length, pos))
+                block_start = None
+        elif top_level and kind in ("newline", "heredoc"):
+            statement_start = pos
+    if in_string or depths != [0]:
+        return []
+    return blocks
+
+
+class _Positions:
+    """Converts character offsets in a text to line and column numbers."""
+
+    def __init__(self, text: str):
+        self._newlines = [match.start() for match in re.finditer("\n", text)]
+
+    def line_column(self, pos: int) -> Tuple[int, int]:
+        """Return the 1-based line and column of offset *pos*."""
+        line = bisect_left(self._newlines, pos)
+        line_start = self._newlines[line - 1] + 1 if line else 0
+        return line + 1, pos - line_start + 1
+
+    def meta(self, start: int, end: int) -> NodeMeta:
+        """Return the position of the text between offsets *start* and *end*."""
+        line, column = self.line_column(start)
+        end_line, end_column = self.line_column(end)
+        return NodeMeta(line, column, start, end_line, end_column, end)
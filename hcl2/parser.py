@@ -1,23 +1,178 @@
-"""A parser for HCL2 implemented using the Lark parser"""
+"""A parser for HCL2 implemented using the Lark parser
+
+Building the LALR tables from ``hcl2.lark`` takes seconds. Installed packages
+ship them precomputed in the generated ``hcl2.lark_parser`` module (see
+:func:`write_tables_module`), which is used whenever it was generated from the
+same grammar with the installed Lark version. Otherwise the grammar is loaded
+through Lark's own cache file next to the package.
+
+Tables are built for each of :data:`START_SYMBOLS` separately: Lark requires
+every ``parse()`` call to name its start symbol once a parser has several, so
+whole files and single expressions are parsed by different Lark instances.
+
+This module only imports Lark and the standard library at load time, so the
+build can load it on its own to generate the tables.
+"""
 import functools
+import hashlib
+import importlib
+import pickle
+import zlib
 from pathlib import Path
+from typing import Any, Dict, Optional
 
+import lark
 from lark import Lark
+from lark.grammar import Rule
+from lark.lexer import TerminalDef
 
-from hcl2.postlexer import PostLexer
+GRAMMAR_FILE = Path(__file__).absolute().resolve().parent / "hcl2.lark"
+PARSER_FILE = Path(__file__).absolute().resolve().parent / ".lark_cache.bin"
 
+# Module holding the precomputed tables; None to always load the grammar.
+TABLES_MODULE: Optional[str] = "hcl2.lark_parser"
 
-PARSER_FILE = Path(__file__).absolute().resolve().parent / ".lark_cache.bin"
+# Grammar rules parsers are built for: a whole file, or a single expression.
+START_SYMBOLS = ("start", "expression_start")
+
+_TABLES_HEADER = '''\
+"""Precomputed LALR tables for hcl2.lark.
+
+Generated by hcl2.parser.write_tables_module() -- do not edit.
+"""
+'''
 
 
 @functools.lru_cache()
 def parser() -> Lark:
     """Build standard parser for transforming HCL2 text into python structures"""
+    from hcl2.postlexer import PostLexer
+
+    return _load(postlex=PostLexer())
+
+
+@functools.lru_cache()
+def inline_parser(discard_comments: bool = False) -> Lark:
+    """Build a parser that transforms HCL2 text directly into a LarkElement tree.
+
+    The :class:`~hcl2.transformer.RuleTransformer` runs during parsing, so no
+    intermediate ``lark.Tree`` is built.
+    """
+    from hcl2.postlexer import PostLexer
+    from hcl2.transformer import InlineRuleTransformer, RuleTransformer
+
+    return _load(
+        postlex=PostLexer(),
+        transformer=InlineRuleTransformer(
+            RuleTransformer(discard_new_line_or_comments=discard_comments)
+        ),
+    )
+
+
+@functools.lru_cache()
+def expression_parser(discard_comments: bool = False) -> Lark:
+    """Build a parser that transforms a single HCL2 expression into a LarkElement tree.
+
+    Parses from the ``expression_start`` rule, so the text is not wrapped in
+    an attribute and the result is the expression itself, e.g. a
+    :class:`~hcl2.rules.expressions.ExprTermRule` or a
+    :class:`~hcl2.rules.expressions.ConditionalRule`. Newlines and comments
+    before or after the expression are dropped.
+    """
+    from hcl2.postlexer import PostLexer
+    from hcl2.transformer import InlineRuleTransformer, RuleTransformer
+
+    return _load(
+        start="expression_start",
+        postlex=PostLexer(),
+        transformer=InlineRuleTransformer(
+            RuleTransformer(discard_new_line_or_comments=discard_comments)
+        ),
+    )
+
+
+def is_parser_loaded() -> bool:
+    """Return True if :func:`parser` has already built the parser in this process."""
+    # pylint: disable-next=too-many-function-args  # false positive on lru_cache()
+    return parser.cache_info().currsize > 0
+
+
+def _load(start: str = "start", **options) -> Lark:
+    """Load the HCL2 LALR parser for *start* with *options* that do not affect its tables."""
+    tables = _precomputed_tables(TABLES_MODULE, start)
+    if tables is not None:
+        # pylint: disable-next=protected-access  # as done by Lark's standalone parsers
+        return Lark._load_from_dict(
+            tables["data"], tables["memo"], propagate_positions=True, **options
+        )
     return Lark.open(
-        "hcl2.lark",
+        str(GRAMMAR_FILE),
         parser="lalr",
-        cache=str(PARSER_FILE),  # Disable/Delete file to effect changes to the grammar
-        rel_to=__file__,
+        start=start,
+        # Disable/Delete file to effect changes to the grammar. The postlexer
+        # and transformer are not part of Lark's cache key, so parser() and
+        # inline_parser() share the file. The start symbol is, so each
+        # start symbol gets a file of its own.
+        cache=str(_cache_file(start)),
         propagate_positions=True,
-        postlex=PostLexer(),
+        **options,
     )
+
+
+def _cache_file(start: str) -> Path:
+    if start == "start":
+        return PARSER_FILE
+    return PARSER_FILE.with_name(f"{PARSER_FILE.stem}.{start}{PARSER_FILE.suffix}")
+
+
+@functools.lru_cache()
+def _precomputed_tables(
+    module_name: Optional[str], start: str = "start"
+) -> Optional[Dict[str, Any]]:
+    """Return the *start* tables of *module_name* if they match the grammar and Lark."""
+    if module_name is None:
+        return None
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        return None
+    if module.LARK_VERSION != lark.__version__ or module.GRAMMAR_SHA256 != (
+        _grammar_hash()
+    ):
+        return None
+    tables = module.TABLES
+    # Modules generated before tables were kept per start symbol hold a
+    # single bytes object
+    if not isinstance(tables, dict) or start not in tables:
+        return None
+    return pickle.loads(zlib.decompress(tables[start]))
+
+
+def _grammar_hash() -> str:
+    return hashlib.sha256(GRAMMAR_FILE.read_bytes()).hexdigest()
+
+
+def write_tables_module(path: Path) -> None:
+    """Generate the module of precomputed parser tables at *path*.
+
+    Run at build time; ``python -m hcl2.parser`` writes it into the source
+    tree for development.
+    """
+    tables = {}
+    for start in START_SYMBOLS:
+        lark_parser = Lark.open(
+            str(GRAMMAR_FILE), parser="lalr", start=start, propagate_positions=True
+        )
+        data, memo = lark_parser.memo_serialize([TerminalDef, Rule])
+        tables[start] = zlib.compress(
+            pickle.dumps({"data": data, "memo": memo}, protocol=4), 9
+        )
+    with open(path, "w", encoding="utf-8") as module:
+        module.write(_TABLES_HEADER)
+        module.write(f"LARK_VERSION = {lark.__version__!r}\n")
+        module.write(f"GRAMMAR_SHA256 = {_grammar_hash()!r}\n")
+        module.write(f"TABLES = {tables!r}\n")
+
+
+if __name__ == "__main__":
+    write_tables_module(GRAMMAR_FILE.parent / "lark_parser.py")
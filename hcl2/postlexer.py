@@ -9,6 +9,8 @@ from typing import FrozenSet, Iterator, Optional, Tuple
 
 from lark import Token
 
+from hcl2.profiling import active_profile
+
 # Type alias for a token stream consumed and produced by each pass.
 TokenStream = Iterator[Token]
 
@@ -39,8 +41,15 @@ class PostLexer:
     """Transform the token stream before it reaches the LALR parser."""
 
     def process(self, stream: TokenStream) -> TokenStream:
-        """Chain all postlexer passes over the token stream."""
-        yield from self._merge_newlines_into_operators(stream)
+        """Chain all postlexer passes over the token stream.
+
+        The last pass's generator is returned as is: re-yielding its tokens
+        from here would add a generator frame to every token.
+        """
+        profile = active_profile()
+        if profile is not None:
+            return profile.instrument_lexer(stream, self._merge_newlines_into_operators)
+        return self._merge_newlines_into_operators(stream)
 
     def _merge_newlines_into_operators(self, stream: TokenStream) -> TokenStream:
         """Merge NL_OR_COMMENT tokens into immediately following operator tokens.
@@ -0,0 +1,220 @@
+"""Opt-in stage-level profiling of the HCL2 parse pipeline.
+
+Wrap any ``hcl2.api`` calls in :func:`profile` to record how long each pipeline
+stage took and how much work it did::
+
+    with hcl2.profile() as prof:
+        data = hcl2.loads(text)
+    print(prof.format())
+
+Stages recorded:
+
+* ``grammar`` — loading the Lark grammar, on the first parse in a process only
+* ``lex`` — Lark lexer producing raw tokens
+* ``postlex`` — :class:`hcl2.postlexer.PostLexer` passes
+* ``parse`` — LALR parsing, excluding the lex/postlex time spent inside it
+* ``transform`` — :class:`hcl2.transformer.RuleTransformer`; not part of ``loads``
+* ``serialize`` — ``StartRule.serialize`` or :class:`hcl2.tree_serializer.TreeSerializer`
+
+When no profile is active the instrumentation reduces to a single context
+variable lookup per API call.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from lark import Token, Tree
+
+from hcl2.rules.abstract import LarkElement, LarkRule
+
+_ACTIVE_PROFILE: ContextVar[Optional["Profile"]] = ContextVar(
+    "hcl2_active_profile", default=None
+)
+
+
+@dataclass
+class StageTiming:
+    """Measurements for a single execution of one pipeline stage."""
+
+    name: str
+    # Wall time in seconds, excluding time attributed to nested stages.
+    wall_time: float = 0.0
+    # Number of tokens the stage produced, where applicable.
+    tokens: Optional[int] = None
+    # Number of tree nodes the stage produced or consumed, where applicable.
+    nodes: Optional[int] = None
+    # Peak bytes allocated while the stage ran (tracemalloc), when tracked.
+    allocated_bytes: Optional[int] = None
+
+
+@dataclass
+class Profile:
+    """Collects :class:`StageTiming` records for the API calls made while active."""
+
+    # Track allocations with tracemalloc. Adds noticeable overhead to wall times.
+    trace_memory: bool = True
+    stages: List[StageTiming] = field(default_factory=list)
+    # Accumulated wall time of nested stages, one entry per open stage.
+    _nested_time: List[float] = field(default_factory=list, repr=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageTiming]:
+        """Time the enclosed block as stage *name*.
+
+        The yielded :class:`StageTiming` may be updated with token/node counts
+        by the caller. Time recorded by stages nested inside the block is
+        subtracted from this stage's wall time.
+        """
+        import tracemalloc
+
+        timing = StageTiming(name)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        self._nested_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._nested_time.pop()
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                if not hasattr(tracemalloc, "reset_peak"):
+                    peak = current
+                timing.allocated_bytes = max(0, peak - start_memory)
+            timing.wall_time = elapsed - nested
+            self._add(timing, elapsed)
+
+    def record(self, timing: StageTiming) -> None:
+        """Record a stage that was timed outside :meth:`stage`."""
+        self._add(timing, timing.wall_time)
+
+    def _add(self, timing: StageTiming, elapsed: float) -> None:
+        self.stages.append(timing)
+        if self._nested_time:
+            self._nested_time[-1] += elapsed
+
+    def instrument_lexer(
+        self,
+        stream: Iterator[Token],
+        postlex: Callable[[Iterator[Token]], Iterator[Token]],
+    ) -> Iterator[Token]:
+        """Run *postlex* over *stream*, recording ``lex`` and ``postlex`` stages."""
+        lexed = _TimedIterator(stream)
+        processed = _TimedIterator(postlex(lexed))
+        try:
+            yield from processed
+        finally:
+            self.record(StageTiming("lex", lexed.elapsed, tokens=lexed.count))
+            self.record(
+                StageTiming(
+                    "postlex",
+                    processed.elapsed - lexed.elapsed,
+                    tokens=processed.count,
+                )
+            )
+
+    def totals(self) -> Dict[str, StageTiming]:
+        """Aggregate recorded stages by name, preserving first-seen order."""
+        totals: Dict[str, StageTiming] = {}
+        for timing in self.stages:
+            total = totals.setdefault(timing.name, StageTiming(timing.name))
+            total.wall_time += timing.wall_time
+            for attr in ("tokens", "nodes", "allocated_bytes"):
+                value = getattr(timing, attr)
+                if value is not None:
+                    setattr(total, attr, (getattr(total, attr) or 0) + value)
+        return totals
+
+    @property
+    def wall_time(self) -> float:
+        """Total wall time across all recorded stages, in seconds."""
+        return sum(timing.wall_time for timing in self.stages)
+
+    def format(self, label: Optional[str] = None) -> str:
+        """Render a human-readable per-stage breakdown."""
+        header = f"{label}: " if label else ""
+        lines = [f"{header}total {self.wall_time * 1000:.2f} ms"]
+        for timing in self.totals().values():
+            line = f"  {timing.name:<10} {timing.wall_time * 1000:>10.2f} ms"
+            if timing.tokens is not None:
+                line += f"  tokens={timing.tokens}"
+            if timing.nodes is not None:
+                line += f"  nodes={timing.nodes}"
+            if timing.allocated_bytes is not None:
+                line += f"  alloc={timing.allocated_bytes}B"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class _TimedIterator:
+    """Iterator wrapper accumulating time spent inside ``next()`` calls."""
+
+    def __init__(self, iterator: Iterator[Token]):
+        self._iterator = iterator
+        self.elapsed = 0.0
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Token:
+        start = time.perf_counter()
+        try:
+            item = next(self._iterator)
+        finally:
+            self.elapsed += time.perf_counter() - start
+        self.count += 1
+        return item
+
+
+@contextmanager
+def profile(trace_memory: bool = True) -> Iterator[Profile]:
+    """Profile every ``hcl2.api`` call made inside the ``with`` block.
+
+    :param trace_memory: If True, start :mod:`tracemalloc` (unless it is
+        already running) and record allocated bytes per stage.
+    """
+    import tracemalloc
+
+    active = Profile(trace_memory=trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _ACTIVE_PROFILE.set(active)
+    try:
+        yield active
+    finally:
+        _ACTIVE_PROFILE.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def active_profile() -> Optional[Profile]:
+    """Return the profile active in the current context, if any."""
+    return _ACTIVE_PROFILE.get()
+
+
+def count_tree_nodes(tree: Tree) -> int:
+    """Count rules and tokens in a raw Lark parse tree."""
+    total = 0
+    for subtree in tree.iter_subtrees():
+        total += 1 + sum(1 for child in subtree.children if not isinstance(child, Tree))
+    return total
+
+
+def count_element_nodes(element: LarkElement) -> int:
+    """Count rules and tokens in a LarkElement tree."""
+    total = 0
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        total += 1
+        if isinstance(node, LarkRule):
+            stack.extend(child for child in node.children if child is not None)
+    return total
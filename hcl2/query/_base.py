@@ -19,6 +19,15 @@ T = TypeVar("T", bound=LarkRule)
 _VIEW_REGISTRY: Dict[Type[LarkElement], Type["NodeView"]] = {}
 
 
+def copy_value(value: Any) -> Any:
+    """Copy the dicts and lists of a serialized value, sharing everything else."""
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
 def register_view(rule_type: Type[LarkElement]):
     """Class decorator: register a view class for a given rule type."""
 
@@ -84,13 +93,23 @@ class NodeView:
 
     def to_hcl(self) -> str:
         """Reconstruct this subtree as HCL text."""
-        from hcl2.reconstructor import HCLReconstructor
+        from hcl2.reconstructor import ElementReconstructor
 
-        reconstructor = HCLReconstructor()
-        return reconstructor.reconstruct_fragment(self._node)
+        return ElementReconstructor().reconstruct_fragment(self._node)
 
     def to_dict(self, options: Optional[SerializationOptions] = None) -> Any:
-        """Serialize this node to a Python value."""
+        """Serialize this node to a Python value.
+
+        Rules cache the result until they are modified (see
+        :meth:`~hcl2.rules.abstract.LarkRule.serialize_cached`); each call
+        returns a copy of it that the caller may modify.
+        """
+        return copy_value(self._shared_dict(options))
+
+    def _shared_dict(self, options: Optional[SerializationOptions] = None) -> Any:
+        """Serialize this node, sharing cached values: the result must not be modified."""
+        if isinstance(self._node, LarkRule):
+            return self._node.serialize_cached(options)
         if options is not None:
             return self._node.serialize(options=options)
         return self._node.serialize()
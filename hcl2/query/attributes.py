@@ -2,7 +2,7 @@
 
 from typing import Any, List, Optional
 
-from hcl2.query._base import NodeView, register_view, view_for
+from hcl2.query._base import NodeView, copy_value, register_view, view_for
 from hcl2.rules.abstract import LarkElement
 from hcl2.rules.base import AttributeRule
 from hcl2.utils import SerializationOptions
@@ -30,7 +30,7 @@ class AttributeView(NodeView):
     def value(self) -> Any:
         """Return the serialized Python value of the attribute expression."""
         node: AttributeRule = self._node  # type: ignore[assignment]
-        return node.expression.serialize()
+        return copy_value(node.expression.serialize_cached())
 
     @property
     def value_node(self) -> "NodeView":
@@ -38,14 +38,14 @@ class AttributeView(NodeView):
         node: AttributeRule = self._node  # type: ignore[assignment]
         return view_for(node.expression)
 
-    def to_dict(self, options: Optional[SerializationOptions] = None) -> Any:
+    def _shared_dict(self, options: Optional[SerializationOptions] = None) -> Any:
         """Serialize, merging adjacent comments from the parent body."""
-        result = super().to_dict(options=options)
+        result = super()._shared_dict(options=options)
         if (
             self._adjacent_comments
             and options is not None
             and options.with_comments
             and isinstance(result, dict)
         ):
-            result["__comments__"] = self._adjacent_comments
+            result = {**result, "__comments__": self._adjacent_comments}
         return result
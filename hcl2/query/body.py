@@ -1,11 +1,15 @@
 """DocumentView and BodyView facades."""
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
 from hcl2.query._base import NodeView, register_view
 from hcl2.rules.base import AttributeRule, BlockRule, BodyRule, StartRule
 from hcl2.rules.whitespace import NewLineOrCommentRule
 
+if TYPE_CHECKING:
+    from hcl2.cache import ParseCache
+    from hcl2.incremental import TextEdit
+
 
 def _collect_leading_comments(body: BodyRule, child_index: int) -> List[dict]:
     """Collect comments from NewLineOrCommentRule siblings preceding *child_index*.
@@ -37,22 +41,56 @@ class DocumentView(NodeView):
     """View over the top-level HCL2 document (StartRule)."""
 
     @staticmethod
-    def parse(text: str) -> "DocumentView":
-        """Parse HCL2 text into a DocumentView."""
+    def parse(
+        text: str, cache: Optional["ParseCache"] = None, lazy: bool = False
+    ) -> "DocumentView":
+        """Parse HCL2 text into a DocumentView, optionally through a parse cache.
+
+        With *lazy*, top-level block bodies are parsed on first access (see
+        :func:`hcl2.lazy.parses_lazy`); a cache cannot be used then.
+        """
+        if lazy:
+            if cache is not None:
+                raise ValueError("A parse cache cannot be used with lazy parsing")
+            from hcl2.lazy import parses_lazy
+
+            return DocumentView(parses_lazy(text))
+
         from hcl2 import api
 
-        tree = api.parses(text)
+        tree = api.parses(text, cache=cache)
         return DocumentView(tree)
 
     @staticmethod
-    def parse_file(path: str) -> "DocumentView":
-        """Parse an HCL2 file into a DocumentView."""
+    def parse_file(
+        path: str, cache: Optional["ParseCache"] = None, lazy: bool = False
+    ) -> "DocumentView":
+        """Parse an HCL2 file into a DocumentView, optionally through a parse cache.
+
+        *lazy* works as for :meth:`parse`.
+        """
+        if lazy:
+            with open(path, encoding="utf-8") as f:
+                return DocumentView.parse(f.read(), cache=cache, lazy=True)
+
         from hcl2 import api
 
         with open(path, encoding="utf-8") as f:
-            tree = api.parse(f)
+            tree = api.parse(f, cache=cache)
         return DocumentView(tree)
 
+    def reparse(self, text: str, edit: "TextEdit") -> "DocumentView":
+        """Return the document of *text* after *edit*; *text* is this document's source.
+
+        Only the top-level attribute or block containing the edit is reparsed
+        when possible (see :func:`hcl2.incremental.reparse`), in which case
+        this document's tree is updated in place and shared with the result.
+        """
+        from hcl2.incremental import reparse
+
+        node: StartRule = self._node  # type: ignore[assignment]
+        return DocumentView(reparse(node, text, edit))
+
     @property
     def body(self) -> "BodyView":
         """Return the document body as a BodyView."""
@@ -85,38 +123,42 @@ class BodyView(NodeView):
         from hcl2.query.blocks import BlockView
 
         node: BodyRule = self._node  # type: ignore[assignment]
-        results: List[NodeView] = []
-        for child in node.children:
-            if not isinstance(child, BlockRule):
-                continue
-            adjacent = _collect_leading_comments(node, child.index) or None
-            block_view = BlockView(child, adjacent_comments=adjacent)
-            if block_type is not None and block_view.block_type != block_type:
-                continue
-            if labels:
-                name_lbls = block_view.name_labels
-                if len(labels) > len(name_lbls):
-                    continue
-                if any(l != nl for l, nl in zip(labels, name_lbls)):
-                    continue
-            results.append(block_view)
-        return results
+        return [
+            BlockView(
+                child,
+                adjacent_comments=_collect_leading_comments(node, child.index) or None,
+            )
+            for child in node.find_blocks(block_type, *labels)
+        ]
+
+    def blocks_by_path(self, block_type: str, names: Sequence[str]) -> List["NodeView"]:
+        """Return blocks of *block_type* that a path through *names* can reach.
+
+        See :meth:`hcl2.rules.base.BodyRule.find_blocks_by_path`.
+        """
+        from hcl2.query.blocks import BlockView
+
+        node: BodyRule = self._node  # type: ignore[assignment]
+        return [
+            BlockView(
+                child,
+                adjacent_comments=_collect_leading_comments(node, child.index) or None,
+            )
+            for child in node.find_blocks_by_path(block_type, names)
+        ]
 
     def attributes(self, name: Optional[str] = None) -> List["NodeView"]:
         """Return attributes, optionally filtered by name."""
         from hcl2.query.attributes import AttributeView
 
         node: BodyRule = self._node  # type: ignore[assignment]
-        results: List[NodeView] = []
-        for child in node.children:
-            if not isinstance(child, AttributeRule):
-                continue
-            adjacent = _collect_leading_comments(node, child.index) or None
-            attr_view = AttributeView(child, adjacent_comments=adjacent)
-            if name is not None and attr_view.name != name:
-                continue
-            results.append(attr_view)
-        return results
+        return [
+            AttributeView(
+                child,
+                adjacent_comments=_collect_leading_comments(node, child.index) or None,
+            )
+            for child in node.find_attributes(name)
+        ]
 
     def attribute(self, name: str) -> Optional["NodeView"]:
         """Return a single attribute by name, or None."""
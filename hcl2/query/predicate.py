@@ -444,7 +444,7 @@ def _coerce_str(value: Any) -> str:
     from hcl2.query._base import NodeView
 
     if isinstance(value, NodeView):
-        dict_val = value.to_dict()
+        dict_val = value._shared_dict()
         if isinstance(dict_val, str):
             return dict_val
         return str(dict_val)
@@ -495,7 +495,7 @@ def _to_comparable(value: Any) -> Any:
     from hcl2.query._base import NodeView
 
     if isinstance(value, NodeView):
-        value = value.to_dict()
+        value = value._shared_dict()
     # Coerce HCL keyword strings to Python types so that
     # ``select(.x == true)`` matches the HCL keyword ``true``.
     if isinstance(value, str) and value in _KEYWORD_MAP:
@@ -1,7 +1,7 @@
 """Structural path resolver for the hq query language."""
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, cast
+from typing import TYPE_CHECKING, List, Sequence, cast
 
 from hcl2 import walk as _walk_mod
 from hcl2.query._base import NodeView
@@ -26,7 +26,7 @@ def resolve_path(root: NodeView, segments: List[PathSegment]) -> List[NodeView]:
 
     states = [_ResolverState(node=root)]
 
-    for segment in segments:
+    for position, segment in enumerate(segments):
         next_states: List[_ResolverState] = []
 
         if segment.recursive:
@@ -34,8 +34,9 @@ def resolve_path(root: NodeView, segments: List[PathSegment]) -> List[NodeView]:
             for state in states:
                 next_states.extend(_resolve_recursive(state, segment))
         else:
+            following = segments[position + 1 :]
             for state in states:
-                next_states.extend(_resolve_segment(state, segment))
+                next_states.extend(_resolve_segment(state, segment, following))
 
         states = next_states
         if not states:
@@ -45,9 +46,14 @@ def resolve_path(root: NodeView, segments: List[PathSegment]) -> List[NodeView]:
 
 
 def _resolve_segment(  # pylint: disable=too-many-return-statements
-    state: _ResolverState, segment: PathSegment
+    state: _ResolverState,
+    segment: PathSegment,
+    following: Sequence[PathSegment] = (),
 ) -> List[_ResolverState]:
-    """Resolve a single segment against a state."""
+    """Resolve a single segment against a state.
+
+    *following* are the segments after it, used to narrow down block lookups.
+    """
     from hcl2.query.attributes import AttributeView
     from hcl2.query.blocks import BlockView
     from hcl2.query.body import BodyView, DocumentView
@@ -59,7 +65,7 @@ def _resolve_segment(  # pylint: disable=too-many-return-statements
 
     # DocumentView/BodyView: look up blocks and attributes by name
     if isinstance(node, (DocumentView, BodyView)):
-        return _resolve_on_body(node, segment)
+        return _resolve_on_body(node, segment, following)
 
     # BlockView with unconsumed labels
     if isinstance(node, BlockView) and state.label_depth < len(node.name_labels):
@@ -67,7 +73,7 @@ def _resolve_segment(  # pylint: disable=too-many-return-statements
 
     # BlockView with labels consumed: delegate to body
     if isinstance(node, BlockView):
-        return _resolve_on_body(node.body, segment)
+        return _resolve_on_body(node.body, segment, following)
 
     # AttributeView: unwrap to value_node
     if isinstance(node, AttributeView):
@@ -172,7 +178,9 @@ def _node_matches_name(node: NodeView, name: str) -> bool:
     return False
 
 
-def _resolve_on_body(node: NodeView, segment: PathSegment) -> List[_ResolverState]:
+def _resolve_on_body(
+    node: NodeView, segment: PathSegment, following: Sequence[PathSegment] = ()
+) -> List[_ResolverState]:
     """Resolve a segment on a DocumentView or BodyView."""
     from hcl2.query.body import BodyView, DocumentView
 
@@ -195,8 +203,15 @@ def _resolve_on_body(node: NodeView, segment: PathSegment) -> List[_ResolverStat
         for attr in body.attributes():
             candidates.append(_ResolverState(node=attr))
     else:
-        # Match block types
-        for blk in body.blocks(segment.name):
+        # Match block types, narrowed down by the labels the next segments
+        # must match through the body's lookup index
+        names = _label_names(segment, following)
+        blocks = (
+            body.blocks_by_path(segment.name, names)
+            if names
+            else body.blocks(segment.name)
+        )
+        for blk in blocks:
             blk_view = cast("BlockView", blk)
             depth = len(blk_view.name_labels) if segment.skip_labels else 0
             candidates.append(_ResolverState(node=blk, label_depth=depth))
@@ -207,6 +222,33 @@ def _resolve_on_body(node: NodeView, segment: PathSegment) -> List[_ResolverStat
     return _apply_index_filter(candidates, segment)
 
 
+def _label_names(segment: PathSegment, following: Sequence[PathSegment]) -> List[str]:
+    """Return the names that blocks matched by *segment* must have as labels.
+
+    Each segment after a block type selects the next block label, or, once
+    the labels run out, something within the block body. Stops at the first
+    segment that is not a plain name, and returns no names if *segment*
+    itself filters its matches by position, type or predicate, or skips labels.
+    """
+    if (
+        segment.index is not None
+        or segment.predicate is not None
+        or segment.type_filter is not None
+        or segment.skip_labels
+    ):
+        return []
+    names: List[str] = []
+    for next_segment in following:
+        if (
+            next_segment.recursive
+            or next_segment.type_filter is not None
+            or next_segment.name == "*"
+        ):
+            break
+        names.append(next_segment.name)
+    return names
+
+
 def _resolve_on_block_labels(
     node: "NodeView", segment: PathSegment, label_depth: int
 ) -> List[_ResolverState]:
@@ -1,10 +1,17 @@
-"""Reconstruct HCL2 text from a Lark Tree AST."""
+"""Reconstruct HCL2 text from a LarkElement tree or a Lark Tree AST.
 
-from typing import List, Optional, Union
+:class:`ElementReconstructor` walks LarkElement trees directly;
+:class:`HCLReconstructor` walks the Lark trees produced by ``to_lark()`` or
+the parser. Both insert spaces by the same rules, so they produce the same
+text for a tree and its ``to_lark()`` conversion.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
 
 from lark import Tree, Token
 from hcl2.rules import tokens
-from hcl2.rules.base import BlockRule
+from hcl2.rules.abstract import LarkElement, LarkRule, LarkToken
+from hcl2.rules.base import BlockRule, BodyRule
 from hcl2.rules.containers import ObjectElemRule
 from hcl2.rules.directives import (
     TemplateIfRule,
@@ -19,16 +26,35 @@ from hcl2.rules.for_expressions import ForIntroRule, ForTupleExprRule, ForObject
 from hcl2.rules.literal_rules import IdentifierRule, LiteralValueRule
 from hcl2.rules.strings import StringRule
 from hcl2.rules.expressions import (
-    ExprTermRule,
     ConditionalRule,
     UnaryOpRule,
 )
-
-
-class HCLReconstructor:
-    """This class converts a Lark.Tree AST back into a string representing the underlying HCL code."""
-
-    _binary_op_types = {
+from hcl2.rules.whitespace import NewLineOrCommentRule
+
+_NL_OR_COMMENT = "NL_OR_COMMENT"
+_LBRACE = tokens.LBRACE.lark_name()
+_RBRACE = tokens.RBRACE.lark_name()
+_RSQB = tokens.RSQB.lark_name()
+_COLON = tokens.COLON.lark_name()
+_QMARK = tokens.QMARK.lark_name()
+_COMMA = tokens.COMMA.lark_name()
+_EQ = tokens.EQ.lark_name()
+_ELLIPSIS = tokens.ELLIPSIS.lark_name()
+_FOR_OBJECT_ARROW = tokens.FOR_OBJECT_ARROW.lark_name()
+_DIRECTIVE_START = tokens.DIRECTIVE_START.lark_name()
+_STRIP_MARKER = tokens.STRIP_MARKER.lark_name()
+_FOR = tokens.FOR.lark_name()
+_IN = tokens.IN.lark_name()
+_IF = tokens.IF.lark_name()
+
+_BLOCK = BlockRule.lark_name()
+_CONDITIONAL = ConditionalRule.lark_name()
+_FOR_INTRO = ForIntroRule.lark_name()
+_UNARY_OP = UnaryOpRule.lark_name()
+_NEW_LINE_OR_COMMENT = NewLineOrCommentRule.lark_name()
+
+_BINARY_OPERATORS = frozenset(
+    {
         "DOUBLE_EQ",
         "NEQ",
         "LT",
@@ -43,8 +69,9 @@ class HCLReconstructor:
         "DOUBLE_PIPE",
         "PLUS",
     }
-
-    _directive_rule_names = {
+)
+_DIRECTIVE_RULES = frozenset(
+    {
         TemplateIfStartRule.lark_name(),
         TemplateElseRule.lark_name(),
         TemplateEndifRule.lark_name(),
@@ -53,6 +80,166 @@ class HCLReconstructor:
         TemplateIfRule.lark_name(),
         TemplateForRule.lark_name(),
     }
+)
+_CONDITIONAL_SEPARATORS = (_COLON, _QMARK)
+_FOR_KEYWORDS = (_FOR, _IN, _IF)
+_BLOCK_LABELS = (
+    StringRule.lark_name(),
+    IdentifierRule.lark_name(),
+    LiteralValueRule.lark_name(),
+)
+_VALUE_AFTER_COLON = (
+    ForTupleExprRule.lark_name(),
+    ForObjectExprRule.lark_name(),
+    ObjectElemRule.lark_name(),
+)
+_LEADING_WHITESPACE = (" ", "\t")
+
+
+# pylint:disable=R0911,R0912
+def _space_before_token(
+    token_type: str,
+    parent_rule_name: Optional[str],
+    last_token_name: str,
+    leading_whitespace: bool,
+) -> bool:
+    """Return whether a space goes before a token that follows another token.
+
+    :param token_type: Grammar name of the token.
+    :param parent_rule_name: Grammar name of the rule containing the token.
+    :param last_token_name: Grammar name of the previous token written.
+    :param leading_whitespace: Whether the token value starts with a space or tab.
+    """
+    # Space before '{' in blocks
+    if token_type == _LBRACE and parent_rule_name == _BLOCK:
+        return True
+
+    # Space around Conditional Expression operators
+    if parent_rule_name == _CONDITIONAL and (
+        token_type in _CONDITIONAL_SEPARATORS
+        or last_token_name in _CONDITIONAL_SEPARATORS
+    ):
+        # COLON may already carry leading whitespace from the grammar
+        return not (token_type == _COLON and leading_whitespace)
+
+    # Space before colon in for_intro
+    if parent_rule_name == _FOR_INTRO and token_type == _COLON:
+        return not leading_whitespace
+
+    # Space after commas in tuples and function arguments...
+    if last_token_name == _COMMA:
+        # ... except before closing brackets or newlines
+        return token_type not in (_RSQB, _NL_OR_COMMENT)
+
+    # Template directive spacing: %{~ keyword ~} patterns
+    if parent_rule_name in _DIRECTIVE_RULES:
+        # Space after DIRECTIVE_START (before keyword, but not strip marker)
+        if last_token_name == _DIRECTIVE_START:
+            return token_type != _STRIP_MARKER
+        # Space after STRIP_MARKER (before keyword), no space before RBRACE
+        if last_token_name == _STRIP_MARKER:
+            return token_type != _RBRACE
+        # Space after keywords, before IN (after identifier), before the
+        # closing STRIP_MARKER or RBRACE (closing directive, no strip marker)
+        return last_token_name in _FOR_KEYWORDS or token_type in (
+            _IN,
+            _STRIP_MARKER,
+            _RBRACE,
+        )
+
+    if token_type in (_FOR, _IN, _IF, _ELLIPSIS):
+        return True
+
+    if last_token_name in _FOR_KEYWORDS and token_type != _NL_OR_COMMENT:
+        return True
+
+    # Space around for_object arrow
+    if _FOR_OBJECT_ARROW in (token_type, last_token_name):
+        return True
+
+    # Space after ellipsis in function arguments
+    # ... except before newlines which provide their own whitespace
+    if last_token_name == _ELLIPSIS:
+        return token_type != _NL_OR_COMMENT
+
+    # Space around EQ and COLON separators in attributes/object elements.
+    # Both terminals may carry leading whitespace from the original
+    # source (e.g. "   =" for aligned attributes, " :" for object
+    # elements).  Skip the automatic space when the token already
+    # provides it.  COLON only gets space if it already has leading
+    # whitespace (unlike EQ which always gets at least one space).
+    if token_type == _EQ:
+        return not leading_whitespace
+    if token_type == _COLON:
+        return False
+    if last_token_name == _EQ:
+        # Don't add space before newlines which provide their own whitespace
+        return token_type != _NL_OR_COMMENT
+
+    # Don't add space around operator tokens inside unary_op
+    if parent_rule_name == _UNARY_OP:
+        return False
+
+    return token_type in _BINARY_OPERATORS or last_token_name in _BINARY_OPERATORS
+
+
+def _space_before_rule(
+    rule_name: str,
+    parent_rule_name: Optional[str],
+    last_token_name: str,
+    last_rule_name: Optional[str],
+) -> bool:
+    """Return whether a space goes before a rule that follows a token.
+
+    :param rule_name: Grammar name of the rule.
+    :param parent_rule_name: Grammar name of the rule containing it.
+    :param last_token_name: Grammar name of the previous token written.
+    :param last_rule_name: Grammar name of the previous rule completed.
+    """
+    # Space after binary operator tokens before a tree node (e.g. && !foo)
+    if last_token_name in _BINARY_OPERATORS:
+        return True
+
+    # Space between multiple string/identifier labels in blocks
+    if (
+        parent_rule_name == _BLOCK
+        and rule_name in _BLOCK_LABELS
+        and last_rule_name in _BLOCK_LABELS
+    ):
+        return True
+
+    # Space after QMARK/COLON in conditional expressions
+    if parent_rule_name == _CONDITIONAL and last_token_name in _CONDITIONAL_SEPARATORS:
+        return True
+
+    # Space after colon in for expressions and object elements
+    # (before value expression, but not before newline/comment
+    # which provides its own whitespace)
+    return (
+        last_token_name == _COLON
+        and parent_rule_name in _VALUE_AFTER_COLON
+        and rule_name != _NEW_LINE_OR_COMMENT
+    )
+
+
+def _finish(result: str, postproc=None) -> str:
+    """Apply *postproc* and normalize the end of a reconstructed document."""
+    if postproc:
+        result = postproc(result)
+
+    # Ensure file ends with newline
+    if result and not result.endswith("\n"):
+        result += "\n"
+
+    return result
+
+
+class HCLReconstructor:
+    """This class converts a Lark.Tree AST back into a string representing the underlying HCL code."""
+
+    _binary_op_types = _BINARY_OPERATORS
+
+    _directive_rule_names = _DIRECTIVE_RULES
 
     def __init__(self):
         self._last_was_space = True
@@ -67,7 +254,6 @@ class HCLReconstructor:
         self._last_token_name = None
         self._last_rule_name = None
 
-    # pylint:disable=R0911,R0912
     def _should_add_space_before(
         self, current_node: Union[Tree, Token], parent_rule_name: Optional[str] = None
     ) -> bool:
@@ -82,182 +268,20 @@ class HCLReconstructor:
             return False
 
         if isinstance(current_node, Token):
-            token_type = current_node.type
-
-            # Space before '{' in blocks
-            if (
-                token_type == tokens.LBRACE.lark_name()
-                and parent_rule_name == BlockRule.lark_name()
-            ):
-                return True
-
-            # Space around Conditional Expression operators
-            if parent_rule_name == ConditionalRule.lark_name() and (
-                token_type in [tokens.COLON.lark_name(), tokens.QMARK.lark_name()]
-                or self._last_token_name
-                in [tokens.COLON.lark_name(), tokens.QMARK.lark_name()]
-            ):
-                # COLON may already carry leading whitespace from the grammar
-                if token_type == tokens.COLON.lark_name() and str(
-                    current_node
-                ).startswith((" ", "\t")):
-                    return False
-                return True
-
-            # Space before colon in for_intro
-            if (
-                parent_rule_name == ForIntroRule.lark_name()
-                and token_type == tokens.COLON.lark_name()
-            ):
-                if str(current_node).startswith((" ", "\t")):
-                    return False
-                return True
-
-            # Space after commas in tuples and function arguments...
-            if self._last_token_name == tokens.COMMA.lark_name():
-                # ... except before closing brackets or newlines
-                if token_type in (tokens.RSQB.lark_name(), "NL_OR_COMMENT"):
-                    return False
-                return True
-
-            # Template directive spacing: %{~ keyword ~} patterns
-            if parent_rule_name in self._directive_rule_names:
-                # Space after DIRECTIVE_START (before keyword or strip marker)
-                if self._last_token_name == tokens.DIRECTIVE_START.lark_name():
-                    # No space before strip marker
-                    if token_type == tokens.STRIP_MARKER.lark_name():
-                        return False
-                    return True
-                # Space after STRIP_MARKER (before keyword)
-                if self._last_token_name == tokens.STRIP_MARKER.lark_name():
-                    # After strip marker: space before keyword, no space before RBRACE
-                    if token_type == tokens.RBRACE.lark_name():
-                        return False
-                    return True
-                # Space after keywords
-                if self._last_token_name in [
-                    tokens.FOR.lark_name(),
-                    tokens.IN.lark_name(),
-                    tokens.IF.lark_name(),
-                ]:
-                    return True
-                # Space before IN keyword (after identifier)
-                if token_type == tokens.IN.lark_name():
-                    return True
-                # Space before STRIP_MARKER (before closing })
-                if token_type == tokens.STRIP_MARKER.lark_name():
-                    return True
-                # Space before RBRACE (closing directive, no strip marker)
-                if token_type == tokens.RBRACE.lark_name():
-                    return True
-                # Space after COMMA in for directives
-                if self._last_token_name == tokens.COMMA.lark_name():
-                    return True
-                return False
-
-            if token_type in [
-                tokens.FOR.lark_name(),
-                tokens.IN.lark_name(),
-                tokens.IF.lark_name(),
-                tokens.ELLIPSIS.lark_name(),
-            ]:
-                return True
-
-            if (
-                self._last_token_name
-                in [
-                    tokens.FOR.lark_name(),
-                    tokens.IN.lark_name(),
-                    tokens.IF.lark_name(),
-                ]
-                and token_type != "NL_OR_COMMENT"
-            ):
-                return True
-
-            # Space around for_object arrow
-            if tokens.FOR_OBJECT_ARROW.lark_name() in [
-                token_type,
+            return _space_before_token(
+                current_node.type,
+                parent_rule_name,
                 self._last_token_name,
-            ]:
-                return True
-
-            # Space after ellipsis in function arguments
-            # ... except before newlines which provide their own whitespace
-            if self._last_token_name == tokens.ELLIPSIS.lark_name():
-                if token_type == "NL_OR_COMMENT":
-                    return False
-                return True
-
-            # Space around EQ and COLON separators in attributes/object elements.
-            # Both terminals may carry leading whitespace from the original
-            # source (e.g. "   =" for aligned attributes, " :" for object
-            # elements).  Skip the automatic space when the token already
-            # provides it.  COLON only gets space if it already has leading
-            # whitespace (unlike EQ which always gets at least one space).
-            if token_type == tokens.EQ.lark_name():
-                if str(current_node).startswith((" ", "\t")):
-                    return False
-                return True
-            if token_type == tokens.COLON.lark_name():
-                return False
-            if self._last_token_name == tokens.EQ.lark_name():
-                # Don't add space before newlines which provide their own whitespace
-                if token_type == "NL_OR_COMMENT":
-                    return False
-                return True
-
-            # Don't add space around operator tokens inside unary_op
-            if parent_rule_name == UnaryOpRule.lark_name():
-                return False
-
-            if (
-                token_type in self._binary_op_types
-                or self._last_token_name in self._binary_op_types
-            ):
-                return True
-
-        elif isinstance(current_node, Tree):
-            rule_name = current_node.data
-
-            # Space after binary operator tokens before a tree node (e.g. && !foo)
-            if self._last_token_name in self._binary_op_types:
-                return True
-
-            if parent_rule_name == BlockRule.lark_name():
-                # Add space between multiple string/identifier labels in blocks
-                if rule_name in [
-                    StringRule.lark_name(),
-                    IdentifierRule.lark_name(),
-                    LiteralValueRule.lark_name(),
-                ] and self._last_rule_name in [
-                    StringRule.lark_name(),
-                    IdentifierRule.lark_name(),
-                    LiteralValueRule.lark_name(),
-                ]:
-                    return True
-
-            # Space after QMARK/COLON in conditional expressions
-            if (
-                parent_rule_name == ConditionalRule.lark_name()
-                and self._last_token_name
-                in [tokens.COLON.lark_name(), tokens.QMARK.lark_name()]
-            ):
-                return True
-
-            # Space after colon in for expressions and object elements
-            # (before value expression, but not before newline/comment
-            # which provides its own whitespace)
-            if (
-                self._last_token_name == tokens.COLON.lark_name()
-                and parent_rule_name
-                in [
-                    ForTupleExprRule.lark_name(),
-                    ForObjectExprRule.lark_name(),
-                    ObjectElemRule.lark_name(),
-                ]
-                and rule_name != "new_line_or_comment"
-            ):
-                return True
+                str(current_node).startswith(_LEADING_WHITESPACE),
+            )
+
+        if isinstance(current_node, Tree):
+            return _space_before_rule(
+                current_node.data,
+                parent_rule_name,
+                self._last_token_name,
+                self._last_rule_name,
+            )
 
         return False
 
@@ -277,17 +301,13 @@ class HCLReconstructor:
             # first child from adding a duplicate leading space.
             self._last_was_space = True
 
-        if rule_name == UnaryOpRule.lark_name():
+        if rule_name == _UNARY_OP:
             for i, child in enumerate(tree.children):
                 result.extend(self._reconstruct_node(child, rule_name))
                 if i == 0:
                     # Suppress space between unary operator and its operand
                     self._last_was_space = True
 
-        elif rule_name == ExprTermRule.lark_name():
-            for child in tree.children:
-                result.extend(self._reconstruct_node(child, rule_name))
-
         else:
             for child in tree.children:
                 result.extend(self._reconstruct_node(child, rule_name))
@@ -333,8 +353,6 @@ class HCLReconstructor:
         Suitable for rendering individual nodes (blocks, attributes, etc.)
         rather than full documents.
         """
-        from hcl2.rules.abstract import LarkRule
-
         self._reset_state()
         if isinstance(tree, LarkRule):
             tree = tree.to_lark()
@@ -349,22 +367,170 @@ class HCLReconstructor:
         # Reconstruct the tree
         fragments = self._reconstruct_node(tree)
 
-        # Join fragments and apply post-processing
-        result = "".join(fragments)
+        return _finish("".join(fragments), postproc)
+
+
+# Children of these rules whose own children are written in their place, as
+# the rules' to_lark() flattens them
+_SPLICED_CHILDREN: Dict[Type[LarkRule], Tuple[Type[LarkRule], ...]] = {
+    TemplateIfRule: (TemplateIfStartRule, TemplateElseRule, TemplateEndifRule),
+    TemplateForRule: (TemplateForStartRule, TemplateEndforRule),
+}
+
 
-        if postproc:
-            result = postproc(result)
+# Element class -> whether it is a LarkRule; isinstance() checks against the
+# abstract base classes are comparatively slow
+_IS_RULE: Dict[type, bool] = {}
 
-        # The grammar's body rule ends with an optional new_line_or_comment
-        # which captures the final newline.  The parser often produces two
-        # NL_OR_COMMENT tokens for a single trailing newline (the statement
-        # separator plus the EOF newline), resulting in a spurious blank line.
-        # Strip exactly one trailing newline when there are two or more.
-        if result.endswith("\n\n"):
-            result = result[:-1]
 
-        # Ensure file ends with newline
-        if result and not result.endswith("\n"):
-            result += "\n"
+def _lark_name(cls: Optional[Type[LarkElement]]) -> Optional[str]:
+    return None if cls is None else cls.lark_name()
 
+
+class ElementReconstructor:
+    """Converts a LarkElement tree to HCL text without building a Lark tree.
+
+    Text fragments are appended to a single list and joined once. Spacing
+    decisions are looked up in tables keyed on the classes of the node, of
+    its parent rule and of the previous token (and rule), which are filled
+    on first use from the rules :class:`HCLReconstructor` applies by name.
+    """
+
+    # (token class, parent rule class, previous token class, whether the
+    # token value starts with whitespace) -> whether a space goes before it
+    _token_spacing: Dict[Tuple[type, Optional[type], type, bool], bool] = {}
+    # (rule class, parent rule class, previous token class, previous rule
+    # class) -> whether a space goes before it
+    _rule_spacing: Dict[Tuple[type, Optional[type], type, Optional[type]], bool] = {}
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._last_was_space = True
+        self._last_token: Optional[Type[LarkToken]] = None
+        self._last_rule: Optional[Type[LarkRule]] = None
+
+    def _reset_state(self):
+        """Reset the output and the state tracking for formatting decisions."""
+        self._parts = []
+        self._last_was_space = True
+        self._last_token = None
+        self._last_rule = None
+
+    def reconstruct(self, tree: LarkRule, postproc=None) -> str:
+        """Convert a LarkElement tree into a string representation of HCL."""
+        self._reset_state()
+        self._write_rule(tree, None)
+        result = "".join(self._parts)
+        self._parts = []
+        return _finish(result, postproc)
+
+    def reconstruct_fragment(self, element: LarkElement) -> str:
+        """Reconstruct a subtree without trailing-newline normalization.
+
+        Suitable for rendering individual nodes (blocks, attributes, etc.)
+        rather than full documents.
+        """
+        self._reset_state()
+        self._write(element, None)
+        result = "".join(self._parts)
+        self._parts = []
         return result
+
+    def iter_reconstruct(self, children: Iterable[LarkElement]) -> Iterator[str]:
+        """Reconstruct the children of a document body one at a time.
+
+        Yields the text of each child as soon as it is written. Joined, the
+        chunks equal :meth:`reconstruct` of a :class:`StartRule` whose body
+        holds *children*: the end-of-document newline handling is applied to
+        the last chunk.
+        """
+        self._reset_state()
+        pending: Optional[str] = None
+        for child in children:
+            self._write(child, BodyRule)
+            text = "".join(self._parts)
+            self._parts = []
+            if not text:
+                continue
+            if pending is not None:
+                yield pending
+            # The last chunk is held back for the end-of-document handling
+            pending = text
+        if pending is not None:
+            yield _finish(pending)
+
+    def _write(self, element: LarkElement, parent: Optional[Type[LarkRule]]):
+        if isinstance(element, LarkRule):
+            self._write_rule(element, parent)
+        else:
+            self._write_token(element, parent)  # type: ignore[arg-type]
+
+    def _write_rule(self, rule: LarkRule, parent: Optional[Type[LarkRule]]):
+        cls = type(rule)
+        parts = self._parts
+        start = len(parts)
+
+        # Check spacing BEFORE writing children, while _last_rule still
+        # reflects the previous sibling (not a child of this rule).
+        if not self._last_was_space and self._last_token is not None:
+            key = (cls, parent, self._last_token, self._last_rule)
+            needs_space = self._rule_spacing.get(key)
+            if needs_space is None:
+                needs_space = self._rule_spacing[key] = _space_before_rule(
+                    cls.lark_name(),
+                    _lark_name(parent),
+                    self._last_token.lark_name(),
+                    _lark_name(self._last_rule),
+                )
+            if needs_space:
+                parts.append(" ")
+                # Prevents the first child from adding another space
+                self._last_was_space = True
+
+        spliced = _SPLICED_CHILDREN.get(cls)
+        first = True
+        for child in rule.children:
+            if child is None:
+                continue
+            child_cls = type(child)
+            is_rule = _IS_RULE.get(child_cls)
+            if is_rule is None:
+                is_rule = _IS_RULE[child_cls] = issubclass(child_cls, LarkRule)
+            if not is_rule:
+                self._write_token(child, cls)
+            elif spliced is not None and child_cls in spliced:
+                for grandchild in child.children:
+                    if grandchild is not None:
+                        self._write(grandchild, cls)
+            else:
+                self._write_rule(child, cls)
+            if first and cls is UnaryOpRule:
+                # Suppress space between unary operator and its operand
+                self._last_was_space = True
+            first = False
+
+        self._last_rule = cls
+        if len(parts) > start:
+            self._last_was_space = parts[-1].endswith((" ", "\n"))
+
+    def _write_token(self, token: LarkToken, parent: Optional[Type[LarkRule]]):
+        cls = type(token)
+        value = text = str(token.value)
+        if not self._last_was_space and self._last_token is not None:
+            leading_whitespace = value.startswith(_LEADING_WHITESPACE)
+            key = (cls, parent, self._last_token, leading_whitespace)
+            needs_space = self._token_spacing.get(key)
+            if needs_space is None:
+                needs_space = self._token_spacing[key] = _space_before_token(
+                    cls.lark_name(),
+                    _lark_name(parent),
+                    self._last_token.lark_name(),
+                    leading_whitespace,
+                )
+            if needs_space:
+                text = " " + value
+
+        self._parts.append(text)
+        self._last_token = cls
+        if value:
+            self._last_was_space = text.endswith((" ", "\n"))
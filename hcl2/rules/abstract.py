@@ -1,7 +1,9 @@
 """Abstract base classes for the LarkElement tree intermediate representation."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Union, List, Optional, Callable
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Dict, Tuple, Union, List, Optional, Callable, TypeVar
 
 from lark import Token, Tree
 from lark.tree import Meta
@@ -9,9 +11,79 @@ from lark.tree import Meta
 from hcl2.utils import SerializationOptions, SerializationContext
 
 
+_DEFAULT_OPTIONS = SerializationOptions()
+# SerializationOptions fields, whose values key the results of serialize_cached()
+_OPTION_NAMES = tuple(field.name for field in fields(SerializationOptions))
+
+_Element = TypeVar("_Element", bound="LarkElement")
+_Token = TypeVar("_Token", bound="LarkToken")
+_Rule = TypeVar("_Rule", bound="LarkRule")
+
+
+class NodeMeta:
+    """Source position of a rule: a compact, slotted stand-in for ``lark.tree.Meta``.
+
+    Attributes are None when the rule was not created from parsed text (e.g. by
+    the deserializer or the builder).
+    """
+
+    __slots__ = ("line", "column", "start_pos", "end_line", "end_column", "end_pos")
+
+    def __init__(  # pylint: disable=R0917
+        self,
+        line: Optional[int] = None,
+        column: Optional[int] = None,
+        start_pos: Optional[int] = None,
+        end_line: Optional[int] = None,
+        end_column: Optional[int] = None,
+        end_pos: Optional[int] = None,
+    ):
+        self.line = line
+        self.column = column
+        self.start_pos = start_pos
+        self.end_line = end_line
+        self.end_column = end_column
+        self.end_pos = end_pos
+
+    @classmethod
+    def from_meta(cls, meta: Optional[Union[Meta, "NodeMeta"]]) -> "NodeMeta":
+        """Return *meta* as a NodeMeta, copying the position of a Lark ``Meta``."""
+        if isinstance(meta, NodeMeta):
+            return meta
+        if meta is None or meta.empty:
+            return cls()
+        return cls(
+            meta.line,
+            meta.column,
+            meta.start_pos,
+            meta.end_line,
+            meta.end_column,
+            meta.end_pos,
+        )
+
+    @property
+    def empty(self) -> bool:
+        """Return True if no source position is recorded."""
+        return self.line is None
+
+    def __eq__(self, other):
+        if not isinstance(other, NodeMeta):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"NodeMeta({self.line}:{self.column}-{self.end_line}:{self.end_column})"
+
+
 class LarkElement(ABC):
     """Base class for all elements in the LarkElement tree."""
 
+    __slots__ = ("_index", "_parent")
+
     @staticmethod
     @abstractmethod
     def lark_name() -> str:
@@ -30,6 +102,23 @@ class LarkElement(ABC):
         """Set the parent element that contains this element."""
         self._parent = node
 
+    def clone(self: _Element) -> _Element:
+        """Return a deep copy of this element, detached from any parent."""
+        raise NotImplementedError()
+
+    def mark_dirty(self):
+        """Discard the cached serializations of this element and its ancestors.
+
+        Call after modifying the element in place. Token values set through
+        ``set_value`` and changes to the ``children`` list of a rule do so
+        themselves.
+        """
+        node: Optional[LarkElement] = self
+        while node is not None:
+            if isinstance(node, LarkRule):
+                node._serialized = None
+            node = node._parent
+
     @abstractmethod
     def to_lark(self) -> Any:
         """Convert this element back to a Lark Tree or Token."""
@@ -46,6 +135,8 @@ class LarkElement(ABC):
 class LarkToken(LarkElement, ABC):
     """Base class for terminal token elements (leaves of the tree)."""
 
+    __slots__ = ("_value",)
+
     def __init__(self, value: Optional[Union[str, int, float]] = None):
         self._value = value
         super().__init__()
@@ -64,6 +155,16 @@ class LarkToken(LarkElement, ABC):
     def set_value(self, value: Any):
         """Set the raw value of this token."""
         self._value = value
+        if self._parent is not None:
+            self._parent.mark_dirty()
+
+    def clone(self: _Token) -> _Token:
+        """Return a copy of this token, detached from any parent."""
+        copy = object.__new__(type(self))
+        copy._value = self._value
+        copy._index = self._index
+        copy._parent = None
+        return copy
 
     def serialize(
         self, options=SerializationOptions(), context=SerializationContext()
@@ -92,6 +193,13 @@ class LarkRule(LarkElement, ABC):
     `_children` list.
     """
 
+    __slots__ = ("_children", "_meta", "_serialized")
+
+    # Child elements; a _ChildList once exposed through the children property.
+    _children: List[Any]
+    # Results of serialize_cached() by options; None until first cached.
+    _serialized: Optional[Dict[Tuple, Any]]
+
     @abstractmethod
     def serialize(
         self, options=SerializationOptions(), context=SerializationContext()
@@ -99,10 +207,35 @@ class LarkRule(LarkElement, ABC):
         """Serialize this rule and its children to a Python object."""
         raise NotImplementedError()
 
+    def serialize_cached(self, options: Optional[SerializationOptions] = None) -> Any:
+        """Return ``serialize(options)``, reusing the result of an earlier call.
+
+        Results are kept per options value until :meth:`mark_dirty` is called
+        on this rule or one of its descendants. The returned value is shared
+        between calls and must not be modified.
+        """
+        if options is None:
+            options = _DEFAULT_OPTIONS
+        key = tuple(getattr(options, name) for name in _OPTION_NAMES)
+        cache = self._serialized
+        if cache is None:
+            cache = self._serialized = {}
+        elif key in cache:
+            return cache[key]
+        result = cache[key] = self.serialize(options)
+        return result
+
     @property
     def children(self) -> List[Any]:
-        """Return the list of child elements."""
-        return self._children
+        """Return the list of child elements.
+
+        Modifying the list marks this rule dirty (see :meth:`mark_dirty`).
+        """
+        children = self._children
+        if not isinstance(children, _ChildList):
+            # Track modifications from now on
+            children = self._children = _track_children(children, self)
+        return children
 
     @property
     def parent(self):
@@ -114,6 +247,36 @@ class LarkRule(LarkElement, ABC):
         """Return the position index within the parent."""
         return self._index
 
+    def clone(self: _Rule) -> _Rule:
+        """Return a deep copy of this rule and its descendants, detached from any parent.
+
+        Copies are made without running constructors, so cloning costs a small
+        fraction of parsing the same source again. Source positions are shared
+        with the original; cached serializations are not copied.
+        """
+        cls = type(self)
+        copy = object.__new__(cls)
+        clones: Dict[int, LarkElement] = {}
+        children = []
+        for child in self._children:
+            if child is not None:
+                child_copy = child.clone()
+                child_copy._parent = copy
+                clones[id(child)] = child_copy
+                child = child_copy
+            children.append(child)
+        copy._children = children
+        copy._meta = self._meta
+        copy._serialized = None
+        copy._index = self._index
+        copy._parent = None
+        # Subclass slots referring to children (e.g. a block's body) must
+        # refer to the copied children
+        for name in _extra_slots(cls):
+            if hasattr(self, name):
+                setattr(copy, name, _remap(getattr(self, name), clones))
+        return copy
+
     def to_lark(self) -> Tree:
         """Convert this rule and its children back to a Lark Tree."""
         result_children = []
@@ -123,12 +286,21 @@ class LarkRule(LarkElement, ABC):
 
             result_children.append(child.to_lark())
 
-        return Tree(self.lark_name(), result_children, meta=self._meta)
+        # NodeMeta provides the position attributes Lark reads from Meta
+        return Tree(
+            self.lark_name(), result_children, meta=self._meta  # type: ignore[arg-type]
+        )
 
-    def __init__(self, children: List[Any], meta: Optional[Meta] = None):
+    def __init__(
+        self, children: List[Any], meta: Optional[Union[Meta, NodeMeta]] = None
+    ):
         super().__init__()
-        self._children: List[Any] = children
-        self._meta = meta or Meta()
+        if isinstance(children, _ChildList):
+            # Taken from another rule, whose modifications it tracks
+            children = list(children)
+        self._children = children
+        self._meta = NodeMeta.from_meta(meta)
+        self._serialized = None
 
         for index, child in enumerate(children):
             if child is not None:
@@ -137,3 +309,83 @@ class LarkRule(LarkElement, ABC):
 
     def __repr__(self):
         return f"<LarkRule: {self.__class__.__name__}>"
+
+
+@lru_cache(maxsize=None)
+def _extra_slots(cls: type) -> Tuple[str, ...]:
+    """Return the slots *cls* declares below :class:`LarkRule`."""
+    return tuple(
+        name
+        for klass in cls.__mro__
+        if klass not in (LarkRule, LarkElement)
+        for name in klass.__dict__.get("__slots__", ())
+    )
+
+
+def _remap(value: Any, clones: Dict[int, LarkElement]) -> Any:
+    """Replace children referenced by *value* with their copies in *clones*."""
+    if isinstance(value, LarkElement):
+        return clones.get(id(value), value)
+    if isinstance(value, list):
+        return [_remap(item, clones) for item in value]
+    return value
+
+
+class _ChildList(list):
+    """Children of a rule that count their modifications.
+
+    Modifications mark the owning rule dirty, discarding its cached
+    serializations and those of its ancestors. The lookup index of a
+    :class:`~hcl2.rules.base.BodyRule` records the count it was built at and
+    is rebuilt once the list has been modified.
+    """
+
+    __slots__ = ("version", "owner")
+
+    # Set by _track_children; no __init__, which would make creation slower
+    version: int
+    owner: Optional[LarkRule]
+
+    def __reduce__(self):
+        # Items are appended after creation, like for a list, in case they
+        # refer back to it; the count is restored last.
+        state = (None, {"version": self.version, "owner": self.owner})
+        return _track_children, ([], None), state, iter(self)
+
+
+def _track_children(children: List[Any], owner: Optional[LarkRule]) -> _ChildList:
+    """Return a copy of *children* that marks *owner* dirty when modified."""
+    tracked = _ChildList(children)
+    tracked.version = 0
+    tracked.owner = owner
+    return tracked
+
+
+def _counting(name: str):
+    method = getattr(list, name)
+
+    def mutator(self, *args, **kwargs):
+        self.version += 1
+        if self.owner is not None:
+            self.owner.mark_dirty()
+        return method(self, *args, **kwargs)
+
+    mutator.__name__ = name
+    return mutator
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_ChildList, _name, _counting(_name))
@@ -1,12 +1,12 @@
 """Rule classes for HCL2 structural elements (attributes, bodies, blocks)."""
 
 from collections import defaultdict
-from typing import Tuple, Any, List, Union, Optional
+from typing import Dict, Tuple, Any, List, Sequence, Union, Optional, cast
 
 from lark.tree import Meta
 
 from hcl2.const import IS_BLOCK, INLINE_COMMENTS_KEY
-from hcl2.rules.abstract import LarkRule, LarkToken
+from hcl2.rules.abstract import LarkRule, LarkToken, NodeMeta, _ChildList
 from hcl2.rules.expressions import ExprTermRule
 from hcl2.rules.literal_rules import IdentifierRule
 from hcl2.rules.strings import StringRule
@@ -16,9 +16,24 @@ from hcl2.rules.whitespace import NewLineOrCommentRule
 from hcl2.utils import SerializationOptions, SerializationContext
 
 
+def label_to_str(label: Union[IdentifierRule, StringRule]) -> str:
+    """Convert a block label (IdentifierRule or StringRule) to a plain string."""
+    if isinstance(label, IdentifierRule):
+        return label.serialize()
+    if isinstance(label, StringRule):
+        raw = label.serialize()
+        # Strip surrounding quotes
+        if isinstance(raw, str) and len(raw) >= 2 and raw[0] == '"' and raw[-1] == '"':
+            return raw[1:-1]
+        return str(raw)
+    return str(label.serialize())
+
+
 class AttributeRule(LarkRule):
     """Rule for key = value attribute assignments."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         IdentifierRule,
         EQ,
@@ -48,7 +63,15 @@ class AttributeRule(LarkRule):
 
 
 class BodyRule(LarkRule):
-    """Rule for a body containing attributes, blocks, and comments."""
+    """Rule for a body containing attributes, blocks, and comments.
+
+    Block and attribute lookups go through an index built on first use and
+    rebuilt after the children list is modified or replaced. Renaming a block
+    or attribute in place does not modify the list; call
+    :meth:`invalidate_lookup` afterwards.
+    """
+
+    __slots__ = ("_lookup",)
 
     _children_layout: List[
         Union[
@@ -58,11 +81,85 @@ class BodyRule(LarkRule):
         ]
     ]
 
+    def __init__(self, children, meta: Optional[Union[Meta, NodeMeta]] = None):
+        super().__init__(children, meta)
+        self._lookup: Optional[_BodyLookup] = None
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar rule name."""
         return "body"
 
+    def find_blocks(
+        self, block_type: Optional[str] = None, *labels: str
+    ) -> List["BlockRule"]:
+        """Return child blocks of *block_type* whose name labels start with *labels*.
+
+        :param block_type: Block type to match; None matches any type.
+        :param labels: Leading labels after the block type to match.
+        """
+        lookup = self._get_lookup()
+        if block_type is not None:
+            return list(lookup.blocks.get(block_type, {}).get(labels, ()))
+        count = len(labels) + 1
+        return [
+            block
+            for block, block_labels in lookup.labels.items()
+            if block_labels[1:count] == labels
+        ]
+
+    def find_blocks_by_path(
+        self, block_type: str, names: Sequence[str]
+    ) -> List["BlockRule"]:
+        """Return child blocks of *block_type* that a path through *names* can reach.
+
+        Those are the blocks whose name labels start with all of *names*, and
+        those whose name labels are a shorter leading run of *names*, leaving
+        the other names to select within their body.
+        """
+        lookup = self._get_lookup()
+        names = tuple(names)
+        matches = list(lookup.blocks.get(block_type, {}).get(names, ()))
+        for end in range(len(names)):
+            matches.extend(lookup.exact.get((block_type, *names[:end]), ()))
+        if len(names) > 0:
+            matches.sort(key=lambda block: block.index)
+        return matches
+
+    def find_attributes(self, name: Optional[str] = None) -> List[AttributeRule]:
+        """Return child attributes named *name*, or all of them if *name* is None."""
+        if name is None:
+            return [
+                child for child in self._children if isinstance(child, AttributeRule)
+            ]
+        return list(self._get_lookup().attributes.get(name, ()))
+
+    def block_labels(self, block: "BlockRule") -> Optional[Tuple[str, ...]]:
+        """Return the labels of child *block* as plain strings, or None if not a child."""
+        return self._get_lookup().labels.get(block)
+
+    def clone(self) -> "BodyRule":
+        """Return a deep copy of this body, with its own lookup index."""
+        copy = super().clone()
+        copy._lookup = None
+        return copy
+
+    def invalidate_lookup(self) -> None:
+        """Discard the lookup index, e.g. after renaming a block or attribute."""
+        self._lookup = None
+
+    def _get_lookup(self) -> "_BodyLookup":
+        # The children property tracks modifications of the list
+        children = cast(_ChildList, self.children)
+        lookup = self._lookup
+        if (
+            lookup is None
+            or lookup.children is not children
+            or lookup.version != children.version
+        ):
+            lookup = self._lookup = _BodyLookup(children)
+        return lookup
+
     def serialize(
         self, options=SerializationOptions(), context=SerializationContext()
     ) -> Any:
@@ -102,9 +199,42 @@ class BodyRule(LarkRule):
         return dict(result.items())
 
 
+class _BodyLookup:
+    """Blocks by type and label prefix, and attributes by name, of a body."""
+
+    __slots__ = ("children", "version", "blocks", "exact", "labels", "attributes")
+
+    def __init__(self, children: _ChildList):
+        # The indexed list and its modification count at indexing time.
+        self.children = children
+        self.version = children.version
+        # Block type -> every leading run of name labels -> blocks, in order.
+        self.blocks: Dict[str, Dict[Tuple[str, ...], List[BlockRule]]] = {}
+        # All labels, block type included -> blocks, in order.
+        self.exact: Dict[Tuple[str, ...], List[BlockRule]] = {}
+        # Block -> all its labels, block type included, in order.
+        self.labels: Dict[BlockRule, Tuple[str, ...]] = {}
+        # Attribute name -> attributes, in order.
+        self.attributes: Dict[str, List[AttributeRule]] = {}
+
+        for child in children:
+            if isinstance(child, BlockRule):
+                labels = tuple(label_to_str(label) for label in child.labels)
+                self.labels[child] = labels
+                self.exact.setdefault(labels, []).append(child)
+                by_labels = self.blocks.setdefault(labels[0], {})
+                for end in range(1, len(labels) + 1):
+                    by_labels.setdefault(labels[1:end], []).append(child)
+            elif isinstance(child, AttributeRule):
+                name = child.identifier.serialize()
+                self.attributes.setdefault(name, []).append(child)
+
+
 class StartRule(LarkRule):
     """Rule for the top-level start rule of an HCL2 document."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[BodyRule]
 
     @property
@@ -127,6 +257,8 @@ class StartRule(LarkRule):
 class BlockRule(LarkRule):
     """Rule for HCL2 blocks (e.g. resource 'type' 'name' { ... })."""
 
+    __slots__ = ("_labels", "_body")
+
     _children_layout: Tuple[
         IdentifierRule,
         Optional[Union[IdentifierRule, StringRule]],
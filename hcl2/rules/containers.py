@@ -33,6 +33,8 @@ from hcl2.utils import (
 class TupleRule(InlineCommentMixIn):
     """Rule for tuple/array literals ([elem, ...])."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         LSQB,
         Optional[NewLineOrCommentRule],
@@ -85,6 +87,8 @@ class TupleRule(InlineCommentMixIn):
 class ObjectElemKeyRule(LarkRule):
     """Rule for an object element key."""
 
+    __slots__ = ()
+
     key_T = Union[FloatLitRule, IntLitRule, IdentifierRule, StringRule]
 
     _children_layout: Tuple[key_T]
@@ -119,6 +123,8 @@ class ObjectElemKeyExpressionRule(LarkRule):
     separate handling for bare vs parenthesized forms.
     """
 
+    __slots__ = ()
+
     _children_layout: Tuple[ExpressionRule]
 
     @staticmethod
@@ -145,6 +151,8 @@ class ObjectElemKeyExpressionRule(LarkRule):
 class ObjectElemRule(LarkRule):
     """Rule for a single key = value element in an object."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         ObjectElemKeyRule,
         Union[EQ, COLON],
@@ -180,6 +188,8 @@ class ObjectElemRule(LarkRule):
 class ObjectRule(InlineCommentMixIn):
     """Rule for object literals ({key = value, ...})."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         LBRACE,
         Optional[NewLineOrCommentRule],
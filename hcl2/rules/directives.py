@@ -53,6 +53,8 @@ def _insert_strip_optionals(children: List, indexes: List[int]):
 class TemplateIfStartRule(LarkRule):
     """Rule for %{if condition} opening directive."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         DIRECTIVE_START,
         Optional[STRIP_MARKER],
@@ -100,6 +102,8 @@ class TemplateIfStartRule(LarkRule):
 class TemplateElseRule(LarkRule):
     """Rule for %{else} directive."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         DIRECTIVE_START,
         Optional[STRIP_MARKER],
@@ -139,6 +143,8 @@ class TemplateElseRule(LarkRule):
 class TemplateEndifRule(LarkRule):
     """Rule for %{endif} directive."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         DIRECTIVE_START,
         Optional[STRIP_MARKER],
@@ -178,6 +184,8 @@ class TemplateEndifRule(LarkRule):
 class TemplateForStartRule(LarkRule):
     """Rule for %{for VAR in EXPR} opening directive."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         DIRECTIVE_START,
         Optional[STRIP_MARKER],
@@ -270,6 +278,8 @@ class TemplateForStartRule(LarkRule):
 class TemplateEndforRule(LarkRule):
     """Rule for %{endfor} directive."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         DIRECTIVE_START,
         Optional[STRIP_MARKER],
@@ -314,6 +324,8 @@ class TemplateIfRule(LarkRule):
     and interleaved StringPartRule children.
     """
 
+    __slots__ = ("_if_start", "_if_body", "_else_rule", "_else_body", "_endif")
+
     _children_layout: Tuple[
         TemplateIfStartRule,
         # ... variable number of body StringPartRules ...
@@ -382,6 +394,8 @@ class TemplateIfRule(LarkRule):
 class TemplateForRule(LarkRule):
     """Assembled rule for a complete %{for}...%{endfor} template."""
 
+    __slots__ = ("_for_start", "_body", "_endfor")
+
     _children_layout: Tuple[
         TemplateForStartRule,
         # ... variable number of body StringPartRules ...
@@ -25,6 +25,8 @@ from hcl2.utils import (
 class ExpressionRule(InlineCommentMixIn, ABC):
     """Base class for all HCL2 expression rules."""
 
+    __slots__ = ("_parentheses",)
+
     @staticmethod
     def lark_name() -> str:
         """?expression is transparent in Lark — subclasses must override."""
@@ -63,6 +65,8 @@ class ExpressionRule(InlineCommentMixIn, ABC):
 class ExprTermRule(ExpressionRule):
     """Rule for expression terms, optionally wrapped in parentheses."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         Optional[LPAR],
         Optional[NewLineOrCommentRule],
@@ -120,6 +124,8 @@ class ExprTermRule(ExpressionRule):
 class ConditionalRule(ExpressionRule):
     """Rule for ternary conditional expressions (condition ? true : false)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         ExpressionRule,
         Optional[NewLineOrCommentRule],
@@ -179,6 +185,8 @@ class ConditionalRule(ExpressionRule):
 class BinaryTermRule(ExpressionRule):
     """Rule for the operator+operand portion of a binary operation."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         Optional[NewLineOrCommentRule],
         BinaryOperatorRule,
@@ -217,6 +225,8 @@ class BinaryTermRule(ExpressionRule):
 class BinaryOpRule(ExpressionRule):
     """Rule for complete binary operations (lhs operator rhs)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         ExprTermRule,
         BinaryTermRule,
@@ -298,6 +308,8 @@ class BinaryOpRule(ExpressionRule):
 class UnaryOpRule(ExpressionRule):
     """Rule for unary operations (e.g. negation, logical not)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[LarkToken, ExprTermRule]
 
     @staticmethod
@@ -35,6 +35,8 @@ from hcl2.utils import (
 class ForIntroRule(InlineCommentMixIn):
     """Rule for the intro part of for expressions: 'for key, value in collection :'"""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         FOR,
         Optional[NewLineOrCommentRule],
@@ -109,6 +111,8 @@ class ForIntroRule(InlineCommentMixIn):
 class ForCondRule(InlineCommentMixIn):
     """Rule for the optional condition in for expressions: 'if condition'"""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         IF,
         Optional[NewLineOrCommentRule],
@@ -139,6 +143,8 @@ class ForCondRule(InlineCommentMixIn):
 class ForTupleExprRule(ExpressionRule):
     """Rule for tuple/array for expressions: [for item in items : expression]"""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         LSQB,
         Optional[NewLineOrCommentRule],
@@ -217,6 +223,8 @@ class ForTupleExprRule(ExpressionRule):
 class ForObjectExprRule(ExpressionRule):
     """Rule for object for expressions: {for key, value in items : key => value}"""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         LBRACE,
         Optional[NewLineOrCommentRule],
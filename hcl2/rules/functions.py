@@ -19,6 +19,8 @@ from hcl2.utils import (
 class ArgumentsRule(InlineCommentMixIn):
     """Rule for a comma-separated list of function arguments."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         ExpressionRule,
         Tuple[
@@ -65,6 +67,8 @@ class ArgumentsRule(InlineCommentMixIn):
 class FunctionCallRule(InlineCommentMixIn):
     """Rule for function call expressions (e.g. func(args))."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         IdentifierRule,
         Optional[IdentifierRule],
@@ -29,6 +29,8 @@ from hcl2.utils import (
 class ShortIndexRule(LarkRule):
     """Rule for dot-numeric index access (e.g. .0)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         DOT,
         IntLiteral,
@@ -54,6 +56,8 @@ class ShortIndexRule(LarkRule):
 class SqbIndexRule(InlineCommentMixIn):
     """Rule for square-bracket index access (e.g. [expr])."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         LSQB,
         Optional[NewLineOrCommentRule],
@@ -86,6 +90,8 @@ class SqbIndexRule(InlineCommentMixIn):
 class IndexExprTermRule(ExpressionRule):
     """Rule for index access on an expression term."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[ExprTermRule, SqbIndexRule]
 
     @staticmethod
@@ -109,6 +115,8 @@ class IndexExprTermRule(ExpressionRule):
 class GetAttrRule(LarkRule):
     """Rule for dot-attribute access (e.g. .name)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         DOT,
         IdentifierRule,
@@ -134,6 +142,8 @@ class GetAttrRule(LarkRule):
 class GetAttrExprTermRule(ExpressionRule):
     """Rule for attribute access on an expression term."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         ExprTermRule,
         GetAttrRule,
@@ -170,6 +180,8 @@ class GetAttrExprTermRule(ExpressionRule):
 class AttrSplatRule(LarkRule):
     """Rule for attribute splat expressions (e.g. .*.attr)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         ATTR_SPLAT,
         Tuple[Union[GetAttrRule, Union[SqbIndexRule, ShortIndexRule]], ...],
@@ -199,6 +211,8 @@ class AttrSplatRule(LarkRule):
 class AttrSplatExprTermRule(ExpressionRule):
     """Rule for attribute splat on an expression term."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[ExprTermRule, AttrSplatRule]
 
     @staticmethod
@@ -233,6 +247,8 @@ class AttrSplatExprTermRule(ExpressionRule):
 class FullSplatRule(LarkRule):
     """Rule for full splat expressions (e.g. [*].attr)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         FULL_SPLAT,
         Tuple[Union[GetAttrRule, Union[SqbIndexRule, ShortIndexRule]], ...],
@@ -262,6 +278,8 @@ class FullSplatRule(LarkRule):
 class FullSplatExprTermRule(ExpressionRule):
     """Rule for full splat on an expression term."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[ExprTermRule, FullSplatRule]
 
     @staticmethod
@@ -10,6 +10,8 @@ from hcl2.utils import SerializationOptions, SerializationContext, to_dollar_str
 class TokenRule(LarkRule, ABC):
     """Base rule wrapping a single token child."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[LarkToken]
 
     @property
@@ -27,6 +29,8 @@ class TokenRule(LarkRule, ABC):
 class KeywordRule(TokenRule):
     """Rule for HCL2 keyword literals (true, false, null)."""
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar rule name."""
@@ -36,6 +40,8 @@ class KeywordRule(TokenRule):
 class LiteralValueRule(TokenRule):
     """Rule for HCL2 literal value keywords (true, false, null)."""
 
+    __slots__ = ()
+
     _SERIALIZE_MAP = {"true": True, "false": False, "null": None}
 
     @staticmethod
@@ -56,6 +62,8 @@ class LiteralValueRule(TokenRule):
 class IdentifierRule(TokenRule):
     """Rule for HCL2 identifiers."""
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar rule name."""
@@ -65,6 +73,8 @@ class IdentifierRule(TokenRule):
 class IntLitRule(TokenRule):
     """Rule for integer literal expressions."""
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar rule name."""
@@ -74,6 +84,8 @@ class IntLitRule(TokenRule):
 class FloatLitRule(TokenRule):
     """Rule for floating-point literal expressions."""
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar rule name."""
@@ -100,6 +112,8 @@ class FloatLitRule(TokenRule):
 class BinaryOperatorRule(TokenRule):
     """Rule for binary operator tokens."""
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar rule name."""
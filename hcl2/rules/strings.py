@@ -28,6 +28,8 @@ from hcl2.utils import (
 class InterpolationRule(LarkRule):
     """Rule for ${expression} interpolation within strings."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[
         INTERP_START,
         ExpressionRule,
@@ -55,6 +57,8 @@ class InterpolationRule(LarkRule):
 class StringPartRule(LarkRule):
     """Rule for a single part of a string (literal text, escape, interpolation, or directive)."""
 
+    __slots__ = ()
+
     # Content may be a plain token (STRING_CHARS, ESCAPED_INTERPOLATION,
     # ESCAPED_DIRECTIVE), an InterpolationRule, or a template directive rule
     # (TemplateIfRule, TemplateForRule, and flat variants).  Forward refs are
@@ -83,6 +87,8 @@ class StringPartRule(LarkRule):
 class StringRule(LarkRule):
     """Rule for quoted string literals."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[DBLQUOTE, List[StringPartRule], DBLQUOTE]
 
     @staticmethod
@@ -108,6 +114,8 @@ class StringRule(LarkRule):
 class HeredocTemplateRule(LarkRule):
     """Rule for heredoc template strings (<<MARKER)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[HEREDOC_TEMPLATE]
     _trim_chars = "\n\t "
 
@@ -148,6 +156,8 @@ class HeredocTemplateRule(LarkRule):
 class HeredocTrimTemplateRule(HeredocTemplateRule):
     """Rule for indented heredoc template strings (<<-MARKER)."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[HEREDOC_TRIM_TEMPLATE]
 
     @staticmethod
@@ -197,6 +207,8 @@ class HeredocTrimTemplateRule(HeredocTemplateRule):
 class TemplateStringRule(LarkRule):
     """Rule for escaped-quote-delimited strings in template expressions (\\\"...\\\" )."""
 
+    __slots__ = ()
+
     _children_layout: Tuple[TEMPLATE_STRING]
 
     @staticmethod
@@ -12,6 +12,8 @@ class StringToken(LarkToken):
     cached subclass whose static `lark_name()` yields the given string.
     """
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Overridden by dynamic subclasses created via ``__class_getitem__``."""
@@ -43,10 +45,16 @@ class StringToken(LarkToken):
         """Return str as the conversion callable."""
         return str
 
+    def __reduce__(self):
+        # Dynamic subclasses can't be pickled by reference; rebuild them by name.
+        return _new_string_token, (self.lark_name(),), _slot_state(self)
+
 
 class StaticStringToken(StringToken):
     """A StringToken subclass with a fixed default value set at class-creation time."""
 
+    __slots__ = ()
+
     classes_by_value: Dict[Optional[str], Type["StringToken"]] = {}
 
     @classmethod
@@ -83,6 +91,35 @@ class StaticStringToken(StringToken):
         """Return str as the conversion callable."""
         return str
 
+    def __reduce__(self):
+        return (
+            _new_static_string_token,
+            (self.lark_name(), getattr(self, "_default_value")),
+            _slot_state(self),
+        )
+
+
+def _slot_state(token: LarkToken) -> Tuple[None, Dict[str, Any]]:
+    """Return pickle state for a slotted token: ``(None, {slot: value})``."""
+    return None, {
+        slot: getattr(token, slot)
+        for cls in type(token).__mro__
+        for slot in getattr(cls, "__slots__", ())
+        if hasattr(token, slot)
+    }
+
+
+def _new_string_token(name: str) -> StringToken:
+    """Unpickling helper: create an uninitialized ``StringToken[name]``."""
+    cls = StringToken[name]  # type: ignore
+    return cls.__new__(cls)
+
+
+def _new_static_string_token(name: str, default_value: Optional[str]) -> StringToken:
+    """Unpickling helper: create an uninitialized ``StaticStringToken[...]``."""
+    cls = StaticStringToken[(name, default_value)]  # type: ignore
+    return cls.__new__(cls)
+
 
 # Explicitly define various kinds of string-based tokens for type hinting.
 # mypy cannot follow the dynamic __class_getitem__ pattern, so every alias
@@ -135,6 +172,8 @@ NULL = StaticStringToken[("NULL", "null")]  # type: ignore
 class IntLiteral(LarkToken):
     """Token for integer literal values."""
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar token name."""
@@ -149,6 +188,8 @@ class IntLiteral(LarkToken):
 class FloatLiteral(LarkToken):
     """Token for floating-point literal values."""
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar token name."""
@@ -12,6 +12,8 @@ from hcl2.utils import SerializationOptions, SerializationContext
 class NewLineOrCommentRule(TokenRule):
     """Rule for newline and comment tokens."""
 
+    __slots__ = ()
+
     @staticmethod
     def lark_name() -> str:
         """Return the grammar rule name."""
@@ -42,7 +44,11 @@ class NewLineOrCommentRule(TokenRule):
         self, options: SerializationOptions = SerializationOptions()
     ) -> Optional[List[dict]]:
         """Extract comment objects, or None if only a newline."""
-        raw = self.serialize(options)
+        return self.comments_from_string(self.serialize(options))
+
+    @staticmethod
+    def comments_from_string(raw: str) -> Optional[List[dict]]:
+        """Extract comment objects from a raw comment/newline string."""
         if raw == "\n":
             return None
 
@@ -74,6 +80,8 @@ class NewLineOrCommentRule(TokenRule):
 class InlineCommentMixIn(LarkRule, ABC):
     """Mixin for rules that may contain inline comments among their children."""
 
+    __slots__ = ()
+
     def _insert_optionals(self, children: List, indexes: Optional[List[int]] = None):
         """Insert None placeholders at expected optional-child positions."""
         if indexes is None:
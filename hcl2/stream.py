@@ -0,0 +1,249 @@
+"""Streaming conversion of large HCL2 files, one top-level element at a time.
+
+:func:`hcl2.load` builds the tree of a whole file and then the dict of the
+whole document. :func:`iter_blocks` instead reads the file line by line,
+tracking brackets, strings, comments and heredocs to find where each
+top-level attribute or block ends, and parses, serializes and yields it
+before reading on. Memory use stays bounded by the largest single element::
+
+    with open("huge.tfvars", encoding="utf-8") as f:
+        for element in hcl2.iter_blocks(f):
+            print(json.dumps(element))
+
+:func:`iter_dumps` goes the other way: it deserializes, formats and writes
+out the top-level attributes and blocks of a dict one at a time, yielding
+the HCL2 text of each. ``hcl2.dump(data, file, stream=True)`` writes those
+chunks as they are produced.
+"""
+import re
+from typing import TYPE_CHECKING, Iterator, List, Optional, TextIO
+
+from lark.exceptions import UnexpectedEOF, UnexpectedInput, UnexpectedToken
+
+from hcl2.lazy import _STRING_TOKENS, _relocate_error
+from hcl2.parser import inline_parser
+from hcl2.rules.abstract import LarkElement, NodeMeta
+from hcl2.rules.base import AttributeRule, BlockRule, BodyRule, StartRule
+from hcl2.rules.tokens import NL_OR_COMMENT
+from hcl2.rules.whitespace import NewLineOrCommentRule
+from hcl2.utils import SerializationOptions
+
+if TYPE_CHECKING:
+    from hcl2.deserializer import DeserializerOptions
+    from hcl2.formatter import BaseFormatter, FormatterOptions
+
+# Tokens that matter for finding the end of a statement within one line.
+_LINE_TOKENS = re.compile(
+    r"(?P<comment>#|//)"
+    r"|(?P<block_comment>/\*)"
+    # Same opening as the HEREDOC_TEMPLATE(_TRIM) terminals of the grammar
+    r"|<<-?(?P<heredoc>[a-zA-Z][a-zA-Z0-9._-]+)\n"
+    r'|(?P<quote>")'
+    r"|(?P<open>[{\[(])"
+    r"|(?P<close>[}\])])"
+)
+
+# Start of a line continuing the expression of the line before: a binary
+# operator or QMARK, which the PostLexer merges the newline into (see
+# OPERATOR_TYPES in hcl2/postlexer.py), or the COLON of a conditional.
+_CONTINUATION = re.compile(r"[ \t]*(?:==|!=|<|>|\*|/(?![/*])|%|&&|\|\||\+|\?|:)")
+
+
+def iter_blocks(
+    file: TextIO, serialization_options: Optional[SerializationOptions] = None
+) -> Iterator[dict]:
+    """Yield the top-level attributes and blocks of an HCL2 file one at a time.
+
+    Each yielded dict holds a single element, as :func:`hcl2.load` would put
+    it in the document dict: ``{"name": value}`` for an attribute and
+    ``{"type": [block]}`` for a block. Unless comments are disabled,
+    standalone top-level comments are yielded as ``{"__comments__": [...]}``.
+    Updating one dict with all of them, extending the lists of keys seen
+    before, gives the result of :func:`hcl2.load`.
+
+    Elements before a syntax error are yielded before the error is raised.
+
+    :param file: File-like object to read HCL2 text from.
+    :param serialization_options: Options controlling serialization behavior.
+    """
+    options = serialization_options or SerializationOptions()
+    scanner = _StatementScanner()
+    pending: List[str] = []
+    # Position of the start of the pending text in the file
+    line, pos = 1, 0
+    # False once the pending text has a syntax error no further text can fix
+    may_parse = True
+    # Parsed pending text, held back until the next line shows that it does
+    # not continue on it
+    parsed: Optional[StartRule] = None
+
+    for text in file:
+        if parsed is not None:
+            if not _CONTINUATION.match(text):
+                yield from _serialize_elements(parsed, options)
+                chunk = "".join(pending)
+                line += chunk.count("\n")
+                pos += len(chunk)
+                pending = []
+            parsed = None
+        pending.append(text)
+        if not scanner.feed(text) or not may_parse:
+            continue
+        origin = NodeMeta(line, 1, pos, line, 1, pos)
+        try:
+            parsed = _parse_chunk("".join(pending), origin)
+        except UnexpectedInput as exc:
+            # Keep reading if only the end of the text was unexpected, e.g.
+            # a block header with its brace on the next line
+            may_parse = isinstance(exc, UnexpectedEOF) or (
+                isinstance(exc, UnexpectedToken) and exc.token.type == "$END"
+            )
+
+    if parsed is None and pending:
+        origin = NodeMeta(line, 1, pos, line, 1, pos)
+        parsed = _parse_chunk("".join(pending), origin)
+    if parsed is not None:
+        yield from _serialize_elements(parsed, options)
+
+
+def iter_dumps(
+    data: dict,
+    *,
+    deserializer_options: Optional["DeserializerOptions"] = None,
+    formatter_options: Optional["FormatterOptions"] = None,
+) -> Iterator[str]:
+    """Yield the HCL2 text of a Python dict one top-level element at a time.
+
+    Each attribute or block is deserialized, formatted and reconstructed
+    only when the iterator reaches it, and dropped once its text has been
+    yielded. Joined, the chunks equal :func:`hcl2.dumps` of *data*.
+
+    :param data: Python dict (as produced by :func:`hcl2.load`).
+    :param deserializer_options: Options controlling deserialization behavior.
+    :param formatter_options: Options controlling formatting behavior.
+    """
+    from hcl2.deserializer import BaseDeserializer
+    from hcl2.formatter import BaseFormatter
+    from hcl2.reconstructor import ElementReconstructor
+
+    elements = BaseDeserializer(deserializer_options).iter_python(data)
+    formatter = BaseFormatter(formatter_options)
+    return ElementReconstructor().iter_reconstruct(
+        _formatted_elements(elements, formatter)
+    )
+
+
+def _formatted_elements(
+    elements: Iterator[LarkElement], formatter: "BaseFormatter"
+) -> Iterator[LarkElement]:
+    """Format each top-level element as in a whole document.
+
+    Yields the newlines :meth:`BaseFormatter.format_body_rule` puts between
+    elements as separate rules.
+    """
+    previous = None
+    for element in elements:
+        formatter.format_tree(StartRule([BodyRule([element])]))
+        if previous is not None:
+            # One newline after an attribute, a blank line after a block,
+            # and a blank line before a block
+            count = 1 if isinstance(previous, AttributeRule) else 2
+            if isinstance(element, BlockRule):
+                count += 1
+            yield NewLineOrCommentRule([NL_OR_COMMENT("\n" * count)])
+        yield element
+        previous = element
+
+
+def _parse_chunk(chunk: str, origin: NodeMeta) -> StartRule:
+    """Parse the text of one or more statements starting at *origin*."""
+    try:
+        return inline_parser(False).parse(chunk)  # type: ignore[return-value]
+    except UnexpectedInput as exc:
+        _relocate_error(exc, origin)
+        raise
+
+
+def _serialize_elements(
+    tree: StartRule, options: SerializationOptions
+) -> Iterator[dict]:
+    """Serialize each top-level element of *tree* on its own."""
+    for child in tree.body.children:
+        if isinstance(child, NewLineOrCommentRule):
+            if not options.with_comments or not child.to_list():
+                continue
+        elif not isinstance(child, (AttributeRule, BlockRule)):
+            continue
+        yield BodyRule([child]).serialize(options)
+
+
+class _StatementScanner:
+    """Follows HCL2 text line by line to tell where top-level statements end."""
+
+    def __init__(self):
+        # Bracket depth of each open code context: the document, then each
+        # template interpolation or directive inside a string.
+        self._depths = [0]
+        self._in_string = False
+        self._in_comment = False
+        # Closing marker of the heredoc being read, if any.
+        self._heredoc: Optional[str] = None
+
+    def feed(self, line: str) -> bool:
+        """Scan the next *line*; return True if it ends at the top level."""
+        if self._heredoc is not None:
+            if line.strip() == self._heredoc:
+                self._heredoc = None
+            return self._at_top_level()
+
+        pos = 0
+        while pos < len(line):
+            if self._in_comment:
+                end = line.find("*/", pos)
+                if end < 0:
+                    break
+                self._in_comment = False
+                pos = end + 2
+            elif self._in_string:
+                match = _STRING_TOKENS.search(line, pos)
+                if match is None:
+                    break
+                if match.group("template"):
+                    self._depths.append(0)
+                    self._in_string = False
+                elif match.group("quote"):
+                    self._in_string = False
+                pos = match.end()
+            else:
+                match = _LINE_TOKENS.search(line, pos)
+                if match is None or match.group("comment"):
+                    break
+                pos = match.end()
+                self._code_token(match)
+        return self._at_top_level()
+
+    def _code_token(self, match: "re.Match") -> None:
+        kind = match.lastgroup
+        if kind == "block_comment":
+            self._in_comment = True
+        elif kind == "heredoc":
+            self._heredoc = match.group("heredoc")
+        elif kind == "quote":
+            self._in_string = True
+        elif kind == "open":
+            self._depths[-1] += 1
+        elif self._depths[-1] > 0:
+            self._depths[-1] -= 1
+        elif len(self._depths) > 1:
+            # End of a template interpolation or directive
+            self._depths.pop()
+            self._in_string = True
+        # An unmatched closing bracket is left to the parser to report
+
+    def _at_top_level(self) -> bool:
+        return not (
+            self._in_string
+            or self._in_comment
+            or self._heredoc is not None
+            or self._depths != [0]
+        )
@@ -1,9 +1,12 @@
 """Transform Lark parse trees into typed LarkElement rule trees."""
 
 # pylint: disable=missing-function-docstring,unused-argument
+
 from lark import Token, Tree, v_args, Transformer, Discard
+from lark.exceptions import VisitError
 from lark.tree import Meta
 
+from hcl2.rules.abstract import LarkRule, NodeMeta
 from hcl2.rules.base import (
     StartRule,
     BodyRule,
@@ -23,6 +26,7 @@ from hcl2.rules.expressions import (
     BinaryOpRule,
     ExprTermRule,
     ConditionalRule,
+    ExpressionRule,
 )
 from hcl2.rules.for_expressions import (
     ForTupleExprRule,
@@ -124,6 +128,11 @@ class RuleTransformer(Transformer):
     def start(self, meta: Meta, args) -> StartRule:
         return StartRule(args, meta)
 
+    @v_args(meta=True)
+    def expression_start(self, meta: Meta, args) -> ExpressionRule:
+        # Newlines and comments around a single parsed expression are dropped
+        return next(arg for arg in args if not isinstance(arg, NewLineOrCommentRule))
+
     @v_args(meta=True)
     def body(self, meta: Meta, args) -> BodyRule:
         return BodyRule(args, meta)
@@ -442,3 +451,114 @@ class RuleTransformer(Transformer):
     @v_args(meta=True)
     def template_string(self, meta: Meta, args) -> TemplateStringRule:
         return TemplateStringRule(args, meta)
+
+
+class InlineRuleTransformer:
+    """Runs a :class:`RuleTransformer` inside Lark's LALR reductions.
+
+    Passed as the ``transformer`` option of a :class:`lark.Lark` instance, so
+    each rule is built as soon as the parser reduces it and no intermediate
+    ``lark.Tree`` is allocated. Node positions are computed from the children
+    the same way ``propagate_positions`` computes them for a parse tree, so
+    the resulting :class:`StartRule` is identical to the one produced by
+    running ``RuleTransformer.transform`` over the output of a plain parser.
+
+    Terminals are deliberately not exposed as callbacks: tokens reach the rule
+    callbacks unconverted, which keeps their positions available.
+    """
+
+    def __init__(self, transformer: RuleTransformer):
+        self._transformer = transformer
+
+    def __getattr__(self, name: str):
+        # Lark looks up one callback per rule name; only the RuleTransformer
+        # rule methods (wrapped by v_args) are exposed. Unknown names, such as
+        # inlined `_rules`, fall back to Lark's default tree builder.
+        method = None
+        if not name.startswith("_"):
+            method = getattr(self._transformer, name, None)
+        if getattr(method, "visit_wrapper", None) is None:
+            raise AttributeError(name)
+        callback = self._make_callback(name, method)
+        setattr(self, name, callback)
+        return callback
+
+    def _make_callback(self, name: str, method):
+        convert_token = self._convert_token
+
+        def callback(children):
+            meta = _meta_from_children(children)
+            args = [
+                convert_token(child) if isinstance(child, Token) else child
+                for child in children
+                if not isinstance(child, _Discarded)
+            ]
+            try:
+                result = method(meta, args)
+            except Exception as exc:
+                raise VisitError(name, Tree(name, args, meta), exc) from exc
+            if result is Discard:
+                # Keep the position so the parent's span still covers it.
+                return _Discarded(meta)
+            return result
+
+        return callback
+
+    def _convert_token(self, token: Token):
+        try:
+            convert = getattr(self._transformer, token.type)
+        except AttributeError:
+            return self._transformer.__default_token__(token)
+        try:
+            return convert(token)
+        except Exception as exc:
+            raise VisitError(token.type, token, exc) from exc
+
+
+class _Discarded:
+    """Placeholder for a rule discarded by the transformer, carrying its position."""
+
+    __slots__ = ("meta",)
+
+    def __init__(self, meta: NodeMeta):
+        self.meta = meta
+
+
+def _child_position(child):
+    """Return the position-carrying object of *child*, or None if it has none."""
+    if isinstance(child, Token):
+        return child
+    if isinstance(child, LarkRule):
+        meta = child._meta  # pylint: disable=protected-access
+    elif isinstance(child, (_Discarded, Tree)):
+        meta = child.meta
+    else:
+        return None
+    return None if meta.empty else meta
+
+
+def _first_position(children):
+    for child in children:
+        position = _child_position(child)
+        if position is not None:
+            return position
+    return None
+
+
+def _meta_from_children(children) -> NodeMeta:
+    """Compute the span of a node from its children.
+
+    Mirrors ``lark.parse_tree_builder.PropagatePositions``.
+    """
+    meta = NodeMeta()
+    first = _first_position(children)
+    if first is not None:
+        meta.line = first.line
+        meta.column = first.column
+        meta.start_pos = first.start_pos
+    last = _first_position(reversed(children))
+    if last is not None:
+        meta.end_line = last.end_line
+        meta.end_column = last.end_column
+        meta.end_pos = last.end_pos
+    return meta
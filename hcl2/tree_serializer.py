@@ -0,0 +1,510 @@
+"""Serialize raw Lark parse trees directly to Python dicts.
+
+:class:`TreeSerializer` produces the same output as
+``RuleTransformer().transform(tree).serialize(options)`` without building the
+LarkElement tree, which makes it the fast path behind :func:`hcl2.api.loads`.
+Every method here mirrors the ``serialize`` method of the rule class named in
+its docstring; keep them in sync when changing serialization.
+
+Rarely used constructs (template directives, heredocs) are handed over to the
+rule classes, so their serialization logic lives in one place only.
+"""
+# pylint: disable=unused-argument
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from lark import Token, Tree
+
+from hcl2.const import IS_BLOCK, INLINE_COMMENTS_KEY
+from hcl2.rules.strings import HeredocTemplateRule, HeredocTrimTemplateRule
+from hcl2.rules.tokens import HEREDOC_TEMPLATE, HEREDOC_TRIM_TEMPLATE
+from hcl2.rules.whitespace import NewLineOrCommentRule
+from hcl2.transformer import RuleTransformer
+from hcl2.utils import (
+    SerializationOptions,
+    SerializationContext,
+    to_dollar_string,
+    wrap_into_parentheses,
+)
+
+_NL = "new_line_or_comment"
+_LITERAL_VALUES = {"true": True, "false": False, "null": None}
+_DIRECTIVES = frozenset(
+    {
+        "template_if_start",
+        "template_else",
+        "template_endif",
+        "template_for_start",
+        "template_endfor",
+    }
+)
+# Rules backed by an InlineCommentMixIn subclass; only these are searched
+# for inline comments.
+_COMMENT_CONTAINERS = frozenset(
+    {
+        "expr_term",
+        "conditional",
+        "binary_term",
+        "binary_op",
+        "unary_op",
+        "index_expr_term",
+        "get_attr_expr_term",
+        "attr_splat_expr_term",
+        "full_splat_expr_term",
+        "for_tuple_expr",
+        "for_object_expr",
+        "tuple",
+        "object",
+        "braces_index",
+        "arguments",
+        "function_call",
+        "for_intro",
+        "for_cond",
+    }
+)
+
+
+def _subtrees(tree: Tree) -> List[Tree]:
+    """Return the rule children of *tree*, skipping tokens and comments."""
+    return [
+        child
+        for child in tree.children
+        if isinstance(child, Tree) and child.data != _NL
+    ]
+
+
+def _raw(tree: Tree) -> str:
+    """Return the source text of a ``new_line_or_comment`` tree."""
+    return "".join(str(token) for token in tree.children)
+
+
+def _token_value(tree: Tree) -> str:
+    """Return the value of the single token of a token rule."""
+    return str(tree.children[0])
+
+
+class TreeSerializer:
+    """Serialize a ``lark.Tree`` from :func:`hcl2.api.parses_to_tree` to a dict.
+
+    All :class:`SerializationOptions` are supported except
+    ``force_operation_parentheses``, which needs parent links only the
+    LarkElement tree has; see :meth:`supports`.
+    """
+
+    def __init__(self, options: Optional[SerializationOptions] = None):
+        self.options = options or SerializationOptions()
+        if not self.supports(self.options):
+            raise ValueError(
+                "TreeSerializer does not support force_operation_parentheses"
+            )
+        self._expressions: Dict[str, Callable[[Tree, bool], Any]] = {
+            "expr_term": self._expr_term,
+            "conditional": self._conditional,
+            "binary_op": self._binary_op,
+            "unary_op": self._unary_op,
+            "identifier": self._identifier,
+            "literal_value": self._literal_value,
+            "int_lit": self._int_lit,
+            "float_lit": self._float_lit,
+            "string": self._string,
+            "template_string": self._template_string,
+            "heredoc_template": self._heredoc,
+            "heredoc_template_trim": self._heredoc,
+            "tuple": self._tuple,
+            "object": self._object,
+            "function_call": self._function_call,
+            "index_expr_term": self._accessor_expr_term,
+            "get_attr_expr_term": self._accessor_expr_term,
+            "attr_splat_expr_term": self._accessor_expr_term,
+            "full_splat_expr_term": self._accessor_expr_term,
+            "for_tuple_expr": self._for_tuple_expr,
+            "for_object_expr": self._for_object_expr,
+        }
+        self._accessors: Dict[str, Callable[[Tree], str]] = {
+            "braces_index": self._braces_index,
+            "short_index": self._short_index,
+            "get_attr": self._get_attr,
+            "attr_splat": self._splat,
+            "full_splat": self._splat,
+        }
+
+    @staticmethod
+    def supports(options: SerializationOptions) -> bool:
+        """Return True if *options* can be honored by this serializer."""
+        return not options.force_operation_parentheses
+
+    def serialize(self, tree: Tree) -> dict:
+        """Serialize a ``start`` tree; mirrors ``StartRule.serialize``."""
+        return self._body(tree.children[0])
+
+    # -- structure ---------------------------------------------------------
+
+    def _body(self, tree: Tree) -> dict:
+        """Mirrors ``BodyRule.serialize``."""
+        with_comments = self.options.with_comments
+        attribute_names = set()
+        comments: List[dict] = []
+        inline_comments: List[dict] = []
+
+        result: Dict[str, Any] = defaultdict(list)
+
+        for child in tree.children:
+            if child.data == "block":
+                name = _token_value(child.children[0])
+                if name in attribute_names:
+                    raise RuntimeError(f"Attribute {name} is already defined.")
+                result[name].append(self._block(child))
+
+            elif child.data == "attribute":
+                name = _token_value(child.children[0])
+                expression = child.children[2]
+                attribute_names.add(name)
+                result.update({name: self._expression(expression, False)})
+                if with_comments:
+                    inline_comments.extend(self._inline_comments(expression))
+                    comments.extend(self._absorbed_comments(expression))
+
+            elif with_comments:
+                child_comments = NewLineOrCommentRule.comments_from_string(_raw(child))
+                if child_comments:
+                    comments.extend(child_comments)
+
+        if with_comments:
+            if comments:
+                result["__comments__"] = comments
+            if inline_comments:
+                result[INLINE_COMMENTS_KEY] = inline_comments
+
+        return dict(result.items())
+
+    def _block(self, tree: Tree) -> dict:
+        """Mirrors ``BlockRule.serialize``."""
+        *labels, body = [child for child in tree.children if isinstance(child, Tree)]
+        result = self._body(body)
+        if self.options.explicit_blocks:
+            result.update({IS_BLOCK: True})
+
+        for label in reversed(labels[1:]):
+            if label.data == "string":
+                key = self._string(label, False)
+            elif label.data == _NL:
+                key = _raw(label)
+            else:
+                key = _token_value(label)
+            result = {key: result}
+
+        return result
+
+    # -- comments ----------------------------------------------------------
+
+    def _inline_comments(self, tree: Tree) -> List[dict]:
+        """Mirrors ``InlineCommentMixIn.inline_comments``."""
+        if tree.data not in _COMMENT_CONTAINERS:
+            return []
+        trailing = None
+        if tree.data == "binary_op" and len(tree.children) == 3:
+            # BinaryOpRule: a trailing comment on its own line belongs to the body
+            trailing = tree.children[2]
+        result = []
+        for child in tree.children:
+            if not isinstance(child, Tree):
+                continue
+            if child.data == _NL:
+                raw = _raw(child)
+                if child is trailing and raw.startswith("\n"):
+                    continue
+                comments = NewLineOrCommentRule.comments_from_string(raw)
+                if comments is not None:
+                    result.extend(comments)
+            else:
+                result.extend(self._inline_comments(child))
+        return result
+
+    @staticmethod
+    def _absorbed_comments(tree: Tree) -> List[dict]:
+        """Mirrors ``BinaryOpRule.absorbed_comments``."""
+        if tree.data == "binary_op" and len(tree.children) == 3:
+            raw = _raw(tree.children[2])
+            if raw.startswith("\n"):
+                return NewLineOrCommentRule.comments_from_string(raw) or []
+        return []
+
+    # -- expressions -------------------------------------------------------
+    # ``dollar`` mirrors SerializationContext.inside_dollar_string.
+
+    def _expression(self, tree: Tree, dollar: bool) -> Any:
+        return self._expressions[tree.data](tree, dollar)
+
+    def _expr_term(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``ExprTermRule.serialize``."""
+        children = tree.children
+        if len(children) == 1:
+            return self._expression(children[0], dollar)
+        result = self._expression(_subtrees(tree)[0], dollar)
+        result = wrap_into_parentheses(result)
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _conditional(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``ConditionalRule.serialize``."""
+        condition, if_true, if_false = _subtrees(tree)
+        result = (
+            f"{self._expression(condition, True)} "
+            f"? {self._expression(if_true, True)} "
+            f": {self._expression(if_false, True)}"
+        )
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _binary_op(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``BinaryOpRule.serialize``."""
+        lhs_tree, binary_term = tree.children[:2]
+        operator_tree, rhs_tree = _subtrees(binary_term)
+        lhs = self._expression(lhs_tree, True)
+        # The postlexer may have merged a preceding newline into the operator
+        operator = _token_value(operator_tree).strip()
+        rhs = self._expression(rhs_tree, True)
+        result = f"{lhs} {operator} {rhs}"
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _unary_op(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``UnaryOpRule.serialize``."""
+        operator, operand = tree.children
+        result = f"{str(operator).rstrip()}{self._expression(operand, True)}"
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    @staticmethod
+    def _identifier(tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``IdentifierRule.serialize``."""
+        return _token_value(tree)
+
+    @staticmethod
+    def _literal_value(tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``LiteralValueRule.serialize``."""
+        value = _token_value(tree)
+        if dollar:
+            return value
+        return _LITERAL_VALUES.get(value, value)
+
+    @staticmethod
+    def _int_lit(tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``IntLitRule.serialize``."""
+        return int(_token_value(tree))
+
+    def _float_lit(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``FloatLitRule.serialize``."""
+        value = _token_value(tree)
+        if self.options.preserve_scientific_notation and "e" in value.lower():
+            if dollar:
+                return value
+            return to_dollar_string(value)
+        return float(value)
+
+    def _string(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``StringRule.serialize``."""
+        parts = []
+        for part in tree.children[1:-1]:
+            content = part.children[0]
+            if isinstance(content, Token):
+                parts.append(str(content))
+            elif content.data == "interpolation":
+                expression = content.children[1]
+                parts.append(to_dollar_string(self._expression(expression, True)))
+            elif content.data in _DIRECTIVES:
+                # Directives are assembled into nested rules by the transformer
+                return self._serialize_rule(tree, dollar)
+        inner = "".join(parts)
+        if self.options.strip_string_quotes:
+            return inner
+        return '"' + inner + '"'
+
+    def _template_string(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``TemplateStringRule.serialize``."""
+        raw = _token_value(tree)
+        if self.options.strip_string_quotes:
+            if raw.startswith('\\"') and raw.endswith('\\"'):
+                return raw[2:-2]
+        return raw
+
+    def _heredoc(self, tree: Tree, dollar: bool) -> Any:
+        """Delegates to ``HeredocTemplateRule.serialize``."""
+        value = _token_value(tree)
+        if tree.data == "heredoc_template":
+            rule = HeredocTemplateRule([HEREDOC_TEMPLATE(value)])
+        else:
+            rule = HeredocTrimTemplateRule([HEREDOC_TRIM_TEMPLATE(value)])
+        return rule.serialize(self.options)
+
+    def _serialize_rule(self, tree: Tree, dollar: bool) -> Any:
+        """Serialize *tree* through the LarkElement rule classes."""
+        rule = RuleTransformer().transform(tree)
+        return rule.serialize(
+            self.options, SerializationContext(inside_dollar_string=dollar)
+        )
+
+    def _tuple(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``TupleRule.serialize``."""
+        elements = _subtrees(tree)
+        if not self.options.wrap_tuples and not dollar:
+            return [self._expression(element, dollar) for element in elements]
+
+        result = "["
+        result += ", ".join(
+            str(self._expression(element, True)) for element in elements
+        )
+        result += "]"
+
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _object(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``ObjectRule.serialize`` and ``ObjectElemRule.serialize``."""
+        elements = [element.children for element in _subtrees(tree)]
+        if not self.options.wrap_objects and not dollar:
+            return {
+                self._object_key(key, dollar): self._expression(value, dollar)
+                for key, _, value in elements
+            }
+
+        result = "{"
+        result += ", ".join(
+            f"{self._object_key(key, True)} = {self._expression(value, True)}"
+            for key, _, value in elements
+        )
+        result += "}"
+
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _object_key(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``ObjectElemKeyRule`` and ``ObjectElemKeyExpressionRule``."""
+        expression = tree.children[0]
+        if expression.data == "expr_term" and len(expression.children) == 1:
+            inner = expression.children[0]
+            if inner.data in ("identifier", "literal_value"):
+                return _token_value(inner)
+            if inner.data in ("string", "int_lit", "float_lit"):
+                result = self._expression(inner, dollar)
+                # Object keys must be strings for JSON compatibility
+                if isinstance(result, (int, float)):
+                    result = str(result)
+                return result
+
+        result = str(self._expression(expression, True))
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _function_call(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``FunctionCallRule.serialize`` and ``ArgumentsRule.serialize``."""
+        names = []
+        args_str = ""
+        for child in _subtrees(tree):
+            if child.data == "identifier":
+                names.append(_token_value(child))
+                continue
+            args_str = ", ".join(
+                str(self._expression(argument, True)) for argument in _subtrees(child)
+            )
+            if any(
+                isinstance(token, Token) and token.type == "ELLIPSIS"
+                for token in child.children[-2:]
+            ):
+                args_str += " ..."
+        result = f"{'::'.join(names)}({args_str})"
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _accessor_expr_term(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``IndexExprTermRule`` and the other ``*ExprTermRule`` accessors."""
+        expression, accessor = tree.children
+        result = (
+            f"{self._expression(expression, True)}"
+            f"{self._accessors[accessor.data](accessor)}"
+        )
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _braces_index(self, tree: Tree) -> str:
+        """Mirrors ``SqbIndexRule.serialize``."""
+        return f"[{self._expression(_subtrees(tree)[0], True)}]"
+
+    @staticmethod
+    def _short_index(tree: Tree) -> str:
+        """Mirrors ``ShortIndexRule.serialize``."""
+        return f".{int(str(tree.children[1]))}"
+
+    @staticmethod
+    def _get_attr(tree: Tree) -> str:
+        """Mirrors ``GetAttrRule.serialize``."""
+        return f".{_token_value(tree.children[1])}"
+
+    def _splat(self, tree: Tree) -> str:
+        """Mirrors ``AttrSplatRule.serialize`` and ``FullSplatRule.serialize``."""
+        return str(tree.children[0]) + "".join(
+            self._accessors[accessor.data](accessor) for accessor in tree.children[1:]
+        )
+
+    def _for_intro(self, tree: Tree) -> str:
+        """Mirrors ``ForIntroRule.serialize``."""
+        *identifiers, iterable = _subtrees(tree)
+        result = f"for {_token_value(identifiers[0])}"
+        if len(identifiers) == 2:
+            result += f", {_token_value(identifiers[1])}"
+        result += f" in {self._expression(iterable, True)} : "
+        return result
+
+    def _for_cond(self, tree: Tree) -> str:
+        """Mirrors ``ForCondRule.serialize``."""
+        return f"if {self._expression(_subtrees(tree)[0], True)}"
+
+    def _for_parts(self, tree: Tree):
+        intro = condition = None
+        expressions = []
+        for child in _subtrees(tree):
+            if child.data == "for_intro":
+                intro = child
+            elif child.data == "for_cond":
+                condition = child
+            else:
+                expressions.append(child)
+        return intro, expressions, condition
+
+    def _for_tuple_expr(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``ForTupleExprRule.serialize``."""
+        intro, (value,), condition = self._for_parts(tree)
+        result = "[" + self._for_intro(intro) + self._expression(value, True)
+        if condition is not None:
+            result += f" {self._for_cond(condition)}"
+        result += "]"
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
+
+    def _for_object_expr(self, tree: Tree, dollar: bool) -> Any:
+        """Mirrors ``ForObjectExprRule.serialize``."""
+        intro, (key, value), condition = self._for_parts(tree)
+        result = "{" + self._for_intro(intro)
+        result += f"{self._expression(key, True)} => "
+        result += self._expression(value, True)
+        if any(
+            isinstance(token, Token) and token.type == "ELLIPSIS"
+            for token in tree.children
+        ):
+            result += "..."
+        if condition is not None:
+            result += f" {self._for_cond(condition)}"
+        result += "}"
+        if not dollar:
+            result = to_dollar_string(result)
+        return result
@@ -0,0 +1,28 @@
+"""Build hook generating the precomputed parser tables (``hcl2/lark_parser.py``).
+
+Project metadata lives in pyproject.toml.
+"""
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithParserTables(build_py):
+    """Build the package, adding the LALR tables of its grammar."""
+
+    def run(self):
+        super().run()
+        # Loaded on its own: the rest of the package needs its runtime dependencies
+        spec = spec_from_file_location(
+            "_hcl2_parser", Path(__file__).parent / "hcl2" / "parser.py"
+        )
+        parser_module = module_from_spec(spec)
+        spec.loader.exec_module(parser_module)
+        target = Path(self.build_lib) / "hcl2" / "lark_parser.py"
+        self.announce(f"generating {target}", level=2)
+        parser_module.write_tables_module(target)
+
+
+setup(cmdclass={"build_py": BuildPyWithParserTables})
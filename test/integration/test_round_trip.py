@@ -17,11 +17,15 @@ from pathlib import Path
 from typing import List
 from unittest import TestCase
 
-from hcl2.api import parses_to_tree
+from hcl2.api import loads, parses, parses_to_tree
 from hcl2.deserializer import BaseDeserializer
 from hcl2.formatter import BaseFormatter
-from hcl2.reconstructor import HCLReconstructor
+from hcl2.reconstructor import ElementReconstructor, HCLReconstructor
+from hcl2.stream import iter_dumps
 from hcl2.transformer import RuleTransformer
+from hcl2.tree_serializer import TreeSerializer
+from hcl2.utils import SerializationOptions
+from hcl2.walk import walk
 
 INTEGRATION_DIR = Path(__file__).absolute().parent
 HCL2_ORIGINAL_DIR = INTEGRATION_DIR / "hcl2_original"
@@ -155,6 +159,76 @@ class TestDirectReconstruction(TestCase):
                 )
 
 
+class TestInlineTransform(TestCase):
+    """Test that parsing with the embedded transformer matches the two-pass pipeline.
+
+    ``parses`` builds the IR during parsing; the result must be identical to
+    transforming the raw Lark tree, including node positions.
+    """
+
+    maxDiff = None
+
+    @staticmethod
+    def _positions(tree) -> list:
+        return [
+            (type(node).__name__, node._meta)  # pylint: disable=W0212
+            for node in walk(tree)
+            if hasattr(node, "_meta")
+        ]
+
+    def test_inline_matches_two_pass(self):
+        for suite in _get_suites():
+            for discard_comments in (False, True):
+                with self.subTest(suite=suite, discard_comments=discard_comments):
+                    hcl_text = _get_suite_file(suite, SuiteStep.ORIGINAL).read_text()
+                    expected = RuleTransformer(
+                        discard_new_line_or_comments=discard_comments
+                    ).transform(parses_to_tree(hcl_text))
+                    actual = parses(hcl_text, discard_comments=discard_comments)
+
+                    self.assertEqual(actual.serialize(), expected.serialize())
+                    self.assertEqual(actual.to_lark(), expected.to_lark())
+                    self.assertEqual(self._positions(actual), self._positions(expected))
+
+
+class TestTreeSerializer(TestCase):
+    """Test that serializing the raw Lark tree matches serializing the IR byte for byte."""
+
+    maxDiff = None
+
+    OPTIONS = [
+        SerializationOptions(),
+        SerializationOptions(with_comments=False, explicit_blocks=False),
+        SerializationOptions(wrap_objects=True, wrap_tuples=True),
+        SerializationOptions(
+            preserve_heredocs=False,
+            preserve_scientific_notation=False,
+            strip_string_quotes=True,
+        ),
+    ]
+
+    def test_loads_matches_rule_serialization(self):
+        for suite in _get_suites():
+            with self.subTest(suite=suite):
+                hcl_text = _get_suite_file(suite, SuiteStep.ORIGINAL).read_text()
+                self.assertEqual(
+                    json.dumps(loads(hcl_text)),
+                    json.dumps(_parse_and_serialize(hcl_text)),
+                )
+
+    def test_options_match_rule_serialization(self):
+        for suite in _get_suites():
+            hcl_text = _get_suite_file(suite, SuiteStep.ORIGINAL).read_text()
+            lark_tree = parses_to_tree(hcl_text)
+            rules = RuleTransformer().transform(lark_tree)
+            for options in self.OPTIONS:
+                with self.subTest(suite=suite, options=options):
+                    self.assertEqual(
+                        json.dumps(TreeSerializer(options).serialize(lark_tree)),
+                        json.dumps(rules.serialize(options=options)),
+                    )
+
+
 class TestRoundTripReserialization(TestCase):
     """Test JSON → JSON reserialization.
 
@@ -206,6 +280,17 @@ class TestRoundTripReconstruction(TestCase):
                     f"HCL reconstruction mismatch for suite {suite}",
                 )
 
+    def test_streamed_json_to_hcl(self):
+        for suite in _get_suites():
+            with self.subTest(suite=suite):
+                hcl_path = _get_suite_file(suite, SuiteStep.ORIGINAL)
+                hcl_reconstructed_path = _get_suite_file(suite, SuiteStep.RECONSTRUCTED)
+
+                serialized = _parse_and_serialize(hcl_path.read_text())
+                actual = "".join(iter_dumps(serialized))
+
+                self.assertMultiLineEqual(actual, hcl_reconstructed_path.read_text())
+
 
 class TestRoundTripFull(TestCase):
     """Test full round-trip: HCL → JSON → HCL → JSON should produce matching JSON."""
@@ -233,3 +318,40 @@ class TestRoundTripFull(TestCase):
                     f"Full round-trip mismatch for suite {suite}: "
                     f"HCL → JSON → HCL → JSON did not produce identical JSON",
                 )
+
+
+class TestElementReconstruction(TestCase):
+    """Test that reconstructing the IR directly matches reconstructing its Lark tree.
+
+    ``ElementReconstructor`` walks the LarkElement tree without calling
+    ``to_lark()``; its output must be identical to ``HCLReconstructor``'s,
+    for whole documents and for every subtree reconstructed as a fragment.
+    """
+
+    maxDiff = None
+
+    def _trees(self, suite):
+        hcl_text = _get_suite_file(suite, SuiteStep.ORIGINAL).read_text()
+        parsed = parses(hcl_text)
+        deserialized = BaseDeserializer().load_python(_parse_and_serialize(hcl_text))
+        BaseFormatter().format_tree(deserialized)
+        return {"parsed": parsed, "deserialized": deserialized}
+
+    def test_documents(self):
+        for suite in _get_suites():
+            for kind, tree in self._trees(suite).items():
+                with self.subTest(suite=suite, tree=kind):
+                    self.assertMultiLineEqual(
+                        ElementReconstructor().reconstruct(tree),
+                        HCLReconstructor().reconstruct(tree.to_lark()),
+                    )
+
+    def test_fragments(self):
+        for suite in _get_suites():
+            for kind, tree in self._trees(suite).items():
+                with self.subTest(suite=suite, tree=kind):
+                    for node in walk(tree):
+                        self.assertEqual(
+                            ElementReconstructor().reconstruct_fragment(node),
+                            HCLReconstructor().reconstruct_fragment(node),
+                        )
@@ -0,0 +1,18 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+from unittest import TestCase
+
+from bench.lexer import LEXER_CORPORA, run_lexer
+
+
+class TestLexer(TestCase):
+    def test_reports_lexer_time_per_corpus(self):
+        result = run_lexer(repeat=1, corpora=["comments"])
+        self.assertEqual(list(result), ["comments"])
+        metrics = result["comments"]
+        self.assertGreater(metrics["tokens"], 0)
+        self.assertGreater(metrics["best_s"], 0)
+        self.assertGreater(metrics["mb_per_s"], 0)
+        self.assertGreaterEqual(metrics["postlex_ns_per_token"], 0)
+
+    def test_default_corpora(self):
+        self.assertEqual(list(run_lexer(repeat=1)), list(LEXER_CORPORA))
@@ -0,0 +1,73 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import tracemalloc
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+import hcl2
+from bench.corpus import GENERATORS, build_corpus
+from bench.runner import compare, run_benchmarks
+from bench.stages import STAGES
+
+
+class TestCorpus(TestCase):
+    def test_generators_are_deterministic(self):
+        self.assertEqual(build_corpus(1), build_corpus(1))
+
+    def test_every_corpus_file_parses(self):
+        for name, text in build_corpus(1).items():
+            with self.subTest(corpus=name):
+                self.assertIsInstance(hcl2.loads(text), dict)
+
+
+class TestRunner(TestCase):
+    def test_run_benchmarks_reports_every_stage(self):
+        result = run_benchmarks(repeat=1, corpora=["small"])
+        self.assertEqual(set(result["results"]), {"small"})
+        self.assertEqual(set(result["results"]["small"]), set(STAGES))
+        for metrics in result["results"]["small"].values():
+            self.assertGreater(metrics["nodes"], 0)
+            self.assertGreater(metrics["best_s"], 0)
+            self.assertGreater(metrics["mb_per_s"], 0)
+            self.assertGreater(metrics["nodes_per_s"], 0)
+            self.assertGreater(metrics["peak_memory_bytes"], 0)
+            self.assertGreaterEqual(metrics["retained_memory_bytes"], 0)
+        self.assertIn("hcl2_version", result["metadata"])
+
+    def test_retained_memory_of_tree_stages(self):
+        result = run_benchmarks(repeat=1, stages=["parses"], corpora=["small"])
+        metrics = result["results"]["small"]["parses"]
+        self.assertGreater(metrics["retained_memory_bytes"], 0)
+        self.assertAlmostEqual(
+            metrics["retained_bytes_per_node"],
+            metrics["retained_memory_bytes"] / metrics["nodes"],
+        )
+
+    def test_memory_without_reset_peak(self):
+        # Python 3.8's tracemalloc has no reset_peak
+        names = ("start", "stop", "get_traced_memory")
+        legacy = SimpleNamespace(**{name: getattr(tracemalloc, name) for name in names})
+        with patch("bench.runner.tracemalloc", legacy):
+            result = run_benchmarks(repeat=1, stages=["parses"], corpora=["small"])
+        metrics = result["results"]["small"]["parses"]
+        self.assertGreater(metrics["peak_memory_bytes"], 0)
+        self.assertGreater(metrics["retained_memory_bytes"], 0)
+
+    def test_stage_and_corpus_selection(self):
+        result = run_benchmarks(repeat=1, stages=["serialize"], corpora=["small"])
+        self.assertEqual(list(result["results"]["small"]), ["serialize"])
+
+    def test_compare_ratio(self):
+        baseline = {"results": {"small": {"serialize": {"best_s": 2.0}}}}
+        current = {
+            "results": {
+                "small": {"serialize": {"best_s": 3.0}, "transform": {"best_s": 1.0}}
+            }
+        }
+        rows = compare(baseline, current)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["stage"], "serialize")
+        self.assertAlmostEqual(rows[0]["ratio"], 1.5)
+
+    def test_all_corpus_generators_registered(self):
+        self.assertEqual(set(build_corpus(1)), set(GENERATORS))
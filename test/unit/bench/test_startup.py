@@ -0,0 +1,17 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+from unittest import TestCase
+
+from bench.startup import MODES, SNIPPET, measure_startup
+
+
+class TestStartup(TestCase):
+    def test_measure_startup(self):
+        metrics = measure_startup("pass", repeat=2)
+        self.assertEqual(metrics["repeat"], 2)
+        self.assertGreater(metrics["best_s"], 0)
+        self.assertGreaterEqual(metrics["median_s"], metrics["best_s"])
+
+    def test_every_mode_runs_the_snippet(self):
+        for mode, code in MODES.items():
+            with self.subTest(mode=mode):
+                self.assertTrue(code.endswith(SNIPPET))
@@ -373,6 +373,51 @@ class TestHclToJsonFlags(TestCase):
         self.assertNotEqual(default, forced)
         self.assertIn("(", forced["x"])
 
+    def test_timings_flag(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            hcl_path = os.path.join(tmpdir, "test.tf")
+            _write_file(hcl_path, SIMPLE_HCL)
+
+            stdout = StringIO()
+            stderr = StringIO()
+            with patch("sys.argv", ["hcl2tojson", "--timings", hcl_path]):
+                with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+                    main()
+
+            self.assertEqual(json.loads(stdout.getvalue()), SIMPLE_JSON_DICT)
+            self.assertIn(f"{hcl_path}: total ", stderr.getvalue())
+            for stage in ("lex", "postlex", "parse", "serialize"):
+                self.assertIn(stage, stderr.getvalue())
+
+    def test_timings_flag_ndjson(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for name in ("a.tf", "b.tf"):
+                path = os.path.join(tmpdir, name)
+                _write_file(path, SIMPLE_HCL)
+                paths.append(path)
+
+            stdout = StringIO()
+            stderr = StringIO()
+            argv = ["hcl2tojson", "--ndjson", "--timings", "-q"] + paths
+            with patch("sys.argv", argv):
+                with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+                    main()
+
+            self.assertEqual(len(stdout.getvalue().splitlines()), 2)
+            for path in paths:
+                self.assertIn(f"{path}: total ", stderr.getvalue())
+
+    def test_cache_dir_flag(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = os.path.join(tmpdir, "cache")
+            first = self._run_hcl_to_json(SIMPLE_HCL, ["--cache-dir", cache_dir])
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            with patch("hcl2.api._get_parser", side_effect=AssertionError("parsed")):
+                second = self._run_hcl_to_json(SIMPLE_HCL, ["--cache-dir", cache_dir])
+            self.assertEqual(first, SIMPLE_JSON_DICT)
+            self.assertEqual(second, SIMPLE_JSON_DICT)
+
     def test_no_preserve_scientific_flag(self):
         hcl = "x = 1e10\n"
         default = self._run_hcl_to_json(hcl)
@@ -876,3 +921,80 @@ class TestNdjsonStdin(TestCase):
 
             # No successful output
             self.assertEqual(stdout.getvalue().strip(), "")
+
+
+class TestJobs(TestCase):
+    def _make_dir(self, tmpdir, count=6):
+        in_dir = os.path.join(tmpdir, "input")
+        os.mkdir(in_dir)
+        for i in range(count):
+            _write_file(os.path.join(in_dir, f"f{i}.tf"), f"x{i} = {i}\n")
+        return in_dir
+
+    def _ndjson(self, argv):
+        stdout = StringIO()
+        argv = ["hcl2tojson", "--ndjson", "-q", *argv]
+        with patch("sys.argv", argv), patch("sys.stdout", stdout):
+            main()
+        return stdout.getvalue().splitlines()
+
+    def test_ndjson_parallel_matches_serial_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = self._make_dir(tmpdir)
+            parallel = self._ndjson(["--jobs", "3", in_dir])
+            self.assertEqual(parallel, self._ndjson([in_dir]))
+
+    def test_ndjson_unordered(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = self._make_dir(tmpdir)
+            unordered = self._ndjson(["-j", "3", "--unordered", in_dir])
+            self.assertEqual(sorted(unordered), sorted(self._ndjson([in_dir])))
+
+    def test_ndjson_parallel_skip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = self._make_dir(tmpdir, count=3)
+            _write_file(os.path.join(in_dir, "bad.tf"), "this is {{{{ not valid")
+
+            stdout = StringIO()
+            argv = ["hcl2tojson", "--ndjson", "-q", "-s", "-j", "2", in_dir]
+            with patch("sys.argv", argv), patch("sys.stdout", stdout):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+
+            self.assertEqual(cm.exception.code, EXIT_PARTIAL)
+            self.assertEqual(len(stdout.getvalue().splitlines()), 3)
+
+    def test_ndjson_parallel_parse_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = self._make_dir(tmpdir, count=3)
+            _write_file(os.path.join(in_dir, "bad.tf"), "this is {{{{ not valid")
+
+            stderr = StringIO()
+            argv = ["hcl2tojson", "--ndjson", "-q", "-j", "2", in_dir]
+            with patch("sys.argv", argv), patch("sys.stdout", StringIO()):
+                with patch("sys.stderr", stderr):
+                    with self.assertRaises(SystemExit) as cm:
+                        main()
+
+            self.assertEqual(cm.exception.code, EXIT_PARSE_ERROR)
+            error = json.loads(stderr.getvalue())
+            self.assertEqual(error["error"], "parse_error")
+            self.assertTrue(error["file"].endswith("bad.tf"))
+
+    def test_directory_parallel(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = self._make_dir(tmpdir)
+            out_dir = os.path.join(tmpdir, "output")
+            argv = ["hcl2tojson", "-q", "-j", "3", in_dir, "-o", out_dir]
+            with patch("sys.argv", argv):
+                main()
+
+            for i in range(6):
+                data = json.loads(_read_file(os.path.join(out_dir, f"f{i}.json")))
+                self.assertEqual(data[f"x{i}"], i)
+
+    def test_unordered_requires_ndjson(self):
+        with patch("sys.argv", ["hcl2tojson", "--unordered", "x.tf"]):
+            with patch("sys.stderr", StringIO()), self.assertRaises(SystemExit) as cm:
+                main()
+        self.assertEqual(cm.exception.code, 2)
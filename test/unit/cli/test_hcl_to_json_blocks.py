@@ -0,0 +1,105 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from cli.helpers import EXIT_PARSE_ERROR, EXIT_PARTIAL
+from cli.hcl_to_json import main
+
+HCL = """\
+variable "name" {
+  default = "hello"
+}
+x = 1
+resource "aws_instance" "main" {
+  ami = "abc-123"
+}
+"""
+
+
+def _write_file(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _run(argv):
+    stdout, stderr = StringIO(), StringIO()
+    with patch("sys.argv", ["hcl2tojson", "--ndjson-blocks", *argv]):
+        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+            main()
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+class TestNdjsonBlocks(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.path = os.path.join(self.tmpdir.name, "main.tf")
+        _write_file(self.path, HCL)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_one_line_per_element(self):
+        lines = _run([self.path])
+        self.assertEqual(
+            lines,
+            [
+                {
+                    "variable": [
+                        {'"name"': {"default": '"hello"', "__is_block__": True}}
+                    ]
+                },
+                {"x": 1},
+                {
+                    "resource": [
+                        {
+                            '"aws_instance"': {
+                                '"main"': {"ami": '"abc-123"', "__is_block__": True}
+                            }
+                        }
+                    ]
+                },
+            ],
+        )
+
+    def test_filtering_per_element(self):
+        lines = _run(["--only", "resource", self.path])
+        self.assertEqual([list(line) for line in lines], [["resource"]])
+
+    def test_provenance_for_multiple_files(self):
+        other = os.path.join(self.tmpdir.name, "other.tf")
+        _write_file(other, "y = 2\n")
+        lines = _run([self.path, other])
+        self.assertEqual(lines[-1], {"__file__": other, "y": 2})
+        self.assertTrue(all(line["__file__"] == self.path for line in lines[:-1]))
+
+    def test_expression_continued_on_next_line(self):
+        _write_file(self.path, "a = 1\n  + 2\nb = x\n  ? 1\n  : 2\n")
+        lines = _run([self.path])
+        self.assertEqual([list(line) for line in lines], [["a"], ["b"]])
+
+    def test_parse_error_after_elements(self):
+        _write_file(self.path, "x = 1\ny = = 2\n")
+        stdout, stderr = StringIO(), StringIO()
+        with patch("sys.argv", ["hcl2tojson", "--ndjson-blocks", self.path]):
+            with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+        self.assertEqual(cm.exception.code, EXIT_PARSE_ERROR)
+        self.assertEqual(stdout.getvalue(), '{"x":1}\n')
+        error = json.loads(stderr.getvalue().splitlines()[-1])
+        self.assertEqual(error["error"], "parse_error")
+
+    def test_skip_bad_file(self):
+        bad = os.path.join(self.tmpdir.name, "bad.tf")
+        _write_file(bad, "this is {{{{ not valid")
+        with self.assertRaises(SystemExit) as cm:
+            _run(["-s", bad, self.path])
+        self.assertEqual(cm.exception.code, EXIT_PARTIAL)
+
+    def test_ndjson_not_allowed(self):
+        with self.assertRaises(SystemExit):
+            _run(["--ndjson", self.path])
@@ -13,6 +13,7 @@ from cli.helpers import (
     _convert_multiple_files,
     _error,
     _expand_file_args,
+    _parallel_map,
 )
 
 
@@ -21,6 +22,20 @@ def _write_file(path, content):
         f.write(content)
 
 
+# Module-level so they can be sent to --jobs worker processes
+
+
+def _upper(in_f, out_f):
+    data = in_f.read()
+    if data == "bad":
+        raise ValueError("boom")
+    out_f.write(data.upper())
+
+
+def _square(value):
+    return value * value
+
+
 class TestConvertSingleFile(TestCase):
     def test_does_not_close_stdout(self):
         """Regression test: stdout must not be closed after writing."""
@@ -654,3 +669,163 @@ class TestQuietMode(TestCase):
                 )
 
             self.assertIn("test.txt", stderr.getvalue())
+
+
+class TestAtomicOutput(TestCase):
+    def test_error_leaves_existing_output_untouched(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_path = os.path.join(tmpdir, "test.txt")
+            out_path = os.path.join(tmpdir, "out.txt")
+            _write_file(in_path, "bad")
+            _write_file(out_path, "previous")
+
+            def convert(_in_f, out_f):
+                out_f.write("partial")
+                raise KeyError("boom")
+
+            with self.assertRaises(KeyError):
+                _convert_single_file(in_path, out_path, convert, True, (ValueError,))
+
+            with open(out_path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "previous")
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["out.txt", "test.txt"])
+
+    def test_skip_removes_stale_output(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_path = os.path.join(tmpdir, "test.txt")
+            out_path = os.path.join(tmpdir, "out.txt")
+            _write_file(in_path, "bad")
+            _write_file(out_path, "previous")
+
+            result = _convert_single_file(
+                in_path, out_path, _upper, True, (ValueError,)
+            )
+
+            self.assertFalse(result)
+            self.assertEqual(os.listdir(tmpdir), ["test.txt"])
+
+
+class TestParallelConversion(TestCase):
+    def _make_input(self, tmpdir, contents):
+        in_dir = os.path.join(tmpdir, "in")
+        os.makedirs(os.path.join(in_dir, "sub"))
+        for name, content in contents.items():
+            _write_file(os.path.join(in_dir, name), content)
+        return in_dir
+
+    def test_directory_matches_serial(self):
+        contents = {f"f{i}.txt": f"file {i}" for i in range(6)}
+        contents["sub/nested.txt"] = "nested"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = self._make_input(tmpdir, contents)
+            out_dir = os.path.join(tmpdir, "out")
+            skipped = _convert_directory(
+                in_dir,
+                out_dir,
+                _upper,
+                False,
+                (ValueError,),
+                in_extensions={".txt"},
+                out_extension=".out",
+                quiet=True,
+                jobs=3,
+            )
+
+            self.assertFalse(skipped)
+            for name, content in contents.items():
+                out_path = os.path.join(out_dir, os.path.splitext(name)[0] + ".out")
+                with open(out_path, encoding="utf-8") as f:
+                    self.assertEqual(f.read(), content.upper())
+
+    def test_skip_in_worker(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = self._make_input(tmpdir, {"a.txt": "good", "b.txt": "bad"})
+            out_dir = os.path.join(tmpdir, "out")
+            skipped = _convert_directory(
+                in_dir,
+                out_dir,
+                _upper,
+                True,
+                (ValueError,),
+                in_extensions={".txt"},
+                out_extension=".out",
+                quiet=True,
+                jobs=2,
+            )
+
+            self.assertTrue(skipped)
+            self.assertTrue(os.path.exists(os.path.join(out_dir, "a.out")))
+            self.assertFalse(os.path.exists(os.path.join(out_dir, "b.out")))
+
+    def test_worker_error_is_reraised(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for name, content in (("a.txt", "good"), ("b.txt", "bad")):
+                paths.append(os.path.join(tmpdir, name))
+                _write_file(paths[-1], content)
+
+            with self.assertRaises(ValueError):
+                _convert_multiple_files(
+                    paths,
+                    os.path.join(tmpdir, "out"),
+                    _upper,
+                    False,
+                    (ValueError,),
+                    out_extension=".out",
+                    quiet=True,
+                    jobs=2,
+                )
+
+    def test_no_output_after_worker_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i, content in enumerate(["good", "bad"] + ["good"] * 6):
+                paths.append(os.path.join(tmpdir, f"{i}.txt"))
+                _write_file(paths[-1], content)
+            out_dir = os.path.join(tmpdir, "out")
+
+            with self.assertRaises(ValueError):
+                _convert_multiple_files(
+                    paths,
+                    out_dir,
+                    _upper,
+                    False,
+                    (ValueError,),
+                    out_extension=".out",
+                    quiet=True,
+                    jobs=2,
+                )
+
+            self.assertEqual(os.listdir(out_dir), ["0.out"])
+
+    def test_progress_in_input_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i in range(4):
+                paths.append(os.path.join(tmpdir, f"{i}.txt"))
+                _write_file(paths[-1], str(i))
+
+            stderr = StringIO()
+            with patch("sys.stderr", stderr):
+                _convert_multiple_files(
+                    paths,
+                    os.path.join(tmpdir, "out"),
+                    _upper,
+                    False,
+                    (ValueError,),
+                    out_extension=".out",
+                    jobs=2,
+                )
+
+            self.assertEqual(stderr.getvalue().split(), paths)
+
+
+class TestParallelMap(TestCase):
+    def test_ordered(self):
+        self.assertEqual(
+            list(_parallel_map(_square, range(10), 3)), [i * i for i in range(10)]
+        )
+
+    def test_unordered(self):
+        result = _parallel_map(_square, range(10), 3, ordered=False)
+        self.assertEqual(sorted(result), [i * i for i in range(10)])
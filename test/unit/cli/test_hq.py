@@ -16,9 +16,10 @@ from cli.hq import (
     _dispatch_query,
     _expand_file_args,
     _normalize_eval_expr,
-    _process_file,
     main,
 )
+from cli.hq_parallel import QueryJob, _chunk_by_size, _init_worker, _process_file
+from hcl2.lazy import LazyBlockRule
 from hcl2.query.body import DocumentView
 
 
@@ -897,6 +898,11 @@ class TestOptionalWithSelect(TestCase):
                 os.unlink(f.name)
 
 
+def _job(query="x", multi=True, **config):
+    output_config = OutputConfig(**(config or {"output_json": True}))
+    return QueryJob(query, False, True, query, multi, output_config)
+
+
 class TestProcessFile(TestCase):
     """Unit tests for the _process_file worker function."""
 
@@ -905,38 +911,43 @@ class TestProcessFile(TestCase):
             f.write("x = 1\n")
             f.flush()
             try:
-                args = (f.name, "x", False, "x", True, OutputConfig(output_json=True))
-                _fp, code, converted, err = _process_file(args)
+                _fp, code, rendered, err = _process_file(_job(), f.name)
                 self.assertEqual(code, EXIT_SUCCESS)
                 self.assertIsNone(err)
-                self.assertEqual(len(converted), 1)
-                self.assertIn("__file__", converted[0])
+                lines, merged = rendered
+                self.assertEqual(lines, [])
+                self.assertEqual(len(merged), 1)
+                self.assertIn("__file__", merged[0])
+            finally:
+                os.unlink(f.name)
+
+    def test_renders_default_output(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".tf", delete=False) as f:
+            f.write("x = 1\n")
+            f.flush()
+            try:
+                _fp, code, rendered, _err = _process_file(
+                    _job(multi=False, output_value=True), f.name
+                )
+                self.assertEqual(code, EXIT_SUCCESS)
+                self.assertEqual(rendered, (["1"], []))
             finally:
                 os.unlink(f.name)
 
     def test_io_error(self):
-        args = (
-            "/nonexistent.tf",
-            "x",
-            False,
-            "x",
-            True,
-            OutputConfig(output_json=True),
-        )
-        _fp, code, _converted, err = _process_file(args)
+        _fp, code, rendered, err = _process_file(_job(), "/nonexistent.tf")
         self.assertEqual(code, EXIT_IO_ERROR)
-        self.assertIsNotNone(err)
-        self.assertIsNone(_converted)
+        self.assertEqual(json.loads(err)["error"], "io_error")
+        self.assertIsNone(rendered)
 
     def test_parse_error(self):
         with tempfile.NamedTemporaryFile(mode="w", suffix=".tf", delete=False) as f:
             f.write("{invalid\n")
             f.flush()
             try:
-                args = (f.name, "x", False, "x", True, OutputConfig(output_json=True))
-                _fp, code, _converted, err = _process_file(args)
+                _fp, code, _rendered, err = _process_file(_job(), f.name)
                 self.assertEqual(code, EXIT_PARSE_ERROR)
-                self.assertIsNotNone(err)
+                self.assertEqual(json.loads(err)["file"], f.name)
             finally:
                 os.unlink(f.name)
 
@@ -945,22 +956,31 @@ class TestProcessFile(TestCase):
             f.write("x = 1\n")
             f.flush()
             try:
-                args = (
-                    f.name,
-                    "nonexistent",
-                    False,
-                    "nonexistent",
-                    True,
-                    OutputConfig(output_json=True),
-                )
-                _fp, code, converted, err = _process_file(args)
+                _fp, code, rendered, err = _process_file(_job("nonexistent"), f.name)
                 self.assertEqual(code, EXIT_SUCCESS)
-                self.assertEqual(converted, [])
+                self.assertEqual(rendered, ([], []))
                 self.assertIsNone(err)
             finally:
                 os.unlink(f.name)
 
 
+class TestChunkBySize(TestCase):
+    def test_chunks_are_contiguous_and_balanced(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i, size in enumerate([1000, 10, 10, 10, 10, 1000, 10, 10]):
+                paths.append(os.path.join(tmpdir, f"f{i}.tf"))
+                with open(paths[-1], "w", encoding="utf-8") as f:
+                    f.write("x" * size)
+            chunks = _chunk_by_size(paths, 1)
+            self.assertEqual([p for chunk in chunks for p in chunk], paths)
+            self.assertEqual([len(chunk) for chunk in chunks], [1, 5, 2])
+
+    def test_missing_files_are_kept(self):
+        chunks = _chunk_by_size(["/nonexistent1.tf", "/nonexistent2.tf"], 2)
+        self.assertEqual(sum(chunks, []), ["/nonexistent1.tf", "/nonexistent2.tf"])
+
+
 class TestParallelMode(TestCase):
     """Integration tests for --jobs parallel mode."""
 
@@ -1038,17 +1058,200 @@ class TestParallelMode(TestCase):
                     data = json.loads(mock_out.getvalue())
                     self.assertEqual(len(data), 5)
 
-    def test_serial_for_value_mode(self):
-        """--value mode stays serial even with many files."""
+    def _run(self, argv):
+        with patch("sys.argv", argv):
+            with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                mock_out.isatty = lambda: False
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+        self.assertEqual(cm.exception.code, EXIT_SUCCESS)
+        return mock_out.getvalue()
+
+    def test_parallel_output_matches_serial(self):
+        """Text, NDJSON and eval output is identical to serial mode, in order."""
         with tempfile.TemporaryDirectory() as tmpdir:
             paths = self._make_files(tmpdir, 25)
-            argv = ["hq", "x"] + paths + ["--value"]
+            for query, flags in (
+                ("x", []),
+                ("x", ["--value"]),
+                ("x", ["--ndjson"]),
+                ("doc.attribute('x').value", ["-e", "--json"]),
+            ):
+                with self.subTest(query=query, flags=flags):
+                    argv = ["hq", query, *paths, *flags, "--jobs"]
+                    serial = self._run([*argv, "0"])
+                    parallel = self._run([*argv, "3"])
+                    self.assertEqual(parallel, serial)
+
+    def test_explicit_jobs_parallel_for_few_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = self._make_files(tmpdir, 3)
+            with patch(
+                "cli.hq_parallel._chunk_by_size", wraps=_chunk_by_size
+            ) as chunker:
+                out = self._run(["hq", "x", *paths, "--value", "--jobs", "2"])
+            chunker.assert_called_once()
+            self.assertEqual(len(out.splitlines()), 3)
+
+    def test_parallel_errors_reported(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = self._make_files(tmpdir, 3)
+            with open(paths[1], "w", encoding="utf-8") as f:
+                f.write("{invalid\n")
+            argv = ["hq", "x", *paths, "--value", "--jobs", "2"]
+            with patch("sys.argv", argv), patch(
+                "sys.stdout", new_callable=StringIO
+            ) as mock_out, patch("sys.stderr", new_callable=StringIO) as mock_err:
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+            self.assertEqual(cm.exception.code, EXIT_SUCCESS)
+            self.assertEqual(len(mock_out.getvalue().splitlines()), 2)
+            self.assertTrue(mock_err.getvalue().startswith("Error: "))
+
+
+class TestTimings(TestCase):
+    def test_timings_printed_to_stderr(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "main.tf")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x = 1\n")
+            argv = ["hq", "x", path, "--value", "--timings"]
             with patch("sys.argv", argv):
-                with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                with patch("sys.stdout", new_callable=StringIO) as mock_out, patch(
+                    "sys.stderr", new_callable=StringIO
+                ) as mock_err:
                     with self.assertRaises(SystemExit) as cm:
                         main()
-                    self.assertEqual(cm.exception.code, EXIT_SUCCESS)
-                    lines = [
-                        l for l in mock_out.getvalue().strip().split("\n") if l.strip()
-                    ]
-                    self.assertEqual(len(lines), 25)
+            self.assertEqual(cm.exception.code, EXIT_SUCCESS)
+            self.assertEqual(mock_out.getvalue().strip(), "1")
+            self.assertIn(f"{path}: total ", mock_err.getvalue())
+            for stage in ("lex", "postlex", "parse", "transform"):
+                self.assertIn(stage, mock_err.getvalue())
+
+    def test_timings_force_serial_mode(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i in range(25):
+                path = os.path.join(tmpdir, f"f{i:03d}.tf")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(f"x = {i}\n")
+                paths.append(path)
+            argv = ["hq", "x"] + paths + ["--ndjson", "--timings"]
+            with patch("sys.argv", argv), patch(
+                "multiprocessing.Pool", side_effect=AssertionError("parallel")
+            ):
+                with patch("sys.stdout", new_callable=StringIO), patch(
+                    "sys.stderr", new_callable=StringIO
+                ) as mock_err:
+                    with self.assertRaises(SystemExit) as cm:
+                        main()
+            self.assertEqual(cm.exception.code, EXIT_SUCCESS)
+            self.assertEqual(mock_err.getvalue().count(": total "), 25)
+
+
+class TestCacheDir(TestCase):
+    def _run(self, argv):
+        with patch("sys.argv", argv):
+            with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+        self.assertEqual(cm.exception.code, EXIT_SUCCESS)
+        return mock_out.getvalue()
+
+    def test_cache_dir_reuses_parsed_documents(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "main.tf")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x = 1\n")
+            cache_dir = os.path.join(tmpdir, "cache")
+            argv = ["hq", "x", path, "--value", "--cache-dir", cache_dir]
+            self.assertEqual(self._run(argv).strip(), "1")
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            with patch("hcl2.api._get_parser", side_effect=AssertionError("parsed")):
+                self.assertEqual(self._run(argv).strip(), "1")
+
+    def test_worker_initializer_opens_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "main.tf")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x = 1\n")
+            cache_dir = os.path.join(tmpdir, "cache")
+            _init_worker(cache_dir, 1)
+            try:
+                self.assertEqual(_process_file(_job(), path)[1], EXIT_SUCCESS)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+            finally:
+                _init_worker(None, 1)
+
+
+LAZY_HCL = """\
+resource "aws_instance" "web" {
+  ami = "ami-123"
+}
+
+resource "aws_instance" "db" {
+  ami = "ami-456"
+}
+"""
+
+
+class TestLazyParsing(TestCase):
+    def _run(self, argv, source):
+        """Run hq on *source*; return the exit code, stdout and parsed documents."""
+        original = DocumentView.parse
+        documents = []
+
+        def parse(*args, **kwargs):
+            documents.append(original(*args, **kwargs))
+            return documents[-1]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "main.tf")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            with patch.object(DocumentView, "parse", side_effect=parse), patch(
+                "sys.argv", argv[:2] + [path] + argv[2:]
+            ), patch("sys.stdout", new_callable=StringIO) as mock_out, patch(
+                "sys.stderr", new_callable=StringIO
+            ):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+        return cm.exception.code, mock_out.getvalue(), documents
+
+    @staticmethod
+    def _parsed(document):
+        return [
+            block.is_parsed
+            for block in document.raw.body.children
+            if isinstance(block, LazyBlockRule)
+        ]
+
+    def test_unqueried_blocks_stay_unparsed(self):
+        code, out, documents = self._run(
+            ["hq", "resource.aws_instance.web.ami", "--value"], LAZY_HCL
+        )
+        self.assertEqual(code, EXIT_SUCCESS)
+        self.assertEqual(out.strip(), '"ami-123"')
+        self.assertEqual(self._parsed(documents[0]), [True, False])
+
+    def test_eval_parses_eagerly(self):
+        code, _, documents = self._run(
+            ["hq", "doc.blocks('resource')", "-e", "--json"], LAZY_HCL
+        )
+        self.assertEqual(code, EXIT_SUCCESS)
+        self.assertEqual(self._parsed(documents[0]), [])
+
+    def test_error_in_queried_block(self):
+        source = LAZY_HCL.replace('"ami-456"', "")
+        code, _, _ = self._run(["hq", "resource.aws_instance.db", "--json"], source)
+        self.assertEqual(code, EXIT_PARSE_ERROR)
+        code, _, _ = self._run(["hq", "resource[*]", "--json"], source)
+        self.assertEqual(code, EXIT_PARSE_ERROR)
+
+    def test_error_in_unqueried_block(self):
+        source = LAZY_HCL.replace('"ami-456"', "")
+        code, out, _ = self._run(
+            ["hq", "resource.aws_instance.web.ami", "--value"], source
+        )
+        self.assertEqual(code, EXIT_SUCCESS)
+        self.assertEqual(out.strip(), '"ami-123"')
@@ -0,0 +1,268 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from cli.hq import EXIT_IO_ERROR, EXIT_SUCCESS
+from cli.hq_server import (
+    PROTOCOL_VERSION,
+    DocumentIndex,
+    HqServer,
+    run_client,
+    run_request,
+    strip_local_flags,
+)
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _request(argv, cwd, stdin=None):
+    return {
+        "version": PROTOCOL_VERSION,
+        "argv": argv,
+        "cwd": cwd,
+        "stdin": stdin,
+        "stdin_isatty": stdin is None,
+        "stdout_isatty": False,
+    }
+
+
+class TestDocumentIndex(TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.path = os.path.join(self._tmpdir.name, "main.tf")
+        _write(self.path, "x = 1\n")
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_unchanged_file_reuses_document(self):
+        index = DocumentIndex()
+        first = index.get(self.path)
+        self.assertIs(index.get(self.path), first)
+        self.assertEqual((index.hits, index.misses), (1, 1))
+
+    def test_modified_file_is_reparsed(self):
+        index = DocumentIndex()
+        first = index.get(self.path)
+        _write(self.path, "x = 22\n")
+        second = index.get(self.path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.attribute("x").value, 22)
+
+    def test_replaced_file_is_reparsed(self):
+        index = DocumentIndex()
+        first = index.get(self.path)
+        replacement = self.path + ".new"
+        _write(replacement, "x = 2\n")
+        os.replace(replacement, self.path)
+        self.assertIsNot(index.get(self.path), first)
+
+    def test_paths_to_same_file_share_entry(self):
+        index = DocumentIndex()
+        first = index.get(self.path)
+        alias = os.path.join(self._tmpdir.name, ".", "main.tf")
+        self.assertIs(index.get(alias), first)
+        self.assertEqual(len(index), 1)
+
+    def test_deleted_file_raises_and_is_dropped(self):
+        index = DocumentIndex()
+        index.get(self.path)
+        os.remove(self.path)
+        with self.assertRaises(OSError):
+            index.get(self.path)
+        self.assertEqual(len(index), 0)
+
+    def test_least_recently_used_document_is_dropped(self):
+        other = os.path.join(self._tmpdir.name, "other.tf")
+        _write(other, "y = 1\n")
+        index = DocumentIndex(max_entries=2)
+        first = index.get(self.path)
+        index.get(other)
+        index.get(self.path)
+        index.get(os.path.join(self._tmpdir.name, "main.tf"))
+        third = os.path.join(self._tmpdir.name, "third.tf")
+        _write(third, "z = 1\n")
+        index.get(third)
+        self.assertEqual(len(index), 2)
+        self.assertIs(index.get(self.path), first)
+        index.get(other)
+        self.assertEqual(index.misses, 4)
+
+    def test_prune_drops_deleted_files(self):
+        index = DocumentIndex()
+        index.get(self.path)
+        os.remove(self.path)
+        index.prune()
+        self.assertEqual(len(index), 0)
+
+
+class TestRunRequest(TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.cwd = self._tmpdir.name
+        _write(os.path.join(self.cwd, "main.tf"), 'x = 1\nresource "a" "b" {}\n')
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_relative_path_resolved_against_client_cwd(self):
+        response = run_request(
+            _request(["x", "main.tf", "--value"], self.cwd), DocumentIndex()
+        )
+        self.assertEqual(response["stdout"], "1\n")
+        self.assertEqual(response["exit_code"], EXIT_SUCCESS)
+        self.assertNotEqual(os.getcwd(), os.path.realpath(self.cwd))
+
+    def test_documents_reused_across_requests(self):
+        index = DocumentIndex()
+        run_request(_request(["x", "main.tf"], self.cwd), index)
+        run_request(_request(["resource[*]", "main.tf", "--json"], self.cwd), index)
+        self.assertEqual((index.hits, index.misses), (1, 1))
+
+    def test_stdin_forwarded(self):
+        response = run_request(
+            _request(["y", "--value"], self.cwd, stdin="y = 5\n"), DocumentIndex()
+        )
+        self.assertEqual(response["stdout"], "5\n")
+
+    def test_missing_file_is_io_error(self):
+        response = run_request(_request(["x", "nope.tf"], self.cwd), DocumentIndex())
+        self.assertEqual(response["exit_code"], EXIT_IO_ERROR)
+        self.assertIn("nope.tf", response["stderr"])
+
+    def test_usage_error_returns_exit_code(self):
+        response = run_request(
+            _request(["x", "--value", "--json"], self.cwd), DocumentIndex()
+        )
+        self.assertEqual(response["exit_code"], 2)
+        self.assertIn("not allowed with", response["stderr"])
+
+    def test_server_flags_rejected(self):
+        response = run_request(
+            _request(["--serve", "other.sock"], self.cwd), DocumentIndex()
+        )
+        self.assertEqual(response["exit_code"], 2)
+
+    def test_unexpected_error_is_reported(self):
+        missing = os.path.join(self.cwd, "missing")
+        cwd = os.getcwd()
+        response = run_request(_request(["x", "main.tf"], missing), DocumentIndex())
+        self.assertEqual(response["exit_code"], 1)
+        self.assertIn("Error:", response["stderr"])
+        self.assertEqual(os.getcwd(), cwd)
+
+    def test_protocol_mismatch(self):
+        request = _request(["x", "main.tf"], self.cwd)
+        request["version"] = PROTOCOL_VERSION + 1
+        response = run_request(request, DocumentIndex())
+        self.assertEqual(response["exit_code"], 2)
+
+
+class TestStripLocalFlags(TestCase):
+    def test_separate_value(self):
+        self.assertEqual(
+            strip_local_flags(["x", "--client", "s.sock", "main.tf"]),
+            ["x", "main.tf"],
+        )
+
+    def test_joined_value(self):
+        self.assertEqual(
+            strip_local_flags(["--client=s.sock", "x", "main.tf", "--json"]),
+            ["x", "main.tf", "--json"],
+        )
+
+
+class _ReplyHandler(socketserver.StreamRequestHandler):
+    reply = b""
+
+    def handle(self):
+        self.rfile.read()
+        self.wfile.write(self.reply)
+
+
+def _exchange(socket_path, send):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(send)
+        sock.shutdown(socket.SHUT_WR)
+        return b"".join(iter(lambda: sock.recv(65536), b""))
+
+
+class TestClientServer(TestCase):
+    def test_round_trip_over_socket(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write(os.path.join(tmpdir, "main.tf"), "x = {a = 1}\n")
+            socket_path = os.path.join(tmpdir, "hq.sock")
+            server = HqServer(socket_path)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                with patch("sys.stdin") as stdin, patch(
+                    "sys.stdout", new_callable=StringIO
+                ) as out:
+                    stdin.isatty.return_value = True
+                    exit_code = run_client(
+                        socket_path, ["x", os.path.join(tmpdir, "main.tf"), "--json"]
+                    )
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+            self.assertEqual(exit_code, EXIT_SUCCESS)
+            self.assertEqual(json.loads(out.getvalue()), {"x": {"a": 1}})
+            self.assertFalse(os.path.exists(socket_path))
+
+    def test_unreachable_server(self):
+        with tempfile.TemporaryDirectory() as tmpdir, patch(
+            "sys.stderr", new_callable=StringIO
+        ) as err, patch("sys.stdin") as stdin:
+            stdin.isatty.return_value = True
+            exit_code = run_client(os.path.join(tmpdir, "none.sock"), ["x"])
+        self.assertEqual(exit_code, EXIT_IO_ERROR)
+        self.assertIn("cannot reach hq server", err.getvalue())
+
+    def test_malformed_request_gets_error_response(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            socket_path = os.path.join(tmpdir, "hq.sock")
+            server = HqServer(socket_path)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                replies = [_exchange(socket_path, data) for data in (b"{", b"[]")]
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+        for reply in replies:
+            self.assertEqual(json.loads(reply)["exit_code"], 1)
+
+    def test_malformed_response(self):
+        for reply in (b"", b"not json", b"{}"):
+            with self.subTest(reply=reply), tempfile.TemporaryDirectory() as tmpdir:
+                socket_path = os.path.join(tmpdir, "hq.sock")
+                handler = type("Handler", (_ReplyHandler,), {"reply": reply})
+                server = socketserver.UnixStreamServer(socket_path, handler)
+                thread = threading.Thread(target=server.serve_forever, daemon=True)
+                thread.start()
+                try:
+                    with patch("sys.stderr", new_callable=StringIO) as err, patch(
+                        "sys.stdin"
+                    ) as stdin:
+                        stdin.isatty.return_value = True
+                        exit_code = run_client(socket_path, ["x"])
+                finally:
+                    server.shutdown()
+                    server.server_close()
+                    thread.join()
+                self.assertEqual(exit_code, EXIT_IO_ERROR)
+                self.assertIn("invalid response", err.getvalue())
@@ -800,3 +800,40 @@ class TestDiffEdgeCases(TestCase):
                     self.assertEqual(cm.exception.code, EXIT_DIFF)
 
             self.assertIn("---", stdout.getvalue())
+
+
+class TestJobs(TestCase):
+    def test_directory_parallel(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = os.path.join(tmpdir, "input")
+            out_dir = os.path.join(tmpdir, "output")
+            os.mkdir(in_dir)
+            for i in range(4):
+                _write_file(os.path.join(in_dir, f"f{i}.json"), json.dumps({"x": i}))
+
+            with patch(
+                "sys.argv", ["jsontohcl2", "-q", "-j", "2", in_dir, "-o", out_dir]
+            ):
+                main()
+
+            for i in range(4):
+                self.assertEqual(
+                    _read_file(os.path.join(out_dir, f"f{i}.tf")), f"x = {i}\n"
+                )
+
+    def test_directory_parallel_skip_exits_1(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            in_dir = os.path.join(tmpdir, "input")
+            out_dir = os.path.join(tmpdir, "output")
+            os.mkdir(in_dir)
+            _write_file(os.path.join(in_dir, "good.json"), SIMPLE_JSON)
+            _write_file(os.path.join(in_dir, "bad.json"), "{not valid json")
+
+            argv = ["jsontohcl2", "-q", "-s", "-j", "2", in_dir, "-o", out_dir]
+            with patch("sys.argv", argv):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+
+            self.assertEqual(cm.exception.code, EXIT_PARTIAL)
+            self.assertTrue(os.path.exists(os.path.join(out_dir, "good.tf")))
+            self.assertFalse(os.path.exists(os.path.join(out_dir, "bad.tf")))
@@ -82,6 +82,25 @@ class TestNodeView(TestCase):
         result = view.to_dict()
         self.assertEqual(result, {"x": 1})
 
+    def test_to_dict_returns_a_copy(self):
+        from hcl2.query.body import DocumentView
+
+        doc = DocumentView.parse("a = 1\nb = [1, {c = 2}]\n")
+        value = doc.to_dict()
+        value["a"] = "MUT"
+        value["b"][1]["c"] = "MUT"
+        self.assertEqual(doc.to_dict(), {"a": 1, "b": [1, {"c": 2}]})
+        self.assertEqual(doc.attribute("b").value, [1, {"c": 2}])
+
+    def test_to_dict_after_children_edit(self):
+        from hcl2.api import parses
+        from hcl2.query.body import DocumentView
+
+        doc = DocumentView.parse("a = 1\n")
+        self.assertEqual(doc.to_dict(), {"a": 1})
+        doc.raw.body.children.append(parses("c = 3\n").body.children[0])
+        self.assertEqual(doc.to_dict(), {"a": 1, "c": 3})
+
     def test_to_hcl(self):
         # Use a real parsed tree to avoid lark_name issues with stubs
         from hcl2.query.body import DocumentView
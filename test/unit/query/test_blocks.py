@@ -122,3 +122,11 @@ class TestBlockViewAdjacentComments(TestCase):
         block = doc.blocks("resource")[0]
         result = block.to_dict(options=self._OPTS)
         self.assertNotIn("__comments__", result)
+
+    def test_adjacent_comments_do_not_leak_into_cache(self):
+        doc = DocumentView.parse('# about\nresource "type" "name" {}\n')
+        block = doc.blocks("resource")[0]
+        block.to_dict(options=self._OPTS)
+        self.assertNotIn("__comments__", block.raw.serialize_cached(self._OPTS))
+        self.assertIs(doc.raw.serialize_cached(), doc.raw.serialize_cached())
+        self.assertIsNot(doc.to_dict(), doc.to_dict())
@@ -34,6 +34,13 @@ class TestDocumentView(TestCase):
         blocks = doc.blocks("resource", "aws_instance")
         self.assertEqual(len(blocks), 1)
 
+    def test_blocks_see_removed_block(self):
+        doc = DocumentView.parse('resource "a" "b" {}\nresource "a" "c" {}\n')
+        self.assertEqual(len(doc.blocks("resource", "a")), 2)
+        body = doc.body.raw
+        body.children.remove(doc.blocks("resource", "a", "b")[0].raw)
+        self.assertEqual(doc.blocks("resource", "a")[0].name_labels, ["a", "c"])
+
     def test_attributes(self):
         doc = DocumentView.parse("x = 1\ny = 2\n")
         attrs = doc.attributes()
@@ -339,3 +339,31 @@ class TestSkipLabels(TestCase):
         # Without ~, "aws_instance" matches the label
         results = resolve_path(doc, parse_path("resource.aws_instance"))
         self.assertEqual(len(results), 1)
+
+
+class TestLabelNarrowing(TestCase):
+    SOURCE = """\
+a "x" { v = 1 }
+a "y" { v = 2 }
+a { x = { v = 3 } }
+a "x" "z" { v = 4 }
+"""
+
+    def _values(self, path):
+        doc = DocumentView.parse(self.SOURCE)
+        return [result.to_dict() for result in resolve_path(doc, parse_path(path))]
+
+    def test_labels_and_body_matches_in_order(self):
+        # The unlabelled block matches through its body
+        self.assertEqual(self._values("a.x.v"), [{"v": 1}, 3])
+
+    def test_longer_label_chain(self):
+        self.assertEqual(self._values("a.x.z.v"), [{"v": 4}])
+
+    def test_wildcard_stops_narrowing(self):
+        self.assertEqual(self._values("a.*.v"), [{"v": 1}, {"v": 2}, 3])
+
+    def test_index_on_block_type_is_not_narrowed(self):
+        doc = DocumentView.parse(self.SOURCE)
+        results = resolve_path(doc, parse_path("a[1].y"))
+        self.assertEqual([r.name_labels for r in results], [["y"]])
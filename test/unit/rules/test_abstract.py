@@ -4,7 +4,12 @@ from unittest import TestCase
 from lark import Token, Tree
 from lark.tree import Meta
 
-from hcl2.rules.abstract import LarkToken, LarkRule
+from hcl2.api import parses, reconstruct
+from hcl2.formatter import BaseFormatter
+from hcl2.rules.abstract import LarkToken, LarkRule, NodeMeta
+from hcl2.rules.base import BlockRule, BodyRule, StartRule
+from hcl2.rules.directives import TemplateIfRule
+from hcl2.rules.tokens import NAME, IntLiteral
 from hcl2.utils import SerializationOptions, SerializationContext
 
 
@@ -113,13 +118,31 @@ class TestLarkRule(TestCase):
         self.assertEqual(t1._index, 1)
 
     def test_init_with_meta(self):
-        meta = Meta()
+        meta = NodeMeta(1, 2, 3, 4, 5, 6)
         rule = ConcreteRule([], meta)
         self.assertIs(rule._meta, meta)
 
+    def test_init_converts_lark_meta(self):
+        meta = Meta()
+        meta.line, meta.column, meta.start_pos = 1, 2, 3
+        meta.end_line, meta.end_column, meta.end_pos = 4, 5, 6
+        meta.empty = False
+        rule = ConcreteRule([], meta)
+        self.assertIsInstance(rule._meta, NodeMeta)
+        self.assertEqual(rule._meta, NodeMeta(1, 2, 3, 4, 5, 6))
+        self.assertFalse(rule._meta.empty)
+
     def test_init_without_meta(self):
         rule = ConcreteRule([])
-        self.assertIsNotNone(rule._meta)
+        self.assertIsInstance(rule._meta, NodeMeta)
+        self.assertTrue(rule._meta.empty)
+        self.assertTrue(ConcreteRule([], Meta())._meta.empty)
+
+    def test_rules_and_tokens_have_no_instance_dict(self):
+        rule = StartRule([BodyRule([])])
+        self.assertFalse(hasattr(rule, "__dict__"))
+        self.assertFalse(hasattr(NAME("x"), "__dict__"))
+        self.assertFalse(hasattr(IntLiteral(1), "__dict__"))
 
     def test_parent_property(self):
         child_rule = ConcreteRule([])
@@ -177,3 +200,166 @@ class TestLarkElement(TestCase):
         parent = ConcreteRule([])
         token.set_parent(parent)
         self.assertIs(token._parent, parent)
+
+
+class JoinRule(LarkRule):
+    calls = 0
+
+    @staticmethod
+    def lark_name() -> str:
+        return "join_rule"
+
+    def serialize(self, options=SerializationOptions(), context=SerializationContext()):
+        JoinRule.calls += 1
+        return [child.serialize(options) for child in self._children]
+
+
+class TestSerializeCached(TestCase):
+    def setUp(self):
+        JoinRule.calls = 0
+        self.token = ConcreteToken("a")
+        self.inner = JoinRule([self.token])
+        self.outer = JoinRule([self.inner, ConcreteToken("b")])
+
+    def test_result_reused(self):
+        first = self.outer.serialize_cached()
+        self.assertIs(self.outer.serialize_cached(), first)
+        self.assertEqual(first, [["a"], "b"])
+        self.assertEqual(JoinRule.calls, 2)
+
+    def test_keyed_by_options_values(self):
+        self.outer.serialize_cached(SerializationOptions(with_meta=True))
+        self.outer.serialize_cached(SerializationOptions(with_meta=True))
+        self.outer.serialize_cached(SerializationOptions())
+        self.assertEqual(JoinRule.calls, 4)
+
+    def test_set_value_marks_ancestors_dirty(self):
+        self.outer.serialize_cached()
+        self.inner.serialize_cached()
+        self.token.set_value("c")
+        self.assertEqual(self.inner.serialize_cached(), ["c"])
+        self.assertEqual(self.outer.serialize_cached(), [["c"], "b"])
+
+    def test_mark_dirty(self):
+        self.outer.serialize_cached()
+        self.inner.children.append(ConcreteToken("d"))
+        self.inner.mark_dirty()
+        self.assertEqual(self.outer.serialize_cached(), [["a", "d"], "b"])
+
+    def test_children_change_marks_ancestors_dirty(self):
+        self.outer.serialize_cached()
+        self.inner.children.append(ConcreteToken("d"))
+        self.assertEqual(self.outer.serialize_cached(), [["a", "d"], "b"])
+        del self.outer.children[1]
+        self.assertEqual(self.outer.serialize_cached(), [["a", "d"]])
+
+    def test_body_children_change_marks_dirty(self):
+        body = BodyRule([])
+        body.find_attributes("x")
+        self.assertEqual(body.serialize_cached(), {})
+        body.children.append(JoinRule([]))
+        self.assertIsNone(body._serialized)
+
+
+class TestNodeMeta(TestCase):
+    def test_default_is_empty(self):
+        meta = NodeMeta()
+        self.assertTrue(meta.empty)
+        self.assertIsNone(meta.line)
+
+    def test_from_meta_returns_node_meta_unchanged(self):
+        meta = NodeMeta(1, 0, 0, 1, 5, 5)
+        self.assertIs(NodeMeta.from_meta(meta), meta)
+
+    def test_from_empty_lark_meta(self):
+        self.assertEqual(NodeMeta.from_meta(Meta()), NodeMeta())
+        self.assertEqual(NodeMeta.from_meta(None), NodeMeta())
+
+    def test_equality(self):
+        self.assertEqual(NodeMeta(1, 2, 3, 4, 5, 6), NodeMeta(1, 2, 3, 4, 5, 6))
+        self.assertNotEqual(NodeMeta(1, 2, 3, 4, 5, 6), NodeMeta(1, 2, 3, 4, 5, 7))
+        self.assertNotEqual(NodeMeta(), Meta())
+
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(NodeMeta(), "__dict__"))
+
+
+class TestClone(TestCase):
+    SOURCE = (
+        'resource "aws_instance" "web" {\n'
+        "  ami  = var.ami # image\n"
+        '  tags = { Name = "web-${var.env}" }\n'
+        '  note = "%{ if var.on }on%{ else }off%{ endif }"\n'
+        "}\n"
+    )
+
+    def _nodes(self, element):
+        stack = [element]
+        while stack:
+            node = stack.pop()
+            yield node
+            if isinstance(node, LarkRule):
+                stack.extend(child for child in node.children if child is not None)
+
+    def test_clone_token(self):
+        token = NAME("x")
+        rule = ConcreteRule([token])
+        copy = token.clone()
+        self.assertIsInstance(copy, NAME)
+        self.assertEqual(copy.value, "x")
+        self.assertEqual(copy._index, token._index)
+        self.assertIsNone(copy._parent)
+        self.assertIs(token._parent, rule)
+
+    def test_clone_equals_original(self):
+        tree = parses(self.SOURCE)
+        copy = tree.clone()
+        self.assertEqual(copy.to_lark(), tree.to_lark())
+        self.assertEqual(copy.serialize(), tree.serialize())
+
+    def test_clone_shares_no_nodes(self):
+        tree = parses(self.SOURCE)
+        originals = {id(node) for node in self._nodes(tree)}
+        copies = list(self._nodes(tree.clone()))
+        self.assertEqual(len(copies), len(originals))
+        self.assertFalse(originals & {id(node) for node in copies})
+
+    def test_clone_links_parents_and_indices(self):
+        copy = parses(self.SOURCE).clone()
+        self.assertIsNone(copy.parent)
+        for node in self._nodes(copy):
+            if isinstance(node, LarkRule):
+                for index, child in enumerate(node.children):
+                    if child is not None:
+                        self.assertIs(child._parent, node)
+                        self.assertEqual(child._index, index)
+
+    def test_clone_remaps_child_references(self):
+        tree = parses(self.SOURCE)
+        block = tree.clone().body.children[0]
+        self.assertIsInstance(block, BlockRule)
+        self.assertIs(block.body, block.children[-2])
+        self.assertEqual(block.labels, block.children[:3])
+        directive = next(
+            node for node in self._nodes(block) if isinstance(node, TemplateIfRule)
+        )
+        self.assertIs(directive._if_start, directive.children[0])
+        self.assertIs(directive._endif, directive.children[-1])
+
+    def test_clone_does_not_copy_cached_serialization(self):
+        tree = parses(self.SOURCE)
+        tree.body.serialize_cached()
+        copy = tree.clone()
+        self.assertIsNone(copy.body._serialized)
+        self.assertIsNone(copy.body._lookup)
+
+    def test_mutating_clone_leaves_original_unchanged(self):
+        tree = parses(self.SOURCE)
+        expected = reconstruct(tree)
+        copy = tree.clone()
+        block = copy.body.children[0]
+        block.body.find_attributes("ami")[0].identifier.children[0].set_value("id")
+        block.body.children.pop()
+        BaseFormatter().format_tree(copy)
+        self.assertEqual(reconstruct(tree), expected)
+        self.assertEqual(tree.body.children[0].body.find_attributes("id"), [])
@@ -1,4 +1,5 @@
 # pylint: disable=C0103,C0114,C0115,C0116
+import pickle
 from unittest import TestCase
 
 from hcl2.const import IS_BLOCK
@@ -185,6 +186,78 @@ class TestBodyRule(TestCase):
         self.assertEqual(keys, ["x"])
 
 
+# --- BodyRule lookup tests ---
+
+
+class TestBodyRuleLookup(TestCase):
+    def setUp(self):
+        self.web = _make_block(
+            [
+                _make_identifier("resource"),
+                _make_string_rule("aws"),
+                _make_string_rule("web"),
+            ]
+        )
+        self.db = _make_block(
+            [
+                _make_identifier("resource"),
+                _make_string_rule("aws"),
+                _make_string_rule("db"),
+            ]
+        )
+        self.locals = _make_block([_make_identifier("locals")])
+        self.x = _make_attribute("x", 1)
+        self.body = BodyRule([self.web, _make_nlc("\n"), self.x, self.db, self.locals])
+
+    def test_find_blocks_by_type(self):
+        self.assertEqual(self.body.find_blocks("resource"), [self.web, self.db])
+        self.assertEqual(self.body.find_blocks("module"), [])
+
+    def test_find_blocks_by_label_prefix(self):
+        self.assertEqual(self.body.find_blocks("resource", "aws"), [self.web, self.db])
+        self.assertEqual(self.body.find_blocks("resource", "aws", "db"), [self.db])
+        self.assertEqual(self.body.find_blocks("resource", "aws", "db", "x"), [])
+
+    def test_find_blocks_any_type(self):
+        self.assertEqual(self.body.find_blocks(), [self.web, self.db, self.locals])
+        self.assertEqual(self.body.find_blocks(None, "aws", "web"), [self.web])
+
+    def test_find_attributes(self):
+        self.assertEqual(self.body.find_attributes("x"), [self.x])
+        self.assertEqual(self.body.find_attributes(), [self.x])
+        self.assertEqual(self.body.find_attributes("y"), [])
+
+    def test_block_labels(self):
+        self.assertEqual(self.body.block_labels(self.web), ("resource", "aws", "web"))
+        self.assertIsNone(self.body.block_labels(_make_block([_make_identifier("a")])))
+
+    def test_index_rebuilt_after_modification(self):
+        self.assertEqual(self.body.find_attributes("y"), [])
+        y = _make_attribute("y", 2)
+        self.body.children.append(y)
+        self.assertEqual(self.body.find_attributes("y"), [y])
+        self.body.children.remove(self.db)
+        self.assertEqual(self.body.find_blocks("resource"), [self.web])
+
+    def test_index_rebuilt_after_children_replaced(self):
+        self.body.find_blocks("resource")
+        self.body._children = [self.locals]
+        self.assertEqual(self.body.find_blocks("resource"), [])
+
+    def test_invalidate_lookup(self):
+        self.body.find_attributes("x")
+        self.x.children[0] = _make_identifier("z")
+        self.body.invalidate_lookup()
+        self.assertEqual(self.body.find_attributes("z"), [self.x])
+
+    def test_pickle_with_index(self):
+        self.body.find_blocks("resource")
+        copy = pickle.loads(pickle.dumps(self.body))
+        self.assertEqual(len(copy.find_blocks("resource", "aws", "web")), 1)
+        copy.children.pop()
+        self.assertEqual(copy.find_blocks("locals"), [])
+
+
 # --- StartRule tests ---
 
 
@@ -1,4 +1,5 @@
 # pylint: disable=C0103,C0114,C0115,C0116
+import pickle
 from unittest import TestCase
 
 from hcl2.rules.tokens import (
@@ -53,6 +54,11 @@ class TestStringToken(TestCase):
         with self.assertRaises(TypeError):
             StringToken[42]  # pylint: disable=pointless-statement
 
+    def test_pickle_round_trip(self):
+        restored = pickle.loads(pickle.dumps(NAME("my_var")))
+        self.assertIs(type(restored), NAME)
+        self.assertEqual(restored.value, "my_var")
+
 
 class TestStaticStringToken(TestCase):
     def test_class_getitem_with_tuple(self):
@@ -71,6 +77,13 @@ class TestStaticStringToken(TestCase):
         instance = LPAR()
         self.assertEqual(instance.serialize(), "(")
 
+    def test_pickle_round_trip(self):
+        token = LPAR()
+        token.set_value("((")
+        restored = pickle.loads(pickle.dumps(token))
+        self.assertIs(type(restored), LPAR)
+        self.assertEqual(restored.value, "((")
+
     def test_classes_by_value_registry(self):
         self.assertIn("(", StaticStringToken.classes_by_value)
         self.assertIs(StaticStringToken.classes_by_value["("], type(LPAR()))
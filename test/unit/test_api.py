@@ -1,7 +1,11 @@
 # pylint: disable=C0103,C0114,C0115,C0116
-from io import StringIO
+import mmap
+import os
+import tempfile
+from io import BytesIO, StringIO
 from unittest import TestCase
 
+from lark.exceptions import UnexpectedInput, VisitError
 from lark.tree import Tree
 
 from hcl2.api import (
@@ -11,6 +15,7 @@ from hcl2.api import (
     dumps,
     parse,
     parses,
+    parse_expression,
     parse_to_tree,
     parses_to_tree,
     from_dict,
@@ -23,6 +28,7 @@ from hcl2.api import (
 from hcl2.deserializer import DeserializerOptions
 from hcl2.formatter import FormatterOptions
 from hcl2.rules.base import StartRule
+from hcl2.rules.expressions import BinaryOpRule, ConditionalRule, ExprTermRule
 from hcl2.utils import SerializationOptions
 
 
@@ -60,6 +66,21 @@ class TestLoads(TestCase):
         result = loads(BLOCK_HCL)
         self.assertIn("resource", result)
 
+    def test_bytes_like(self):
+        data = BLOCK_HCL.encode("utf-8")
+        for source in (data, bytearray(data), memoryview(data)):
+            with self.subTest(type=type(source).__name__):
+                self.assertEqual(loads(source), loads(BLOCK_HCL))
+
+    def test_invalid_utf8_raises(self):
+        with self.assertRaises(UnicodeDecodeError):
+            loads(b'x = "\xff"\n')
+
+    def test_no_trailing_newline(self):
+        for text in ("x = 5", "x = 5 # c", "x = 5\n// c", "x = <<EOF\nhi\nEOF"):
+            with self.subTest(text=text):
+                self.assertEqual(loads(text), loads(text + "\n"))
+
     def test_strip_string_quotes(self):
         result = loads(
             BLOCK_HCL,
@@ -94,6 +115,42 @@ class TestLoad(TestCase):
         )
         self.assertEqual(result["x"], 5)
 
+    def test_binary_file(self):
+        self.assertEqual(load(BytesIO(BLOCK_HCL.encode("utf-8"))), loads(BLOCK_HCL))
+
+
+class TestLoadMapped(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.path = os.path.join(self.tmpdir.name, "main.tf")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def test_binary_file_from_current_position(self):
+        self._write(b"# skipped\n" + BLOCK_HCL.encode("utf-8"))
+        with open(self.path, "rb") as f:
+            f.readline()
+            self.assertEqual(load(f), loads(BLOCK_HCL))
+            self.assertEqual(f.read(), b"")
+
+    def test_empty_binary_file(self):
+        self._write(b"")
+        with open(self.path, "rb") as f:
+            self.assertEqual(load(f), {})
+
+    def test_mmap(self):
+        self._write(BLOCK_HCL.encode("utf-8"))
+        with open(self.path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            self.assertEqual(loads(mapped), loads(BLOCK_HCL))
+            self.assertIsInstance(parses(mapped), StartRule)
+
 
 class TestDumps(TestCase):
     def test_simple_attribute(self):
@@ -128,6 +185,16 @@ class TestDump(TestCase):
         self.assertIn("x", output)
         self.assertIn("5", output)
 
+    def test_stream_writes_each_element(self):
+        data = {"x": 5, "y": [{"z": 1, "__is_block__": True}], "w": "a"}
+        f = StringIO()
+        writes = []
+        original = f.write
+        f.write = lambda text: writes.append(text) or original(text)
+        dump(data, f, stream=True)
+        self.assertEqual(f.getvalue(), dumps(data))
+        self.assertGreater(len(writes), 1)
+
 
 class TestParsesToTree(TestCase):
     def test_returns_lark_tree(self):
@@ -163,6 +230,64 @@ class TestParses(TestCase):
         serialized = serialize(result)
         self.assertNotIn("__comments__", serialized)
 
+    def test_positions_include_discarded_comments(self):
+        hcl = "block {\n  # comment\n  x = 5\n}\n"
+        expected = transform(parses_to_tree(hcl), discard_comments=True)
+        result = parses(hcl, discard_comments=True)
+        actual_block = result.body.children[0]
+        expected_block = expected.body.children[0]
+        for actual_node, expected_node in (
+            (result, expected),
+            (actual_block, expected_block),
+            (actual_block.body, expected_block.body),
+        ):
+            # pylint: disable=protected-access
+            self.assertEqual(actual_node._meta, expected_node._meta)
+
+    def test_invalid_template_directive_raises_visit_error(self):
+        with self.assertRaises(VisitError):
+            parses('x = "%{ if true }a"\n')
+
+
+class TestParseExpression(TestCase):
+    def test_same_expression_as_attribute_value(self):
+        for text in ("var.region", "a ? b : c", "1 + 2", '"x-${y}"', "[1, {a = 2}]"):
+            with self.subTest(text=text):
+                expected = parses(f"temp = {text}\n").body.children[0].expression
+                result = parse_expression(text)
+                self.assertIs(type(result), type(expected))
+                self.assertEqual(result.serialize(), expected.serialize())
+                self.assertIsNone(result.parent)
+
+    def test_returns_expression_rule(self):
+        self.assertIsInstance(parse_expression("a"), ExprTermRule)
+        self.assertIsInstance(parse_expression("a ? b : c"), ConditionalRule)
+        self.assertIsInstance(parse_expression("a +\n b"), BinaryOpRule)
+
+    def test_bytes_and_surrounding_spaces(self):
+        self.assertEqual(parse_expression(b"  var.a\t").serialize(), "${var.a}")
+
+    def test_discard_comments(self):
+        text = "[\n  1, # one\n]"
+        self.assertIn("one", str(parse_expression(text).to_lark()))
+        self.assertNotIn(
+            "one", str(parse_expression(text, discard_comments=True).to_lark())
+        )
+
+    def test_surrounding_newlines_and_comments(self):
+        for text in ("a\n", "\n  a", "# c\na # d\n", "a /* c */", "// c\na"):
+            with self.subTest(text=text):
+                self.assertEqual(
+                    parse_expression(text).serialize(),
+                    parse_expression("a").serialize(),
+                )
+
+    def test_rejects_body(self):
+        for text in ("a = 1", "", "# c\n"):
+            with self.subTest(text=text):
+                with self.assertRaises(UnexpectedInput):
+                    parse_expression(text)
+
 
 class TestParse(TestCase):
     def test_from_file(self):
@@ -267,6 +392,24 @@ class TestReconstruct(TestCase):
         reparsed = loads(hcl_text)
         self.assertEqual(reparsed["x"], 5)
 
+    def test_trailing_blank_lines_round_trip(self):
+        for text in (
+            "a = 1\n\n",
+            "a = 1\n\n\n",
+            "b {\n}\n\n",
+            "a = 1\n# c\n\n",
+            "a = 1\n\n# c\n",
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(reconstruct(parses(text)), text)
+                self.assertEqual(reconstruct(parses_to_tree(text)), text)
+
+    def test_empty_and_whitespace_only_input(self):
+        for text in ("", "   ", "\n"):
+            with self.subTest(text=text):
+                self.assertEqual(reconstruct(parses(text)), "\n")
+                self.assertEqual(reconstruct(parses_to_tree(text)), "\n")
+
 
 class TestErrorPaths(TestCase):
     def test_loads_raises_on_invalid_hcl(self):
@@ -0,0 +1,297 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import json
+import os
+import pickle
+from dataclasses import asdict
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from hcl2.api import loads, parses, query, reconstruct
+from hcl2.cache import (
+    CacheStats,
+    DiskParseCache,
+    ExpressionCache,
+    MemoryParseCache,
+    cache_key,
+)
+from hcl2.formatter import BaseFormatter
+from hcl2.query.body import DocumentView
+from hcl2.rules.base import StartRule
+from hcl2.rules.expressions import ExprTermRule
+from hcl2.utils import SerializationOptions
+
+
+SIMPLE_HCL = 'x = 1\nresource "a" "b" {\n  # note\n  y = "${var.z}"\n}\n'
+
+
+class TestCacheKey(TestCase):
+    def test_depends_on_text_kind_and_variant(self):
+        base = cache_key("dict", "x = 1", "a")
+        self.assertEqual(base, cache_key("dict", "x = 1", "a"))
+        self.assertNotEqual(base, cache_key("dict", "x = 2", "a"))
+        self.assertNotEqual(base, cache_key("tree", "x = 1", "a"))
+        self.assertNotEqual(base, cache_key("dict", "x = 1", "b"))
+
+    def test_depends_on_library_fingerprint(self):
+        base = cache_key("dict", "x = 1")
+        with patch("hcl2.cache._environment_fingerprint", return_value="other"):
+            self.assertNotEqual(base, cache_key("dict", "x = 1"))
+
+
+class TestDiskParseCache(TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.directory = os.path.join(self._tmpdir.name, "cache")
+        self.cache = DiskParseCache(self.directory)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_loads_miss_then_hit(self):
+        expected = loads(SIMPLE_HCL)
+        self.assertEqual(loads(SIMPLE_HCL, cache=self.cache), expected)
+        self.assertEqual(self.cache.stats.misses, 1)
+        self.assertEqual(self.cache.stats.hits, 0)
+        self.assertEqual(loads(SIMPLE_HCL, cache=self.cache), expected)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    def test_hit_skips_parser(self):
+        loads(SIMPLE_HCL, cache=self.cache)
+        with patch("hcl2.api._get_parser", side_effect=AssertionError("parsed")):
+            loads(SIMPLE_HCL, cache=self.cache)
+
+    def test_loads_entries_per_serialization_options(self):
+        with_meta = SerializationOptions(with_meta=True)
+        default = loads(SIMPLE_HCL, cache=self.cache)
+        meta = loads(SIMPLE_HCL, serialization_options=with_meta, cache=self.cache)
+        self.assertEqual(self.cache.stats.misses, 2)
+        self.assertEqual(loads(SIMPLE_HCL, cache=self.cache), default)
+        self.assertEqual(
+            loads(SIMPLE_HCL, serialization_options=with_meta, cache=self.cache), meta
+        )
+        self.assertEqual(self.cache.stats.hits, 2)
+
+    def test_parses_tree_round_trip(self):
+        parses(SIMPLE_HCL, cache=self.cache)
+        tree = parses(SIMPLE_HCL, cache=self.cache)
+        self.assertEqual(self.cache.stats.hits, 1)
+        self.assertIsInstance(tree, StartRule)
+        self.assertEqual(tree.serialize(), parses(SIMPLE_HCL).serialize())
+        self.assertEqual(reconstruct(tree), reconstruct(parses(SIMPLE_HCL)))
+
+    def test_parses_keyed_by_discard_comments(self):
+        parses(SIMPLE_HCL, cache=self.cache)
+        parses(SIMPLE_HCL, discard_comments=True, cache=self.cache)
+        self.assertEqual(self.cache.stats.misses, 2)
+
+    def test_document_view_parse(self):
+        DocumentView.parse(SIMPLE_HCL, cache=self.cache)
+        doc = DocumentView.parse(SIMPLE_HCL, cache=self.cache)
+        self.assertEqual(self.cache.stats.hits, 1)
+        self.assertEqual(len(doc.blocks("resource")), 1)
+
+    def test_cache_shared_between_instances(self):
+        loads(SIMPLE_HCL, cache=self.cache)
+        other = DiskParseCache(self.directory)
+        loads(SIMPLE_HCL, cache=other)
+        self.assertEqual(other.stats.hits, 1)
+
+    def test_corrupt_entry_is_discarded(self):
+        parses(SIMPLE_HCL, cache=self.cache)
+        for name in os.listdir(self.directory):
+            with open(os.path.join(self.directory, name), "wb") as entry:
+                entry.write(b"not an entry")
+        tree = parses(SIMPLE_HCL, cache=self.cache)
+        self.assertEqual(tree.serialize(), parses(SIMPLE_HCL).serialize())
+        self.assertEqual(self.cache.stats.hits, 0)
+        self.assertEqual(self.cache.stats.misses, 2)
+
+    def test_lru_eviction(self):
+        options = SerializationOptions()
+        loads("x = 0\n", cache=self.cache)
+        entry_size = self.cache.size()
+        cache = DiskParseCache(self.directory, max_size=entry_size * 2)
+        loads("x = 1\n", cache=cache)
+
+        def entry_path(text):
+            key = cache_key("dict", text, json.dumps(asdict(options), sort_keys=True))
+            return os.path.join(self.directory, key + ".entry")
+
+        # "x = 1" becomes the least recently used entry.
+        os.utime(entry_path("x = 1\n"), (1, 1))
+        loads("x = 2\n", cache=cache)
+
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertFalse(os.path.exists(entry_path("x = 1\n")))
+        self.assertTrue(os.path.exists(entry_path("x = 0\n")))
+        self.assertTrue(os.path.exists(entry_path("x = 2\n")))
+
+    def test_clear(self):
+        loads(SIMPLE_HCL, cache=self.cache)
+        self.cache.clear()
+        self.assertEqual(self.cache.size(), 0)
+
+    def test_unwritable_directory_is_ignored(self):
+        blocker = os.path.join(self._tmpdir.name, "file")
+        with open(blocker, "w", encoding="utf-8"):
+            pass
+        cache = DiskParseCache(os.path.join(blocker, "cache"))
+        self.assertEqual(loads(SIMPLE_HCL, cache=cache), loads(SIMPLE_HCL))
+        self.assertEqual(cache.stats.misses, 1)
+
+
+class _LockCheckingStats(CacheStats):
+    """Stats that fail when a counter changes while *lock* is not held."""
+
+    lock = None
+
+    def __setattr__(self, name, value):
+        if self.lock is not None and not self.lock.locked():
+            raise AssertionError(f"{name} updated without holding the lock")
+        super().__setattr__(name, value)
+
+
+class TestMemoryParseCache(TestCase):
+    def test_parses_miss_then_hit(self):
+        cache = MemoryParseCache()
+        parses(SIMPLE_HCL, cache=cache)
+        with patch("hcl2.api._get_parser", side_effect=AssertionError("parsed")):
+            tree = parses(SIMPLE_HCL, cache=cache)
+        self.assertEqual(cache.stats, CacheStats(hits=1, misses=1, evictions=0))
+        self.assertEqual(tree.serialize(), parses(SIMPLE_HCL).serialize())
+
+    def test_hits_return_independent_trees(self):
+        cache = MemoryParseCache()
+        first = parses(SIMPLE_HCL, cache=cache)
+        second = parses(SIMPLE_HCL, cache=cache)
+        self.assertIsNot(first, second)
+        # Mutating a tree handed out by the cache must not leak into later hits.
+        second.body.children.clear()
+        BaseFormatter().format_tree(first)
+        third = parses(SIMPLE_HCL, cache=cache)
+        self.assertEqual(reconstruct(third), reconstruct(parses(SIMPLE_HCL)))
+
+    def test_hits_clone_a_prototype(self):
+        cache = MemoryParseCache()
+        first = parses(SIMPLE_HCL, cache=cache)
+        first.body.children.clear()
+        with patch("hcl2.cache.decode_tree", side_effect=AssertionError("decoded")):
+            second = parses(SIMPLE_HCL, cache=cache)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(reconstruct(second), reconstruct(parses(SIMPLE_HCL)))
+
+    def test_loads_hits_return_independent_dicts(self):
+        cache = MemoryParseCache()
+        loads(SIMPLE_HCL, cache=cache)
+        data = loads(SIMPLE_HCL, cache=cache)
+        data["x"] = 2
+        self.assertEqual(loads(SIMPLE_HCL, cache=cache)["x"], 1)
+
+    def test_keyed_by_discard_comments(self):
+        cache = MemoryParseCache()
+        parses(SIMPLE_HCL, cache=cache)
+        parses(SIMPLE_HCL, discard_comments=True, cache=cache)
+        self.assertEqual(cache.stats.misses, 2)
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_eviction(self):
+        cache = MemoryParseCache(max_entries=2)
+        parses("x = 0\n", cache=cache)
+        parses("x = 1\n", cache=cache)
+        parses("x = 0\n", cache=cache)  # "x = 1" is now least recently used
+        parses("x = 2\n", cache=cache)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(len(cache), 2)
+        parses("x = 0\n", cache=cache)
+        self.assertEqual(cache.stats.hits, 2)
+        parses("x = 1\n", cache=cache)
+        self.assertEqual(cache.stats.misses, 4)
+
+    def test_stats_counted_under_lock(self):
+        cache = MemoryParseCache()
+        cache.stats = _LockCheckingStats()
+        cache.stats.lock = cache._lock
+        parses(SIMPLE_HCL, cache=cache)
+        parses(SIMPLE_HCL, cache=cache)
+        loads(SIMPLE_HCL, cache=cache)
+        loads(SIMPLE_HCL, cache=cache)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (2, 2))
+
+    def test_stats_exact_across_threads(self):
+        cache = MemoryParseCache()
+        parses(SIMPLE_HCL, cache=cache)
+
+        def lookup():
+            for _ in range(50):
+                cache.get_tree(SIMPLE_HCL)
+                cache.get_tree("x = 2\n")
+
+        threads = [threading.Thread(target=lookup) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (200, 201))
+
+    def test_query(self):
+        cache = MemoryParseCache()
+        query(SIMPLE_HCL, cache=cache)
+        doc = query(SIMPLE_HCL, cache=cache)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(doc.attribute("x").value, 1)
+
+    def test_clear(self):
+        cache = MemoryParseCache()
+        parses(SIMPLE_HCL, cache=cache)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestExpressionCache(TestCase):
+    def _expression(self, text):
+        return parses(f"x = {text}\n").body.children[0].expression
+
+    def test_miss_then_hit(self):
+        cache = ExpressionCache()
+        self.assertIsNone(cache.get("var.a"))
+        cache.put("var.a", self._expression("var.a"))
+        hit = cache.get("var.a")
+        self.assertIsInstance(hit, ExprTermRule)
+        self.assertEqual(hit.serialize(), "${var.a}")
+        self.assertEqual(cache.stats, CacheStats(hits=1, misses=1, evictions=0))
+
+    def test_hits_return_independent_copies(self):
+        cache = ExpressionCache()
+        stored = self._expression("[1, 2]")
+        cache.put("[1, 2]", stored)
+        first = cache.get("[1, 2]")
+        first.expression.children.clear()
+        stored.expression.children.clear()
+        second = cache.get("[1, 2]")
+        self.assertIsNot(first, second)
+        self.assertEqual(second.serialize(), [1, 2])
+
+    def test_lru_eviction(self):
+        cache = ExpressionCache(max_entries=2)
+        for text in ("a", "b", "a", "c"):
+            if cache.get(text) is None:
+                cache.put(text, self._expression(text))
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+    def test_clear(self):
+        cache = ExpressionCache()
+        cache.put("a", self._expression("a"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_pickles_as_empty_cache(self):
+        cache = ExpressionCache(max_entries=5)
+        cache.put("a", self._expression("a"))
+        copy = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(copy.max_entries, 5)
+        self.assertEqual(len(copy), 0)
@@ -1,8 +1,11 @@
 # pylint: disable=C0103,C0114,C0115,C0116
 from unittest import TestCase
 
+from hcl2.api import reconstruct
+from hcl2.cache import CacheStats, ExpressionCache
 from hcl2.const import IS_BLOCK, COMMENTS_KEY, INLINE_COMMENTS_KEY
 from hcl2.deserializer import BaseDeserializer, DeserializerOptions
+from hcl2.formatter import BaseFormatter
 from hcl2.rules.base import StartRule, BodyRule, BlockRule, AttributeRule
 from hcl2.rules.containers import (
     TupleRule,
@@ -50,6 +53,53 @@ class TestDeserializerOptions(TestCase):
         self.assertFalse(opts.strings_to_heredocs)
         self.assertFalse(opts.object_elements_colon)
         self.assertTrue(opts.object_elements_trailing_comma)
+        self.assertIsInstance(opts.expression_cache, ExpressionCache)
+
+    def test_each_instance_has_its_own_cache(self):
+        first, second = DeserializerOptions(), DeserializerOptions()
+        self.assertIsNot(first.expression_cache, second.expression_cache)
+        self.assertEqual(first, second)
+
+
+# --- expression cache ---
+
+
+class TestExpressionCaching(TestCase):
+    DATA = {
+        "a": "${var.region}",
+        "b": "${var.region}",
+        "c": {"${var.key}": "${var.region}"},
+        "d": ['"${var.region}-x"', "${var.key}"],
+        "e": '"%{ if var.on }on%{ endif }"',
+    }
+
+    def _render(self, options):
+        tree = _deser(options).load_python(self.DATA)
+        BaseFormatter().format_tree(tree)
+        return reconstruct(tree)
+
+    def test_repeated_expressions_parsed_once(self):
+        options = DeserializerOptions()
+        self._render(options)
+        self.assertEqual(
+            options.expression_cache.stats, CacheStats(hits=4, misses=3, evictions=0)
+        )
+
+    def test_output_matches_uncached(self):
+        expected = self._render(DeserializerOptions(expression_cache=None))
+        options = DeserializerOptions()
+        self.assertEqual(self._render(options), expected)
+        # Formatting the first result must not have changed the cached entries
+        self.assertEqual(self._render(options), expected)
+        self.assertEqual(options.expression_cache.stats.misses, 3)
+
+    def test_hits_are_distinct_nodes(self):
+        d = _deser()
+        first = d._deserialize_expression("${var.region}")
+        second = d._deserialize_expression("${var.region}")
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.expression, second.expression)
+        self.assertEqual(first.serialize(), second.serialize())
 
 
 # --- load_python top-level dispatch ---
@@ -87,6 +137,17 @@ class TestBaseDeserializerLoadPython(TestCase):
             d.load_python(42)
         self.assertIn("int", str(cm.exception))
 
+    def test_iter_python_deserializes_lazily(self):
+        d = _deser()
+        elements = d.iter_python({"x": 1, "y": [{"__is_block__": True}]})
+        self.assertIsInstance(next(elements), AttributeRule)
+        self.assertIsInstance(next(elements), BlockRule)
+        self.assertEqual(list(elements), [])
+
+    def test_iter_python_non_dict_raises_type_error(self):
+        with self.assertRaises(TypeError):
+            _deser().iter_python([1, 2])
+
     def test_loads_parses_json(self):
         d = _deser()
         result = d.loads('{"key": 42}')
@@ -153,6 +214,17 @@ class TestDeserializeText(TestCase):
         result = d._deserialize_text("${var.x}")
         self.assertIsInstance(result, ExprTermRule)
 
+    def test_expression_with_surrounding_newlines_and_comments(self):
+        for value, expected in (
+            ("${var.x\n}", "var.x"),
+            ("${a # c\n}", "a"),
+            ("${a /* c */}", "a"),
+        ):
+            with self.subTest(value=value):
+                result = _deser().load_python({"a": value})
+                BaseFormatter().format_tree(result)
+                self.assertEqual(reconstruct(result), f"a = {expected}\n")
+
     def test_non_string_non_numeric_fallback(self):
         """Non-string, non-numeric values get str()-converted to identifier."""
         d = _deser()
@@ -0,0 +1,105 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+from unittest import TestCase
+from unittest.mock import patch
+
+from hcl2.api import parses, reconstruct
+from hcl2.reconstructor import ElementReconstructor, HCLReconstructor
+from hcl2.rules.abstract import LarkRule
+from hcl2.rules.base import BodyRule, StartRule
+from hcl2.rules.directives import TemplateForRule, TemplateIfRule
+from hcl2.rules.tokens import NAME
+
+SOURCE = """\
+resource "aws_instance" "web" {
+  count = var.on ? 2 : 0 # two
+  ami   = !var.off && -var.n > 1
+  tags  = { for k, v in local.tags : k => upper(v)... if v != null }
+  ids   = [for i in range(3) : "id-${i}"]
+  note  = "%{ if var.on }on%{ else }off%{ endif }"
+  list  = "%{~ for x in var.xs ~}${x},%{ endfor }"
+  args  = f(a, b...)
+}
+"""
+
+
+def _expected(tree):
+    return HCLReconstructor().reconstruct(tree.to_lark())
+
+
+class TestElementReconstructor(TestCase):
+    def test_matches_lark_tree_reconstruction(self):
+        tree = parses(SOURCE)
+        self.assertMultiLineEqual(
+            ElementReconstructor().reconstruct(tree), _expected(tree)
+        )
+
+    def test_does_not_build_lark_tree(self):
+        tree = parses(SOURCE)
+        expected = _expected(tree)
+        fail = AssertionError("to_lark called")
+        with patch.object(LarkRule, "to_lark", side_effect=fail), patch.object(
+            TemplateIfRule, "to_lark", side_effect=fail
+        ), patch.object(TemplateForRule, "to_lark", side_effect=fail):
+            self.assertEqual(ElementReconstructor().reconstruct(tree), expected)
+
+    def test_fragments(self):
+        block = parses(SOURCE).body.children[0]
+        for node in (block, block.body.children[1], block.labels[1]):
+            with self.subTest(node=node):
+                self.assertEqual(
+                    ElementReconstructor().reconstruct_fragment(node),
+                    HCLReconstructor().reconstruct_fragment(node),
+                )
+
+    def test_fragment_of_token(self):
+        self.assertEqual(ElementReconstructor().reconstruct_fragment(NAME("x")), "x")
+
+    def test_empty_body_returns_empty_string(self):
+        tree = StartRule([BodyRule([])])
+        self.assertEqual(ElementReconstructor().reconstruct(tree), "")
+
+    def test_postproc_applied(self):
+        tree = parses("a = 1\n")
+        result = ElementReconstructor().reconstruct(tree, postproc=str.upper)
+        self.assertEqual(result, "A = 1\n")
+
+    def test_reusable(self):
+        reconstructor = ElementReconstructor()
+        reconstructor.reconstruct(parses(SOURCE))
+        self.assertEqual(reconstructor.reconstruct(parses("x = 1\n")), "x = 1\n")
+
+    def test_iter_reconstruct_matches_reconstruct(self):
+        tree = parses(SOURCE + "b = 2\n")
+        chunks = list(ElementReconstructor().iter_reconstruct(tree.body.children))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), _expected(tree))
+
+    def test_iter_reconstruct_nothing(self):
+        self.assertEqual(list(ElementReconstructor().iter_reconstruct([])), [])
+
+    def test_spacing_tables_keyed_on_classes(self):
+        ElementReconstructor().reconstruct(parses(SOURCE))
+        # pylint: disable=protected-access
+        for table in (
+            ElementReconstructor._token_spacing,
+            ElementReconstructor._rule_spacing,
+        ):
+            self.assertTrue(table)
+            for key in table:
+                self.assertTrue(
+                    all(cls is None or isinstance(cls, type) for cls in key[:3])
+                )
+
+
+class TestApiReconstruct(TestCase):
+    def test_element_tree(self):
+        tree = parses(SOURCE)
+        expected = _expected(tree)
+        with patch.object(
+            HCLReconstructor, "reconstruct", side_effect=AssertionError("lark")
+        ):
+            self.assertEqual(reconstruct(tree), expected)
+
+    def test_lark_tree(self):
+        tree = parses(SOURCE)
+        self.assertEqual(reconstruct(tree.to_lark()), _expected(tree))
@@ -287,6 +287,18 @@ class TestFormatBlockRule(TestCase):
         has_double_nl = any(_nlc_value(c).startswith("\n\n") for c in nlc_children)
         self.assertFalse(has_double_nl)
 
+    def test_discards_cached_serializations(self):
+        block = _make_block(
+            [_make_identifier("resource")],
+            [_make_attribute("name")],
+        )
+        start = StartRule([BodyRule([block])])
+        start.serialize_cached()
+        block.serialize_cached()
+        _fmt().format_tree(start)
+        self.assertIsNone(start._serialized)
+        self.assertIsNone(block._serialized)
+
 
 # --- format_tuple_rule ---
 
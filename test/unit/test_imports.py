@@ -0,0 +1,91 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import re
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+import hcl2
+
+ROOT = Path(__file__).absolute().parents[2]
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+\d+ \|\s*(\S+)$", re.M)
+
+# Not needed to parse and serialize HCL2
+NOT_FOR_PARSING = [
+    "hcl2.builder",
+    "hcl2.cache",
+    "hcl2.deserializer",
+    "hcl2.formatter",
+    "hcl2.incremental",
+    "hcl2.lazy",
+    "hcl2.query",
+    "hcl2.reconstructor",
+    "hcl2.stream",
+    "tracemalloc",
+]
+
+
+def _imported_modules(code):
+    """Return the modules ``python -X importtime`` reports for running *code*."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    return set(_IMPORT_TIME_LINE.findall(result.stderr))
+
+
+class TestImportTime(TestCase):
+    def test_import_loads_no_submodules(self):
+        modules = _imported_modules("import hcl2")
+        self.assertIn("hcl2", modules)
+        self.assertEqual(
+            {module for module in modules if module.startswith(("hcl2.", "lark"))},
+            {"hcl2.version"},
+        )
+
+    def test_loads_imports_only_parsing_modules(self):
+        modules = _imported_modules('import hcl2; hcl2.loads("a = 1")')
+        self.assertIn("hcl2.transformer", modules)
+        for module in NOT_FOR_PARSING:
+            self.assertNotIn(module, modules)
+
+    def test_hq_entry_point_defers_query_stack(self):
+        modules = _imported_modules("import cli.hq")
+        self.assertFalse({"hcl2.parser", "hcl2.query", "hcl2.api"} & modules)
+
+
+class TestLazyAttributes(TestCase):
+    def test_public_names(self):
+        for name in hcl2.__all__:
+            with self.subTest(name=name):
+                self.assertIsNotNone(getattr(hcl2, name))
+                self.assertIn(name, dir(hcl2))
+
+    def test_resolves_to_defining_module(self):
+        # pylint: disable-next=import-outside-toplevel
+        from hcl2.api import loads
+
+        self.assertIs(hcl2.loads, loads)
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            getattr(hcl2, "no_such_name")
+
+    def test_submodules(self):
+        code = (
+            "import hcl2; hcl2.api.loads('a = 1'); hcl2.parser.parser; "
+            "hcl2.rules.base.StartRule; hcl2.utils.SerializationOptions; "
+            "hcl2.builder.Builder"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+        for name in ("api", "rules", "utils", "builder"):
+            with self.subTest(name=name):
+                self.assertIs(getattr(hcl2, name), sys.modules[f"hcl2.{name}"])
+
+    def test_private_names_are_not_submodules(self):
+        with self.assertRaises(AttributeError):
+            getattr(hcl2, "_no_such_module")
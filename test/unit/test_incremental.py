@@ -0,0 +1,121 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+from unittest import TestCase
+
+from hcl2.api import parses, reconstruct, serialize
+from hcl2.incremental import TextEdit, reparse
+from hcl2.query.body import DocumentView
+from hcl2.walk import walk_rules
+
+SOURCE = """\
+a = 1
+# comment
+resource "aws_instance" "web" {
+  ami   = "ami-123"
+  count = 2 + 3
+}
+b = [1, 2] # trailing
+c = <<EOF
+hello
+EOF
+d = "${var.x}"
+"""
+
+
+def _positions(tree):
+    return [(type(rule).__name__, rule._meta) for rule in walk_rules(tree)]
+
+
+class TestTextEdit(TestCase):
+    def test_apply(self):
+        self.assertEqual(TextEdit(2, 3, "XY").apply("abcdefg"), "abXYfg")
+
+    def test_insertion(self):
+        edit = TextEdit(1, 0, "--")
+        self.assertEqual(edit.end, 1)
+        self.assertEqual(edit.apply("ab"), "a--b")
+
+
+class TestReparse(TestCase):
+    def _check(self, edit, incremental=True, text=SOURCE, discard_comments=False):
+        tree = parses(text, discard_comments=discard_comments)
+        result = reparse(tree, text, edit, discard_comments=discard_comments)
+        expected = parses(edit.apply(text), discard_comments=discard_comments)
+        self.assertEqual(result is tree, incremental)
+        self.assertEqual(serialize(result), serialize(expected))
+        self.assertEqual(reconstruct(result), reconstruct(expected))
+        self.assertEqual(_positions(result), _positions(expected))
+        return result
+
+    def _at(self, needle, length=0, replacement="", skip=0):
+        return TextEdit(SOURCE.index(needle) + skip, length, replacement)
+
+    def test_edit_inside_attribute(self):
+        result = self._check(self._at("1\n", 1, "42"))
+        self.assertEqual(serialize(result)["a"], 42)
+
+    def test_edit_inside_block_adds_lines(self):
+        self._check(self._at("count", 0, 'name  = "x"\n  '))
+
+    def test_edit_shifts_columns_on_same_line(self):
+        self._check(self._at("[1, 2]", 0, "0, ", skip=1))
+
+    def test_edit_inside_heredoc(self):
+        self._check(self._at("hello", 5, "hi\nthere"))
+
+    def test_edit_inside_interpolation(self):
+        self._check(self._at("var.x", 5, "local.y"))
+
+    def test_binary_operation_absorbing_newline_falls_back(self):
+        # A binary operation also consumes the newline after it, which moves
+        # that newline out of the body.
+        self._check(self._at('"${', 0, "1 + "), incremental=False)
+
+    def test_replace_without_length_change(self):
+        self._check(self._at("2 + 3", 1, "7"))
+
+    def test_new_element_falls_back(self):
+        self._check(self._at("1\n", 0, "1\nz = 2", skip=1), incremental=False)
+
+    def test_edit_in_comment_falls_back(self):
+        self._check(self._at("comment", 7, "note"), incremental=False)
+
+    def test_edit_across_elements_falls_back(self):
+        self._check(self._at("1\n# comment\nresource", 19, "1\nresource"), False)
+
+    def test_trailing_comment_falls_back(self):
+        self._check(self._at("1\n", 0, " # one", skip=1), incremental=False)
+
+    def test_discard_comments(self):
+        self._check(self._at("2 + 3", 5, "5"), discard_comments=True)
+
+    def test_invalid_edit_raises_parse_error(self):
+        tree = parses(SOURCE)
+        with self.assertRaises(Exception):
+            reparse(tree, SOURCE, self._at("= 1", 1, "=="))
+
+    def test_out_of_range(self):
+        tree = parses(SOURCE)
+        with self.assertRaises(ValueError):
+            reparse(tree, SOURCE, TextEdit(len(SOURCE), 1, "x"))
+
+    def test_sequence_of_edits(self):
+        text = SOURCE
+        tree = parses(text)
+        for needle, replacement in (
+            ("ami-123", "ami-4567"),
+            ("2 + 3", "4"),
+            ("b", "e"),
+        ):
+            edit = TextEdit(text.index(needle), len(needle), replacement)
+            tree = reparse(tree, text, edit)
+            text = edit.apply(text)
+            self.assertEqual(_positions(tree), _positions(parses(text)))
+
+
+class TestDocumentViewReparse(TestCase):
+    def test_reparse(self):
+        text = "x = 1\ny = 2\n"
+        doc = DocumentView.parse(text)
+        updated = doc.reparse(text, TextEdit(10, 1, "3"))
+        self.assertEqual(updated.attribute("y").value, 3)
+        self.assertIs(updated.raw, doc.raw)
@@ -0,0 +1,136 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+from unittest import TestCase
+
+from lark.exceptions import UnexpectedInput
+
+from hcl2.api import parses, reconstruct, serialize
+from hcl2.lazy import LazyBlockRule, parses_lazy
+from hcl2.query.body import DocumentView
+from hcl2.query.path import parse_path
+from hcl2.query.resolver import resolve_path
+from hcl2.rules.base import BlockRule
+from hcl2.walk import walk_rules
+
+SOURCE = """\
+a = 1
+# comment
+resource "aws_instance" "web" {
+  ami = "ami-123"
+  tags = { Name = "web" }
+}
+
+resource "aws_instance" "db" { count = 2 }
+locals {
+  s = "} ${"{"} {"
+  h = <<EOF
+}
+EOF
+}
+module   "m"   {
+  source = "./m" // }
+}
+/* { */ b = [1, {c = 2}]
+"""
+
+
+def _positions(tree):
+    return [(rule.lark_name(), rule._meta) for rule in walk_rules(tree)]
+
+
+def _blocks(tree):
+    return [c for c in tree.body.children if isinstance(c, LazyBlockRule)]
+
+
+class TestParsesLazy(TestCase):
+    def _check(self, text, discard_comments=False):
+        tree = parses_lazy(text, discard_comments=discard_comments)
+        expected = parses(text, discard_comments=discard_comments)
+        self.assertEqual(serialize(tree), serialize(expected))
+        self.assertEqual(reconstruct(tree), reconstruct(expected))
+        self.assertEqual(_positions(tree), _positions(expected))
+        return tree
+
+    def test_matches_full_parse(self):
+        tree = self._check(SOURCE)
+        self.assertEqual(len(_blocks(tree)), 4)
+
+    def test_matches_full_parse_discarding_comments(self):
+        self._check(SOURCE, discard_comments=True)
+
+    def test_matches_full_parse_at_end_of_input(self):
+        for text in ("a {}", "a {} \n  ", "a {} # c\n  ", "a {}\nb = <<EOT\nx\nEOT"):
+            with self.subTest(text=text):
+                self._check(text)
+                self._check(text, discard_comments=True)
+
+    def test_blocks_start_unparsed(self):
+        tree = parses_lazy(SOURCE)
+        self.assertFalse(any(block.is_parsed for block in _blocks(tree)))
+
+    def test_labels_do_not_parse_body(self):
+        tree = parses_lazy(SOURCE)
+        block = _blocks(tree)[0]
+        labels = [label.serialize() for label in block.labels]
+        self.assertEqual(labels, ["resource", '"aws_instance"', '"web"'])
+        self.assertFalse(block.is_parsed)
+        self.assertIs(block.labels[1].parent, block)
+
+    def test_labels_match_full_parse(self):
+        text = 'a b "c" {}\n  g "h\\"" i {}\n'
+        lazy = _blocks(parses_lazy(text))
+        eager = [c for c in parses(text).body.children if isinstance(c, BlockRule)]
+        self.assertEqual(len(lazy), 2)
+        for lazy_block, block in zip(lazy, eager):
+            self.assertEqual(
+                _positions(lazy_block.labels[-1]), _positions(block.labels[-1])
+            )
+            self.assertEqual(
+                [label.serialize() for label in lazy_block.labels],
+                [label.serialize() for label in block.labels],
+            )
+
+    def test_body_access_parses_block(self):
+        tree = parses_lazy(SOURCE)
+        block = _blocks(tree)[1]
+        self.assertEqual(block.body.serialize(), {"count": 2})
+        self.assertTrue(block.is_parsed)
+        self.assertIs(block.body.parent, block)
+
+    def test_error_in_block_raised_on_access(self):
+        text = "a = 1\nb {\n  c = = 2\n}\n"
+        tree = parses_lazy(text)
+        with self.assertRaises(UnexpectedInput) as raised:
+            _ = _blocks(tree)[0].body
+        self.assertEqual(raised.exception.line, 3)
+
+    def test_without_blocks_parses_eagerly(self):
+        self.assertEqual(
+            _positions(parses_lazy("a = 1\n")), _positions(parses("a = 1\n"))
+        )
+
+    def test_unbalanced_text_parses_eagerly(self):
+        with self.assertRaises(UnexpectedInput):
+            parses_lazy("a {\n")
+
+
+class TestDocumentViewLazy(TestCase):
+    def test_blocks_parse_only_matches(self):
+        doc = DocumentView.parse(SOURCE, lazy=True)
+        blocks = doc.blocks("resource", "aws_instance", "web")
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0].body.attribute("ami").value, '"ami-123"')
+        parsed = [block.is_parsed for block in _blocks(doc.raw)]
+        self.assertEqual(parsed, [True, False, False, False])
+
+    def test_resolve_path(self):
+        doc = DocumentView.parse(SOURCE, lazy=True)
+        results = resolve_path(doc, parse_path("module.m.source"))
+        self.assertEqual(results[0].value, '"./m"')
+        self.assertEqual(
+            [block.is_parsed for block in _blocks(doc.raw)],
+            [False, False, False, True],
+        )
+
+    def test_cache_not_allowed(self):
+        with self.assertRaises(ValueError):
+            DocumentView.parse("a = 1\n", cache=object(), lazy=True)
@@ -0,0 +1,144 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import importlib
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from lark import Lark
+
+from hcl2 import parser as hcl2_parser
+from hcl2.api import loads
+from hcl2.parser import _load, _precomputed_tables, write_tables_module
+from hcl2.postlexer import PostLexer
+
+SOURCE = """\
+resource "aws_instance" "web" {
+  ami   = "ami-123"
+  count = var.enabled ? 2 : 0 # comment
+  tags  = { for k, v in local.tags : k => upper(v) }
+}
+"""
+
+
+class TestPrecomputedTables(TestCase):
+    module_name = "_hcl2_test_lark_parser"
+
+    @classmethod
+    def setUpClass(cls):
+        # Building the tables takes seconds; generate them once
+        cls.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        write_tables_module(Path(cls.tmpdir.name) / f"{cls.module_name}.py")
+        sys.path.insert(0, cls.tmpdir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.path.remove(cls.tmpdir.name)
+        sys.modules.pop(cls.module_name, None)
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        _precomputed_tables.cache_clear()
+
+    def tearDown(self):
+        _precomputed_tables.cache_clear()
+
+    def test_same_trees_as_grammar(self):
+        with patch.object(hcl2_parser, "TABLES_MODULE", None):
+            expected = _load(postlex=PostLexer()).parse(SOURCE)
+        with patch.object(hcl2_parser, "TABLES_MODULE", self.module_name):
+            self.assertIsNotNone(_precomputed_tables(self.module_name))
+            self.assertEqual(_load(postlex=PostLexer()).parse(SOURCE), expected)
+
+    def test_expression_tables(self):
+        text = "var.enabled ? [for v in local.xs : upper(v)] : null"
+        with patch.object(hcl2_parser, "TABLES_MODULE", None):
+            expected = _load(start="expression_start", postlex=PostLexer()).parse(text)
+        with patch.object(hcl2_parser, "TABLES_MODULE", self.module_name):
+            self.assertIsNotNone(
+                _precomputed_tables(self.module_name, "expression_start")
+            )
+            result = _load(start="expression_start", postlex=PostLexer()).parse(text)
+        self.assertEqual(result, expected)
+
+    def test_unknown_start_symbol(self):
+        self.assertIsNone(_precomputed_tables(self.module_name, "body"))
+
+    def test_generated_with_single_table(self):
+        # As written before tables were kept per start symbol
+        module = importlib.import_module(self.module_name)
+        with patch.object(module, "TABLES", module.TABLES["start"]):
+            self.assertIsNone(_precomputed_tables(self.module_name))
+
+    def test_generated_for_other_lark_version(self):
+        with patch("lark.__version__", "0.0.0"):
+            self.assertIsNone(_precomputed_tables(self.module_name))
+
+    def test_generated_for_other_grammar(self):
+        with patch.object(hcl2_parser, "_grammar_hash", return_value="0" * 64):
+            self.assertIsNone(_precomputed_tables(self.module_name))
+
+    def test_missing_module(self):
+        self.assertIsNone(_precomputed_tables("_hcl2_test_missing_module"))
+
+    def test_disabled(self):
+        self.assertIsNone(_precomputed_tables(None))
+        with patch.object(hcl2_parser, "TABLES_MODULE", None):
+            self.assertIsInstance(_load(), Lark)
+
+
+class TestTerminals(TestCase):
+    def _check(self, cases):
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(loads(text), expected)
+
+    def test_block_comments(self):
+        self._check(
+            [
+                (
+                    "a = 1 /** doc **/\n",
+                    {"a": 1, "__comments__": [{"value": "* doc *"}]},
+                ),
+                (
+                    "a = 1 /* x * / y */\n",
+                    {"a": 1, "__comments__": [{"value": "x * / y"}]},
+                ),
+                ("/***/\na = 1\n", {"a": 1, "__comments__": [{"value": "*"}]}),
+                (
+                    "/* a */ b = 1 /* c\n*/\n",
+                    {"b": 1, "__comments__": [{"value": "a"}, {"value": "c"}]},
+                ),
+            ]
+        )
+
+    def test_string_characters(self):
+        self._check(
+            [
+                ('a = "$"\n', {"a": '"$"'}),
+                ('a = "a%"\n', {"a": '"a%"'}),
+                ('a = "$${x}"\n', {"a": '"$${x}"'}),
+                ('a = "$$${x}"\n', {"a": '"$$${x}"'}),
+                (
+                    'a = "%%%{ if true }y%{ endif }"\n',
+                    {"a": '"%%%{ if true }y%{ endif }"'},
+                ),
+                ('a = "\\"x\\" \\\\ $5 100%"\n', {"a": '"\\"x\\" \\\\ $5 100%"'}),
+                ('a = "$%$%"\n', {"a": '"$%$%"'}),
+            ]
+        )
+
+    def test_heredocs(self):
+        self._check(
+            [
+                ("a = <<EOF\n\nEOF\n", {"a": '"<<EOF\n\nEOF"'}),
+                ("a = <<EOF\nEOFX\nEOF\n", {"a": '"<<EOF\nEOFX\nEOF"'}),
+                ("a = <<-EOF\n  x\n  EOF\n", {"a": '"<<-EOF\n  x\n  EOF"'}),
+                ("a = <<EOF\nx\n\n   EOF", {"a": '"<<EOF\nx\n\n   EOF"'}),
+                (
+                    "a = <<EOF\nx\nEOF\nb = <<EOF\ny\nEOF\n",
+                    {"a": '"<<EOF\nx\nEOF"', "b": '"<<EOF\ny\nEOF"'},
+                ),
+            ]
+        )
@@ -11,6 +11,7 @@ from lark import Token
 
 from hcl2.api import loads
 from hcl2.postlexer import OPERATOR_TYPES, PostLexer
+from hcl2.profiling import profile
 
 
 class TestMergeNewlinesIntoOperators(TestCase):
@@ -84,6 +85,26 @@ class TestMergeNewlinesIntoOperators(TestCase):
         self.assertNotIn("MINUS", OPERATOR_TYPES)
 
 
+class TestProcess(TestCase):
+    TOKENS = [
+        Token("NAME", "a"),
+        Token("NL_OR_COMMENT", "\n  "),
+        Token("QMARK", "?"),
+        Token("NAME", "b"),
+    ]
+
+    def test_returns_merging_pass(self):
+        result = list(PostLexer().process(iter(self.TOKENS)))
+        self.assertEqual([str(token) for token in result], ["a", "\n  ?", "b"])
+
+    def test_profiled(self):
+        with profile(trace_memory=False) as prof:
+            result = list(PostLexer().process(iter(self.TOKENS)))
+        self.assertEqual(len(result), 3)
+        totals = prof.totals()
+        self.assertEqual((totals["lex"].tokens, totals["postlex"].tokens), (4, 3))
+
+
 class TestMultilineOperatorParsing(TestCase):
     """Test that HCL2 snippets with multiline operators parse correctly."""
 
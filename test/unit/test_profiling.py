@@ -0,0 +1,117 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import tracemalloc
+from unittest import TestCase
+
+from hcl2.api import loads, parses, parses_to_tree, serialize
+from hcl2.profiling import (
+    Profile,
+    StageTiming,
+    active_profile,
+    count_element_nodes,
+    count_tree_nodes,
+    profile,
+)
+from hcl2.utils import SerializationOptions
+
+
+SIMPLE_HCL = 'x = 1\nblock "a" {\n  y = x + 2\n}\n'
+
+
+class TestProfile(TestCase):
+    def test_inactive_by_default(self):
+        self.assertIsNone(active_profile())
+
+    def test_active_inside_context(self):
+        with profile() as prof:
+            self.assertIs(active_profile(), prof)
+        self.assertIsNone(active_profile())
+
+    def test_loads_records_all_stages(self):
+        with profile() as prof:
+            loads(SIMPLE_HCL)
+        names = [timing.name for timing in prof.stages]
+        for name in ("lex", "postlex", "parse", "serialize"):
+            self.assertIn(name, names)
+        # loads serializes the parse tree directly
+        self.assertNotIn("transform", names)
+        totals = prof.totals()
+        self.assertGreater(totals["lex"].tokens, 0)
+        self.assertEqual(totals["postlex"].tokens, totals["lex"].tokens)
+        self.assertGreater(totals["parse"].nodes, 0)
+        self.assertEqual(totals["serialize"].nodes, totals["parse"].nodes)
+        self.assertIsNotNone(totals["serialize"].allocated_bytes)
+
+    def test_parses_records_transform(self):
+        with profile() as prof:
+            serialize(parses(SIMPLE_HCL))
+        totals = prof.totals()
+        self.assertGreater(totals["transform"].nodes, 0)
+        self.assertIsNotNone(totals["transform"].allocated_bytes)
+        self.assertEqual(totals["serialize"].nodes, totals["transform"].nodes)
+
+    def test_loads_with_forced_parentheses_records_transform(self):
+        with profile() as prof:
+            loads(
+                SIMPLE_HCL,
+                serialization_options=SerializationOptions(
+                    force_operation_parentheses=True
+                ),
+            )
+        names = [timing.name for timing in prof.stages]
+        self.assertIn("transform", names)
+
+    def test_postlex_merges_reduce_token_count(self):
+        with profile() as prof:
+            parses("x = a\n  + b\n")
+        totals = prof.totals()
+        self.assertEqual(totals["postlex"].tokens, totals["lex"].tokens - 1)
+
+    def test_node_counts_match_trees(self):
+        with profile() as prof:
+            tree = parses(SIMPLE_HCL)
+        totals = prof.totals()
+        self.assertEqual(
+            totals["parse"].nodes, count_tree_nodes(parses_to_tree(SIMPLE_HCL))
+        )
+        self.assertEqual(totals["transform"].nodes, count_element_nodes(tree))
+
+    def test_without_memory_tracing(self):
+        with profile(trace_memory=False) as prof:
+            loads(SIMPLE_HCL)
+        self.assertFalse(tracemalloc.is_tracing())
+        for timing in prof.stages:
+            self.assertIsNone(timing.allocated_bytes)
+
+    def test_stops_tracemalloc_it_started(self):
+        with profile():
+            self.assertTrue(tracemalloc.is_tracing())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_nested_stage_time_is_excluded(self):
+        prof = Profile(trace_memory=False)
+        with prof.stage("outer"):
+            prof.record(StageTiming("inner", wall_time=100.0))
+        outer = prof.stages[-1]
+        self.assertEqual(outer.name, "outer")
+        self.assertLess(outer.wall_time, 0)
+
+    def test_totals_aggregate_repeated_stages(self):
+        with profile(trace_memory=False) as prof:
+            loads(SIMPLE_HCL)
+            loads(SIMPLE_HCL)
+        self.assertEqual(
+            len([timing for timing in prof.stages if timing.name == "parse"]), 2
+        )
+        totals = prof.totals()
+        single = count_tree_nodes(parses_to_tree(SIMPLE_HCL))
+        self.assertEqual(totals["parse"].nodes, 2 * single)
+
+    def test_format(self):
+        with profile() as prof:
+            loads(SIMPLE_HCL)
+        text = prof.format("main.tf")
+        self.assertTrue(text.startswith("main.tf: total "))
+        self.assertIn("serialize", text)
+        self.assertIn("tokens=", text)
+        self.assertIn("nodes=", text)
+        self.assertIn("alloc=", text)
@@ -0,0 +1,167 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from lark.exceptions import UnexpectedInput
+
+from hcl2.api import dumps, loads
+from hcl2.deserializer import BaseDeserializer, DeserializerOptions
+from hcl2.formatter import FormatterOptions
+from hcl2.stream import iter_blocks, iter_dumps, _StatementScanner
+from hcl2.utils import SerializationOptions
+
+SOURCE = """\
+a = 1
+# comment
+resource "aws_instance" "web" {
+  ami = "ami-123"
+  tags = { Name = "web" }
+}
+
+resource "aws_instance" "db" { count = 2 }
+locals {
+  s = "} ${"{"} {"
+  h = <<EOF
+}
+EOF
+}
+module "m"
+{
+  source = "./m" // }
+}
+/* { */ b = [1, {c = 2}]
+c = true ? (
+  1
+) : 2
+d = 1 +
+  2
+"""
+
+
+def _merge(elements):
+    result = {}
+    for element in elements:
+        for key, value in element.items():
+            if key in result and isinstance(value, list):
+                result[key] = result[key] + value
+            else:
+                result[key] = value
+    return result
+
+
+class TestIterBlocks(TestCase):
+    def _check(self, text, options=None):
+        elements = list(iter_blocks(StringIO(text), options))
+        self.assertEqual(_merge(elements), loads(text, serialization_options=options))
+        return elements
+
+    def test_yields_each_top_level_element(self):
+        elements = self._check(SOURCE, SerializationOptions(with_comments=False))
+        self.assertEqual(
+            [list(element) for element in elements],
+            [["a"], ["resource"], ["resource"], ["locals"], ["module"], ["b"]]
+            + [["c"], ["d"]],
+        )
+
+    def test_yields_standalone_comments(self):
+        elements = self._check(SOURCE)
+        self.assertEqual(elements[1], {"__comments__": [{"value": "comment"}]})
+
+    def test_expression_continued_on_next_line(self):
+        for text in (
+            "a = 1\n  + 2\nb = 3\n",
+            "a = x\n  ? 1\n  : 2\n",
+            "a = x\n  && y\n  || z\n// c\nb = 1 # d\n  * 2\n",
+        ):
+            with self.subTest(text=text):
+                self._check(text)
+
+    def test_comment_after_element_is_not_a_continuation(self):
+        elements = self._check("a = 1\n// c\n# d\nb = 2\n")
+        self.assertEqual(len(elements), 4)
+
+    def test_empty_file(self):
+        self.assertEqual(list(iter_blocks(StringIO(""))), [])
+
+    def test_reads_lazily(self):
+        elements = iter_blocks(StringIO("a = 1\nb = 2\n"))
+        self.assertEqual(next(elements), {"a": 1})
+
+    def test_error_after_yielded_elements(self):
+        elements = iter_blocks(StringIO("a = 1\nb {\n  c = 2\n}\nd = = 3\ne = 4\n"))
+        self.assertEqual(next(elements), {"a": 1})
+        self.assertEqual(list(next(elements)), ["b"])
+        with self.assertRaises(UnexpectedInput) as raised:
+            next(elements)
+        self.assertEqual((raised.exception.line, raised.exception.column), (5, 5))
+
+    def test_unterminated_block_raises(self):
+        with self.assertRaises(UnexpectedInput):
+            list(iter_blocks(StringIO("a = 1\nb {\n")))
+
+
+class TestIterDumps(TestCase):
+    def test_matches_dumps(self):
+        data = loads(SOURCE)
+        self.assertEqual("".join(iter_dumps(data)), dumps(data))
+
+    def test_matches_dumps_with_options(self):
+        data = loads(SOURCE)
+        options = {
+            "deserializer_options": DeserializerOptions(object_elements_colon=True),
+            "formatter_options": FormatterOptions(
+                indent_length=4, vertically_align_attributes=False
+            ),
+        }
+        self.assertEqual("".join(iter_dumps(data, **options)), dumps(data, **options))
+
+    def test_separators(self):
+        data = {"a": 1, "b": [{"c": 2, "__is_block__": True}] * 2, "d": 3}
+        self.assertEqual("".join(iter_dumps(data)), dumps(data))
+
+    def test_empty_dict(self):
+        self.assertEqual(list(iter_dumps({})), [])
+
+    def test_converts_lazily(self):
+        data = {"a": 1, "b": 2, "c": 3}
+        # pylint: disable-next=protected-access
+        attribute = BaseDeserializer._deserialize_attribute
+        with patch.object(
+            BaseDeserializer, "_deserialize_attribute", autospec=True
+        ) as deserialize:
+            deserialize.side_effect = attribute
+            chunks = iter_dumps(data)
+            self.assertEqual(next(chunks), "a = 1")
+            # The next element is converted before the first is yielded
+            self.assertEqual(deserialize.call_count, 2)
+            self.assertEqual("".join(chunks), "\nb = 2\nc = 3\n")
+
+    def test_non_dict_raises_type_error(self):
+        with self.assertRaises(TypeError):
+            iter_dumps([1])
+
+
+class TestStatementScanner(TestCase):
+    def _ends(self, text):
+        scanner = _StatementScanner()
+        return [scanner.feed(line) for line in StringIO(text)]
+
+    def test_brackets(self):
+        self.assertEqual(
+            self._ends("a = [\n1,\n]\nb = 2\n"), [False, False, True, True]
+        )
+
+    def test_strings_and_templates(self):
+        self.assertEqual(
+            self._ends('a = "{ ${ {b = "}"} } "\nc = "%{ if x }}%{ endif }"\n'),
+            [True, True],
+        )
+
+    def test_comments(self):
+        self.assertEqual(
+            self._ends("a { # {\n} // {\n/* {\n} */\n"), [False, True, False, True]
+        )
+
+    def test_heredoc(self):
+        self.assertEqual(self._ends("a = <<-EOT\n  {\n  EOT\n"), [False, False, True])
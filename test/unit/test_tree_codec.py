@@ -0,0 +1,142 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import marshal
+import pickle
+import zlib
+from pathlib import Path
+from unittest import TestCase
+
+from hcl2.api import parses, reconstruct, serialize
+from hcl2.rules.abstract import LarkRule, _extra_slots
+from hcl2.tree_codec import FORMAT_VERSION, decode_tree, encode_tree
+
+FIXTURES = Path(__file__).absolute().parents[1] / "integration" / "hcl2_original"
+
+SOURCE = """\
+# leading comment
+variable "x" {
+  default = [1, 2.5, true, null]
+}
+
+resource "aws_instance" "web" {
+  count = (var.n + 1) * 2
+  tags  = { Name = "web-${var.n}" }
+  dynamic "ebs" {
+    for_each = var.disks
+    content { size = ebs.value }
+  }
+}
+
+locals {
+  t = "%{ if var.a }yes%{ else }no%{ endif }"
+  l = "%{ for x in var.xs }${x},%{ endfor }"
+  h = <<EOF
+heredoc ${var.x}
+EOF
+  f = [for k, v in var.m : upper(v) if k != ""]
+}
+"""
+
+
+class TestTreeCodec(TestCase):
+    def assertSameTree(self, expected, actual):
+        self.assertIs(type(actual), type(expected))
+        self.assertEqual(actual._index, expected._index)
+        if not isinstance(expected, LarkRule):
+            self.assertEqual(actual._value, expected._value)
+            return
+        self.assertEqual(actual._meta, expected._meta)
+        self.assertIsNone(actual._serialized)
+        self.assertEqual(len(actual._children), len(expected._children))
+        for name in _extra_slots(type(expected)):
+            self.assertEqual(
+                _slot_shape(getattr(actual, name, None), actual._children),
+                _slot_shape(getattr(expected, name, None), expected._children),
+                name,
+            )
+        for expected_child, actual_child in zip(expected._children, actual._children):
+            if expected_child is None:
+                self.assertIsNone(actual_child)
+                continue
+            self.assertIs(actual_child._parent, actual)
+            self.assertSameTree(expected_child, actual_child)
+
+    def assertRoundTrips(self, text, discard_comments=False):
+        tree = parses(text, discard_comments=discard_comments)
+        decoded = decode_tree(encode_tree(tree))
+        self.assertSameTree(tree, decoded)
+        self.assertIsNone(decoded._parent)
+        self.assertEqual(reconstruct(decoded), reconstruct(tree))
+        self.assertEqual(serialize(decoded), serialize(tree))
+
+    def test_round_trip(self):
+        self.assertRoundTrips(SOURCE)
+        self.assertRoundTrips(SOURCE, discard_comments=True)
+        self.assertRoundTrips("")
+
+    def test_round_trip_fixtures(self):
+        for path in sorted(FIXTURES.glob("*.tf")):
+            with self.subTest(path.name):
+                self.assertRoundTrips(path.read_text())
+
+    def test_block_slots_refer_to_decoded_children(self):
+        tree = decode_tree(encode_tree(parses(SOURCE)))
+        block = tree.body.children[1]
+        self.assertTrue(any(child is block.body for child in block.children))
+        for label in block.labels:
+            self.assertTrue(any(child is label for child in block.children))
+        self.assertEqual(
+            serialize(tree)["variable"][0]['"x"']["default"], [1, 2.5, True, None]
+        )
+
+    def test_decoded_tree_is_independent(self):
+        tree = parses(SOURCE)
+        data = encode_tree(tree)
+        first = decode_tree(data)
+        first.body.children.clear()
+        self.assertEqual(reconstruct(decode_tree(data)), reconstruct(tree))
+
+    def test_much_smaller_than_pickle(self):
+        tree = parses(SOURCE * 20)
+        pickled = pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+        self.assertLess(len(encode_tree(tree)) * 5, len(pickled))
+
+    def test_invalid_data(self):
+        data = encode_tree(parses(SOURCE))
+        for invalid in (b"", b"not an entry", data[: len(data) // 2]):
+            with self.assertRaises(ValueError):
+                decode_tree(invalid)
+
+    def test_truncated_streams(self):
+        fields = list(marshal.loads(zlib.decompress(encode_tree(parses(SOURCE)))))
+        fields[5] = fields[5][:-1]
+        with self.assertRaises(ValueError):
+            decode_tree(zlib.compress(marshal.dumps(tuple(fields))))
+
+    def test_unsupported_version(self):
+        fields = list(marshal.loads(zlib.decompress(encode_tree(parses(SOURCE)))))
+        fields[0] = FORMAT_VERSION + 1
+        with self.assertRaises(ValueError):
+            decode_tree(zlib.compress(marshal.dumps(tuple(fields))))
+
+    def test_rejects_foreign_classes(self):
+        fields = list(marshal.loads(zlib.decompress(encode_tree(parses(SOURCE)))))
+        for descriptor in (("class", "os", "system"), ("class", "hcl2.api", "parses")):
+            fields[1] = (descriptor,) + tuple(fields[1][1:])
+            with self.subTest(descriptor), self.assertRaises(ValueError):
+                decode_tree(zlib.compress(marshal.dumps(tuple(fields))))
+
+    def test_rejects_unencodable_slots(self):
+        tree = parses(SOURCE)
+        tree.body._lookup = {"x": 1}
+        with self.assertRaises(ValueError):
+            encode_tree(tree)
+
+
+def _slot_shape(value, children):
+    """Describe a slot value with elements replaced by their child positions."""
+    if isinstance(value, list):
+        return [_slot_shape(item, children) for item in value]
+    for position, child in enumerate(children):
+        if child is value and child is not None:
+            return ("child", position)
+    return value
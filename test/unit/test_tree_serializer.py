@@ -0,0 +1,83 @@
+# pylint: disable=C0103,C0114,C0115,C0116
+import json
+from unittest import TestCase
+
+from hcl2.api import parses_to_tree, serialize, transform
+from hcl2.tree_serializer import TreeSerializer
+from hcl2.utils import SerializationOptions
+
+
+HCL = """\
+a = 1 + 2 # trailing
+  # absorbed
+b = (x && y) ? -1 : !z
+c = { (var.k) = 1, "s" = 2, 3 = 4, 1.5 = 5, 1e3 = 6, true = 7, x.y = 8 # inline
+}
+d = [for k, v in m : upper(v) if v != null]
+e = {for k, v in m : k => {a = v}... if true}
+f = a.b[0].c.*.d[*].e.0[1]
+g = ns::mod::fn(1, xs...)
+h = <<-EOT
+    hello "x"
+      there
+    EOT
+i = "%{ if a }x%{ else }y%{ endif }${b}"
+j = [ # comment
+  1.5e10, # one
+  null
+]
+resource "a" "b" {
+  true = null
+  in = 1
+}
+"""
+
+
+class TestTreeSerializer(TestCase):
+    maxDiff = None
+
+    def _assert_matches_rules(self, options=None):
+        lark_tree = parses_to_tree(HCL)
+        expected = transform(lark_tree).serialize(
+            options=options or SerializationOptions()
+        )
+        actual = TreeSerializer(options).serialize(lark_tree)
+        self.assertEqual(json.dumps(actual), json.dumps(expected))
+
+    def test_default_options(self):
+        self._assert_matches_rules()
+
+    def test_each_option_toggled(self):
+        defaults = SerializationOptions()
+        for name in (
+            "with_comments",
+            "with_meta",
+            "wrap_objects",
+            "wrap_tuples",
+            "explicit_blocks",
+            "preserve_heredocs",
+            "preserve_scientific_notation",
+            "strip_string_quotes",
+        ):
+            with self.subTest(option=name):
+                options = SerializationOptions(**{name: not getattr(defaults, name)})
+                self._assert_matches_rules(options)
+
+    def test_duplicate_attribute_and_block_raises(self):
+        with self.assertRaises(RuntimeError):
+            TreeSerializer().serialize(parses_to_tree("a = 1\na {}\n"))
+
+    def test_force_operation_parentheses_unsupported(self):
+        options = SerializationOptions(force_operation_parentheses=True)
+        self.assertFalse(TreeSerializer.supports(options))
+        with self.assertRaises(ValueError):
+            TreeSerializer(options)
+
+    def test_api_serialize_accepts_lark_tree(self):
+        options = SerializationOptions(force_operation_parentheses=True)
+        lark_tree = parses_to_tree("x = 1 + 2 * 3\n")
+        self.assertEqual(serialize(lark_tree), {"x": "${1 + 2 * 3}"})
+        self.assertEqual(
+            serialize(lark_tree, serialization_options=options),
+            serialize(transform(lark_tree), serialization_options=options),
+        )